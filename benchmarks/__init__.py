@@ -0,0 +1 @@
+"""Benchmarks for the dapla_toolbelt_metadata package."""
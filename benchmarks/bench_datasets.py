@@ -0,0 +1,251 @@
+"""Benchmarks for reading, merging and writing dataset metadata."""
+
+import copy
+import json
+from pathlib import Path
+
+import pyarrow as pa
+import pytest
+from datadoc_model.all_optional.model import DatadocMetadata
+from datadoc_model.all_optional.model import Variable
+from tests.utils.code_lists import nace_like_dataframes
+
+from benchmarks.generators import CURRENT_VERSION
+from benchmarks.generators import metadata_document
+from benchmarks.generators import naming_standard_paths
+from benchmarks.generators import short_name
+from benchmarks.generators import write_metadata_document
+from benchmarks.generators import write_wide_parquet
+from dapla_metadata.datasets._merge import merge_metadata
+from dapla_metadata.datasets.audit import audit_coverage
+from dapla_metadata.datasets.catalog import CatalogBuildResult
+from dapla_metadata.datasets.catalog import MetadataCatalog
+from dapla_metadata.datasets.catalog import parse_metadata_document
+from dapla_metadata.datasets.code_list import CodeIndex
+from dapla_metadata.datasets.compatibility import upgrade_metadata
+from dapla_metadata.datasets.compatibility.model_backwards_compatibility import (
+    SUPPORTED_VERSIONS,
+)
+from dapla_metadata.datasets.core import Datadoc
+from dapla_metadata.datasets.dapla_dataset_path_info import DaplaDatasetPathInfo
+from dapla_metadata.datasets.reference_index import ReferenceIndex
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+from dapla_metadata.datasets.utility.urn import convert_uris_to_urns
+from dapla_metadata.datasets.utility.urn import klass_combined_urn_converter
+from dapla_metadata.datasets.utility.urn import vardef_combined_urn_converter
+from dapla_metadata.datasets.utility.utils import source_document_cache
+
+NUM_VARIABLES = [10, 100, 1000]
+
+DATASET_PATH = "produkt/befolkning/klargjorte_data/person_data_p2021_v1.parquet"
+
+
+@pytest.fixture(params=NUM_VARIABLES)
+def num_variables(request) -> int:
+    return request.param
+
+
+@pytest.fixture
+def dataset_path(tmp_path, num_variables):
+    return write_wide_parquet(tmp_path / DATASET_PATH, num_variables)
+
+
+@pytest.fixture
+def datadoc(dataset_path, num_variables, subject_mapping) -> Datadoc:
+    """A dataset with a metadata document which describes all its variables."""
+    write_metadata_document(
+        dataset_path.with_name(f"{dataset_path.stem}__DOC.json"), num_variables
+    )
+    return Datadoc(dataset_path, statistic_subject_mapping=subject_mapping)
+
+
+def test_open_dataset(benchmark, dataset_path, subject_mapping):
+    datadoc = benchmark(
+        Datadoc, dataset_path, statistic_subject_mapping=subject_mapping
+    )
+    assert datadoc.variables
+
+
+def test_open_dataset_with_document(benchmark, datadoc, subject_mapping):
+    opened = benchmark(
+        Datadoc, datadoc.dataset_path, statistic_subject_mapping=subject_mapping
+    )
+    assert len(opened.variables) == len(datadoc.variables)
+
+
+def test_save(benchmark, datadoc):
+    benchmark(datadoc.write_metadata_document)
+    assert datadoc.metadata_document
+    assert datadoc.metadata_document.exists()
+
+
+def test_copy_variables(benchmark, datadoc, num_variables):
+    short_names = [short_name(i) for i in range(num_variables)]
+    benchmark.pedantic(
+        datadoc.copy_variables,
+        args=(datadoc.metadata_document, short_names),
+        setup=source_document_cache.clear,
+        rounds=20,
+    )
+    assert len(datadoc.variables) == num_variables
+
+
+def test_find(benchmark, datadoc):
+    found = benchmark(datadoc.find, data_type="STRING", missing="unit_type")
+    assert found
+
+
+def test_variables_to_arrow(benchmark, datadoc, num_variables):
+    assert benchmark(datadoc.variables_to_arrow).num_rows == num_variables
+
+
+def test_variables_from_arrow(benchmark, datadoc):
+    table = datadoc.variables_to_arrow()
+    table = table.set_column(
+        table.schema.get_field_index("unit_type"),
+        "unit_type",
+        pa.array(["PERSON"] * table.num_rows),
+    )
+    changes = benchmark(datadoc.variables_from_arrow, table)
+    assert not changes.changed or len(changes.changed) == table.num_rows
+
+
+def test_update_variables(benchmark, datadoc, num_variables):
+    value = iter(range(10**9))
+    changes = benchmark(
+        lambda: datadoc.update_variables("*", multiplication_factor=next(value))
+    )
+    assert len(changes.changed) == num_variables
+
+
+def test_merge_metadata(benchmark, num_variables):
+    existing = DatadocMetadata.model_validate(
+        metadata_document(num_variables)["datadoc"]
+    )
+    assert existing.dataset
+    extracted = DatadocMetadata(
+        dataset=existing.dataset.model_copy(),
+        variables=[Variable(short_name=short_name(i)) for i in range(num_variables)],
+    )
+    merged = benchmark(merge_metadata, extracted, existing)
+    assert merged.variables
+    assert len(merged.variables) == num_variables
+
+
+@pytest.mark.parametrize("version", list(SUPPORTED_VERSIONS))
+def test_upgrade_metadata(benchmark, version, num_variables):
+    document = metadata_document(num_variables, version)
+    upgraded = benchmark.pedantic(
+        upgrade_metadata,
+        setup=lambda: ((copy.deepcopy(document),), {}),
+        rounds=20,
+    )
+    assert upgraded["datadoc"]["document_version"] == CURRENT_VERSION
+
+
+def test_percent_complete(benchmark, datadoc):
+    assert 0 < benchmark(lambda: datadoc.percent_complete) <= 100
+
+
+def test_convert_uris_to_urns(benchmark, num_variables):
+    document = metadata_document(num_variables)["datadoc"]
+
+    def convert() -> list[Variable]:
+        variables = [Variable.model_validate(v) for v in document["variables"]]
+        convert_uris_to_urns(variables, "definition_uri", vardef_combined_urn_converter)
+        convert_uris_to_urns(
+            variables, "classification_uri", klass_combined_urn_converter
+        )
+        return variables
+
+    variables = benchmark(convert)
+    assert str(variables[0].definition_uri).startswith("urn:")
+
+
+def test_code_index_nace(benchmark):
+    dataframes = nace_like_dataframes()
+
+    def index_and_look_up() -> CodeIndex:
+        index = CodeIndex(dataframes)
+        for code in index.codes:
+            assert code in index
+        return index
+
+    index = benchmark(index_and_look_up)
+    assert len(index.codes) == len(dataframes[SupportedLanguages.NORSK_BOKMÅL])
+
+
+@pytest.fixture(scope="module")
+def bucket_paths() -> list[str]:
+    return [f"gs://ssb-{p}" for p in naming_standard_paths(20, 25)]
+
+
+def test_dapla_dataset_path_info(benchmark, bucket_paths):
+    def parse() -> list[bool]:
+        return [
+            DaplaDatasetPathInfo(p).path_complies_with_naming_standard()
+            for p in bucket_paths
+        ]
+
+    assert any(benchmark(parse))
+
+
+def test_dapla_dataset_path_info_parse_many(benchmark, bucket_paths):
+    table = benchmark(DaplaDatasetPathInfo.parse_many, bucket_paths)
+    assert table.num_rows == len(bucket_paths)
+
+
+def test_parse_metadata_document(benchmark, num_variables):
+    content = json.dumps(metadata_document(num_variables))
+    entry = benchmark(parse_metadata_document, DATASET_PATH, content)
+    assert len(entry.variables) == num_variables
+
+
+@pytest.fixture(scope="module")
+def documents_bucket(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("catalog")
+    for path in naming_standard_paths(10, 10):
+        write_metadata_document(root / path.replace(".parquet", "__DOC.json"), 20)
+    return root / "produkt"
+
+
+def test_build_catalog(benchmark, documents_bucket):
+    def build() -> CatalogBuildResult:
+        with MetadataCatalog() as catalog:
+            return catalog.build(documents_bucket)
+
+    result = benchmark(build)
+    assert len(result.indexed) == len(naming_standard_paths(10, 10))
+
+
+def test_rebuild_catalog_unchanged(benchmark, documents_bucket):
+    with MetadataCatalog() as catalog:
+        catalog.build(documents_bucket)
+        result = benchmark(catalog.build, documents_bucket)
+    assert result.indexed == []
+
+
+def test_reference_index_impact_report(benchmark, documents_bucket):
+    with MetadataCatalog() as catalog:
+        index = ReferenceIndex(catalog)
+        index.update(documents_bucket)
+        report = benchmark(
+            index.impact_report, "https://www.ssb.no/klass/klassifikasjoner/7"
+        )
+    assert len(report.datasets) == len(naming_standard_paths(10, 10))
+
+
+@pytest.fixture(scope="module")
+def audited_bucket(tmp_path_factory) -> Path:
+    root = tmp_path_factory.mktemp("audit")
+    for i, path in enumerate(naming_standard_paths(10, 10)):
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_bytes(b"")
+        if i % 2 == 0:
+            write_metadata_document(root / path.replace(".parquet", "__DOC.json"), 20)
+    return root / "produkt"
+
+
+def test_audit_coverage(benchmark, audited_bucket):
+    audit = benchmark(audit_coverage, audited_bucket)
+    assert len(audit.undocumented()) == len(naming_standard_paths(10, 10)) // 2
@@ -0,0 +1,15 @@
+"""Benchmarks for checking buckets against the naming standard."""
+
+import asyncio
+
+import pytest
+
+from benchmarks.generators import write_bucket_tree
+from dapla_metadata.standards import check_naming_standard
+
+
+@pytest.mark.parametrize(("num_statistics", "datasets_per_state"), [(5, 10), (20, 50)])
+def test_check_naming_standard(benchmark, tmp_path, num_statistics, datasets_per_state):
+    bucket = write_bucket_tree(tmp_path, num_statistics, datasets_per_state)
+    results = benchmark(lambda: asyncio.run(check_naming_standard(bucket)))
+    assert len(results) == num_statistics * 4 * datasets_per_state
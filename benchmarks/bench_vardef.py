@@ -0,0 +1,44 @@
+"""Benchmarks for deserializing responses from Vardef."""
+
+import pytest
+import urllib3
+
+from benchmarks.generators import vardef_list_response
+from dapla_metadata.variable_definitions._generated.vardef_client.configuration import (
+    Configuration,
+)
+from dapla_metadata.variable_definitions._utils import _client
+from dapla_metadata.variable_definitions._utils._client import VardefClient
+from dapla_metadata.variable_definitions.vardef import Vardef
+
+
+@pytest.fixture
+def vardef_stub(mocker):
+    """Answer all requests to Vardef with a fixed response, without a network."""
+    mocker.patch.object(_client, "refresh_access_token", return_value="token")
+    mocker.patch.object(VardefClient, "_client", None)
+    mocker.patch.object(
+        VardefClient, "_config", Configuration(host="http://vardef.stub")
+    )
+    pool_manager = VardefClient.get_client().rest_client.pool_manager
+
+    def respond_with(body: bytes) -> None:
+        mocker.patch.object(
+            pool_manager,
+            "request",
+            side_effect=lambda *_, **__: urllib3.HTTPResponse(
+                body=body,
+                status=200,
+                headers={"Content-Type": "application/json"},
+                preload_content=False,
+            ),
+        )
+
+    return respond_with
+
+
+@pytest.mark.parametrize("num_definitions", [10, 100, 1000])
+def test_list_variable_definitions(benchmark, vardef_stub, num_definitions):
+    vardef_stub(vardef_list_response(num_definitions))
+    definitions = benchmark(Vardef.list_variable_definitions)
+    assert len(definitions) == num_definitions
@@ -0,0 +1,24 @@
+"""Shared fixtures for the benchmarks."""
+
+import os
+
+import pytest
+
+from dapla_metadata.dapla import user_info
+from dapla_metadata.dapla.user_info import TestUserInfo
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+
+
+@pytest.fixture(autouse=True)
+def _no_platform(mocker):
+    """Run as on an unknown platform, without any network calls."""
+    mocker.patch.dict(os.environ, clear=True)
+    user_info.set_user_info_provider(TestUserInfo)
+    yield
+    user_info.set_user_info_provider(None)
+
+
+@pytest.fixture
+def subject_mapping() -> StatisticSubjectMapping:
+    """A statistic subject mapping which is not fetched from anywhere."""
+    return StatisticSubjectMapping(None, None)
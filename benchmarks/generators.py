@@ -0,0 +1,229 @@
+"""Generate synthetic datasets, metadata documents and buckets for benchmarks.
+
+The generators are deterministic, so the same arguments always give the same
+data and results can be compared between versions of the package.
+"""
+
+from __future__ import annotations
+
+import copy
+import datetime as dt
+import json
+import string
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dapla_metadata.datasets.compatibility import is_metadata_in_container_structure
+from dapla_metadata.datasets.compatibility import upgrade_metadata
+from dapla_metadata.datasets.compatibility._utils import DATADOC_KEY
+from dapla_metadata.datasets.compatibility._utils import VARIABLES_KEY
+from dapla_metadata.datasets.compatibility.model_backwards_compatibility import (
+    SUPPORTED_VERSIONS,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+CURRENT_VERSION = list(SUPPORTED_VERSIONS)[-1]
+
+COMPATIBILITY_DOCUMENTS_DIRECTORY = (
+    "tests/datasets/resources/existing_metadata_file/compatibility"
+)
+
+DATA_STATES = ["inndata", "klargjorte_data", "statistikk", "utdata"]
+
+_COLUMN_TYPES: list[pa.DataType] = [
+    pa.int64(),
+    pa.float64(),
+    pa.string(),
+    pa.bool_(),
+    pa.date32(),
+    pa.timestamp("us"),
+]
+
+
+def short_name(index: int) -> str:
+    """A valid, unique short name for the variable with the given index."""
+    return f"var_{index:05d}"
+
+
+def wide_schema(num_columns: int) -> pa.Schema:
+    """A schema with the given number of columns of all supported types."""
+    return pa.schema(
+        (short_name(i), _COLUMN_TYPES[i % len(_COLUMN_TYPES)])
+        for i in range(num_columns)
+    )
+
+
+def write_wide_parquet(path: Path, num_columns: int, num_rows: int = 10) -> Path:
+    """Write a Parquet file with a wide schema and a few rows of data.
+
+    Args:
+        path: Where to write the file. Parent directories are created.
+        num_columns: The number of columns.
+        num_rows: The number of rows.
+
+    Returns:
+        The path of the file.
+    """
+    schema = wide_schema(num_columns)
+    start = dt.datetime(2021, 1, 1)  # noqa: DTZ001
+    values: dict[pa.DataType, list] = {
+        pa.int64(): list(range(num_rows)),
+        pa.float64(): [i / 3 for i in range(num_rows)],
+        pa.string(): [string.ascii_letters[i % 52] * 8 for i in range(num_rows)],
+        pa.bool_(): [i % 2 == 0 for i in range(num_rows)],
+        pa.date32(): [(start + dt.timedelta(days=i)).date() for i in range(num_rows)],
+        pa.timestamp("us"): [start + dt.timedelta(hours=i) for i in range(num_rows)],
+    }
+    table = pa.table(
+        [pa.array(values[f.type], type=f.type) for f in schema], schema=schema
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path)
+    return path
+
+
+def _template_document(version: str) -> dict[str, Any]:
+    if version == CURRENT_VERSION:
+        return upgrade_metadata(_template_document(list(SUPPORTED_VERSIONS)[-2]))
+    directory = f"v{version.replace('.', '_')}"
+    with open(  # noqa: PTH123
+        f"{COMPATIBILITY_DOCUMENTS_DIRECTORY}/{directory}/person_data_v1__DOC.json",
+        encoding="utf-8",
+    ) as f:
+        return json.load(f)
+
+
+def metadata_document(
+    num_variables: int, version: str = CURRENT_VERSION
+) -> dict[str, Any]:
+    """A metadata document with the given number of variables.
+
+    The variables are copies of the first variable in the document used to
+    test compatibility with the given version, with unique short names and
+    reference URLs which can be converted to URNs.
+
+    Args:
+        num_variables: The number of variables.
+        version: The version of the document, one of the supported versions.
+
+    Returns:
+        The document, as read from JSON.
+    """
+    document = _template_document(version)
+    datadoc = (
+        document[DATADOC_KEY]
+        if is_metadata_in_container_structure(document)
+        else document
+    )
+    template = datadoc[VARIABLES_KEY][0]
+    variables = []
+    for i in range(num_variables):
+        variable = copy.deepcopy(template)
+        variable["short_name"] = short_name(i)
+        if "id" in variable:
+            variable["id"] = f"00000000-0000-4000-8000-{i:012d}"
+        if "definition_uri" in variable:
+            variable["definition_uri"] = (
+                f"https://catalog.ssb.no/variable-definitions/{i % 1000:08d}"
+            )
+        if "classification_uri" in variable:
+            variable["classification_uri"] = (
+                f"https://www.ssb.no/klass/klassifikasjoner/{i % 100}"
+            )
+        variables.append(variable)
+    datadoc[VARIABLES_KEY] = variables
+    return document
+
+
+def write_metadata_document(
+    path: Path, num_variables: int, version: str = CURRENT_VERSION
+) -> Path:
+    """Write a metadata document generated by `metadata_document` to a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(metadata_document(num_variables, version)))
+    return path
+
+
+def naming_standard_paths(
+    num_statistics: int, datasets_per_state: int, bucket: str = "produkt"
+) -> list[str]:
+    """Relative paths of datasets in a bucket which follows the naming standard.
+
+    Every fifth dataset lacks a period, so that it violates the standard.
+
+    Args:
+        num_statistics: The number of statistic folders in the bucket.
+        datasets_per_state: The number of datasets in each data state folder.
+        bucket: The name of the bucket folder.
+
+    Returns:
+        The paths, such as `produkt/stat000/inndata/data0000_p2021_v1.parquet`.
+    """
+    paths = []
+    for s in range(num_statistics):
+        for state in DATA_STATES:
+            for d in range(datasets_per_state):
+                period = "" if d % 5 == 4 else f"_p{2000 + d % 25}"
+                paths.append(
+                    f"{bucket}/stat{s:03d}/{state}/data{d:04d}{period}_v1.parquet"
+                )
+    return paths
+
+
+def write_bucket_tree(
+    root: Path, num_statistics: int, datasets_per_state: int, bucket: str = "produkt"
+) -> Path:
+    """Create empty dataset files in a bucket which follows the naming standard.
+
+    Args:
+        root: The directory to create the bucket in.
+        num_statistics: The number of statistic folders in the bucket.
+        datasets_per_state: The number of datasets in each data state folder.
+        bucket: The name of the bucket folder.
+
+    Returns:
+        The path of the bucket.
+    """
+    for path in naming_standard_paths(num_statistics, datasets_per_state, bucket):
+        file = root / path
+        file.parent.mkdir(parents=True, exist_ok=True)
+        file.touch()
+    return root / bucket
+
+
+def vardef_list_response(num_definitions: int) -> bytes:
+    """The body of a response from Vardef listing variable definitions."""
+    language_string = {"nb": "test", "nn": "test", "en": "test"}
+    definitions = [
+        {
+            "id": f"{i:08d}",
+            "patch_id": 1,
+            "name": {"nb": f"Variabel {i}", "nn": f"Variabel {i}", "en": f"Var {i}"},
+            "short_name": short_name(i),
+            "definition": language_string,
+            "classification_reference": "91",
+            "unit_types": ["01"],
+            "subject_fields": ["al", "be"],
+            "contains_special_categories_of_personal_data": False,
+            "variable_status": "PUBLISHED_EXTERNAL",
+            "measurement_type": "02.01",
+            "valid_from": "2024-11-01",
+            "valid_until": None,
+            "external_reference_uri": "https://www.example.com",
+            "comment": language_string,
+            "related_variable_definition_uris": ["https://www.example.com"],
+            "owner": {"team": "my_team", "groups": ["my_team_developers"]},
+            "contact": {"title": language_string, "email": "me@example.com"},
+            "created_at": "2024-11-01T00:00:00",
+            "created_by": "ano@ssb.no",
+            "last_updated_at": "2024-11-01T00:00:00",
+            "last_updated_by": "ano@ssb.no",
+        }
+        for i in range(num_definitions)
+    ]
+    return json.dumps(definitions).encode()
@@ -84,6 +84,22 @@ def tests(session: nox.Session) -> None:
     )
 
 
+@nox.session(python=python_versions[-1], default=False)
+def benchmarks(session: nox.Session) -> None:
+    """Run the benchmarks and save the results for comparison."""
+    install_with_uv(session, groups=["test"])
+    session.install("pytest-benchmark>=4.0.0")
+    session.run(
+        "pytest",
+        "benchmarks",
+        "-o",
+        "python_files=bench_*.py",
+        "--benchmark-storage=.benchmarks",
+        "--benchmark-autosave",
+        *session.posargs,
+    )
+
+
 @nox.session(python=python_versions[-1], default=False)
 def coverage(session: nox.Session) -> None:
     """Produce the coverage report."""
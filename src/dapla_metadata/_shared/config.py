@@ -1,19 +1,33 @@
-"""Configuration management for dataset package."""
+"""Configuration management for dataset package.
+
+The `get_*` functions read the environment on each call. Code which reads the
+configuration in loops uses `get_config`, which returns an immutable snapshot
+taken once and kept until `reload_config` is called.
+"""
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
+import threading
+from dataclasses import dataclass
+from dataclasses import field
 from pprint import pformat
+from types import MappingProxyType
+from typing import TYPE_CHECKING
 
 from dotenv import dotenv_values
-from dotenv import load_dotenv
 from upath import UPath
 
 from dapla_metadata._shared.enums import DaplaEnvironment
 from dapla_metadata._shared.enums import DaplaRegion
 from dapla_metadata._shared.enums import DaplaService
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Mapping
+
 logger = logging.getLogger(__name__)
 
 DOT_ENV_FILE_PATH = UPath(__file__).parent.joinpath(".env")
@@ -32,16 +46,33 @@ DATADOC_STATISTICAL_SUBJECT_SOURCE_URL_DEFAULT = (
 
 
 env_loaded = False
+dotenv_checked = False
+# The environment variables which were set from the .env file
+_dotenv_items: set[str] = set()
+
 
+def _load_dotenv_file(*, recheck: bool = False) -> None:
+    """Load the .env file into the environment, if there is one.
 
-def _load_dotenv_file() -> None:
-    global env_loaded  # noqa: PLW0603
-    if not env_loaded and DOT_ENV_FILE_PATH.exists():
-        load_dotenv(str(DOT_ENV_FILE_PATH))
+    The file system is only checked for the file once, unless `recheck` is True.
+    Variables set in the environment before the .env file was loaded take
+    precedence over it, while variables set from an earlier version of the
+    .env file are updated.
+    """
+    global env_loaded, dotenv_checked  # noqa: PLW0603
+    if dotenv_checked and not recheck:
+        return
+    dotenv_checked = True
+    if DOT_ENV_FILE_PATH.exists():
+        values = dotenv_values(str(DOT_ENV_FILE_PATH))
+        for item, value in values.items():
+            if value is not None and (item not in os.environ or item in _dotenv_items):
+                os.environ[item] = value
+                _dotenv_items.add(item)
         env_loaded = True
         logger.info(
             "Loaded .env file with config keys: \n%s",
-            pformat(list(dotenv_values(str(DOT_ENV_FILE_PATH)).keys())),
+            pformat(list(values.keys())),
         )
 
 
@@ -107,3 +138,151 @@ def get_oidc_token(*, raising: bool = False) -> str | None:
 def get_dapla_group_context(*, raising: bool = False) -> str | None:
     """Get the group which the user has chosen to represent."""
     return get_config_item(DAPLA_GROUP_CONTEXT, raising=raising)
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """The configuration at one point in time.
+
+    The typed accessors raise ValueError for unknown values, like the
+    corresponding `get_*` functions.
+
+    Attributes:
+        values: The environment variables when the snapshot was taken.
+    """
+
+    values: Mapping[str, str] = field(default_factory=dict)
+
+    def get(self, item: str, *, raising: bool = False) -> str | None:
+        """Get a config item.
+
+        Args:
+            item: The name of the environment variable to obtain.
+            raising: `True` if an exception should be raised when the item isn't present.
+
+        Returns:
+            The set value or `None`
+
+        Raises:
+            OSError: Only if `raising` is True and the item is not found.
+        """
+        value = self.values.get(item)
+        if raising and not value:
+            msg = f"Environment variable {item} not defined."
+            raise OSError(msg)
+        return value
+
+    def changed_items(self, other: ConfigSnapshot) -> set[str]:
+        """The names of the items which differ from another snapshot."""
+        return {
+            item
+            for item in self.values.keys() | other.values.keys()
+            if self.values.get(item) != other.values.get(item)
+        }
+
+    @functools.cached_property
+    def dapla_region(self) -> DaplaRegion | None:
+        """The Dapla region we're running on."""
+        region = self.get(DAPLA_REGION)
+        return DaplaRegion(region) if region else None
+
+    @functools.cached_property
+    def dapla_environment(self) -> DaplaEnvironment | None:
+        """The Dapla environment we're running on."""
+        env = self.get(DAPLA_ENVIRONMENT)
+        return DaplaEnvironment(env) if env else None
+
+    @functools.cached_property
+    def dapla_service(self) -> DaplaService | None:
+        """The Dapla service we're running on."""
+        service = self.get(DAPLA_SERVICE)
+        return DaplaService(service) if service else None
+
+    @property
+    def dapla_group_context(self) -> str | None:
+        """The group which the user has chosen to represent."""
+        return self.get(DAPLA_GROUP_CONTEXT)
+
+    @property
+    def oidc_token(self) -> str | None:
+        """The JWT token."""
+        return self.get(OIDC_TOKEN)
+
+    @property
+    def statistical_subject_source_url(self) -> str:
+        """The URL to the statistical subject source."""
+        return (
+            self.get("DATADOC_STATISTICAL_SUBJECT_SOURCE_URL")
+            or DATADOC_STATISTICAL_SUBJECT_SOURCE_URL_DEFAULT
+        )
+
+
+type ConfigChangeHook = Callable[[ConfigSnapshot, ConfigSnapshot], None]
+
+_snapshot: ConfigSnapshot | None = None
+_change_hooks: list[ConfigChangeHook] = []
+_snapshot_lock = threading.RLock()
+
+
+def _take_snapshot() -> ConfigSnapshot:
+    snapshot = ConfigSnapshot(MappingProxyType(dict(os.environ)))
+    logger.debug("Took config snapshot with %s items", len(snapshot.values))
+    return snapshot
+
+
+def get_config() -> ConfigSnapshot:
+    """Get the configuration snapshot, taking it on first use.
+
+    The snapshot does not change when the environment does. Call
+    `reload_config` to pick up changes.
+    """
+    global _snapshot  # noqa: PLW0603
+    if (snapshot := _snapshot) is not None:
+        return snapshot
+    with _snapshot_lock:
+        if _snapshot is None:
+            _load_dotenv_file()
+            _snapshot = _take_snapshot()
+        return _snapshot
+
+
+def reload_config() -> ConfigSnapshot:
+    """Take a new configuration snapshot, reading the .env file again.
+
+    The hooks registered with `on_config_change` are called if the
+    configuration changed.
+
+    Returns:
+        The new snapshot.
+    """
+    global _snapshot
+    with _snapshot_lock:
+        _load_dotenv_file(recheck=True)
+        previous, _snapshot = _snapshot, _take_snapshot()
+        current = _snapshot
+        hooks = list(_change_hooks)
+    if previous is not None and (changed := current.changed_items(previous)):
+        logger.info("Config changed: %s", sorted(changed))
+        for hook in hooks:
+            hook(previous, current)
+    return current
+
+
+def on_config_change(hook: ConfigChangeHook) -> Callable[[], None]:
+    """Register a function to call when `reload_config` finds changes.
+
+    Args:
+        hook: Called with the previous and the new snapshot.
+
+    Returns:
+        A function which unregisters the hook.
+    """
+    with _snapshot_lock:
+        _change_hooks.append(hook)
+
+    def unregister() -> None:
+        with _snapshot_lock:
+            if hook in _change_hooks:
+                _change_hooks.remove(hook)
+
+    return unregister
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import logging
+import threading
+from typing import TYPE_CHECKING
 from typing import Protocol
 
 import jwt
@@ -9,6 +12,9 @@ import jwt
 from dapla_metadata._shared import config
 from dapla_metadata._shared.enums import DaplaRegion
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
 logger = logging.getLogger(__name__)
 
 
@@ -66,12 +72,12 @@ class TestUserInfo:
         return TestUserInfo.PLACEHOLDER_EMAIL_ADDRESS
 
     @property
-    def current_group(self) -> str | None:
+    def current_group(self) -> str:
         """Get the group which the user is currently representing."""
         return TestUserInfo.PLACEHOLDER_GROUP
 
     @property
-    def current_team(self) -> str | None:
+    def current_team(self) -> str:
         """Get the team which the user is currently representing."""
         return TestUserInfo.PLACEHOLDER_TEAM
 
@@ -82,13 +88,11 @@ class DaplaLabUserInfo:
     @property
     def short_email(self) -> str | None:
         """Get the short email address."""
-        encoded_jwt = config.get_oidc_token()
+        encoded_jwt = config.get_config().oidc_token
         if encoded_jwt:
-            # The JWT has been verified by the platform prior to injection, no need to verify.
-            decoded_jwt = jwt.decode(encoded_jwt, options={"verify_signature": False})
             with contextlib.suppress(KeyError):
                 # If email can't be found in the JWT, fall through and return None
-                return decoded_jwt["email"]
+                return _decode_jwt(encoded_jwt)["email"]
 
         logger.warning(
             "Could not access JWT from environment. Could not get short email address.",
@@ -98,7 +102,7 @@ class DaplaLabUserInfo:
     @property
     def current_group(self) -> str:
         """Get the group which the user is currently representing."""
-        if group := config.get_dapla_group_context():
+        if group := config.get_config().dapla_group_context:
             return group
         msg = "DAPLA_GROUP_CONTEXT environment variable not found"
         raise OSError(msg)
@@ -109,9 +113,44 @@ class DaplaLabUserInfo:
         return parse_team_name(self.current_group)
 
 
-def get_user_info_for_current_platform() -> UserInfo:
-    """Return the correct implementation of UserInfo for the current platform."""
-    if config.get_dapla_region() == DaplaRegion.DAPLA_LAB:
+@functools.lru_cache(maxsize=8)
+def _decode_jwt(encoded_jwt: str) -> dict:
+    """Decode a JWT, once per token value.
+
+    A refreshed token is picked up when the configuration is reloaded, and the
+    new value is decoded on first use.
+    """
+    # The JWT has been verified by the platform prior to injection, no need to verify.
+    return jwt.decode(encoded_jwt, options={"verify_signature": False})
+
+
+class CachedUserInfoProvider:
+    """Provide the UserInfo for the current platform, reusing it between calls.
+
+    A new UserInfo is only created when the Dapla region changes. The user
+    info for Dapla Lab reads the token and group from the configuration
+    snapshot on each access, so changes to them are picked up by
+    `config.reload_config`.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the provider without a cached UserInfo."""
+        self._region: DaplaRegion | None = None
+        self._user_info: UserInfo | None = None
+        self._lock = threading.Lock()
+
+    def __call__(self) -> UserInfo:
+        """Return the UserInfo for the current platform."""
+        region = config.get_config().dapla_region
+        with self._lock:
+            if self._user_info is None or region != self._region:
+                self._region = region
+                self._user_info = _user_info_for_region(region)
+            return self._user_info
+
+
+def _user_info_for_region(region: DaplaRegion | None) -> UserInfo:
+    if region == DaplaRegion.DAPLA_LAB:
         return DaplaLabUserInfo()
     logger.warning(
         "Was not possible to retrieve user information! Some fields may not be set.",
@@ -119,6 +158,28 @@ def get_user_info_for_current_platform() -> UserInfo:
     return UnknownUserInfo()
 
 
+_user_info_provider: Callable[[], UserInfo] = CachedUserInfoProvider()
+
+
+def set_user_info_provider(provider: Callable[[], UserInfo] | None) -> None:
+    """Set how the UserInfo for the current platform is obtained.
+
+    This makes it possible to use the same user information for all datasets
+    in a batch session, or fixed user information in tests.
+
+    Args:
+        provider: Returns the UserInfo to use, None to restore the default.
+    """
+    global _user_info_provider  # noqa: PLW0603
+    _user_info_provider = provider or CachedUserInfoProvider()
+
+
+def get_user_info_for_current_platform() -> UserInfo:
+    """Return the correct implementation of UserInfo for the current platform."""
+    return _user_info_provider()
+
+
+@functools.lru_cache(maxsize=32)
 def parse_team_name(group: str) -> str:
     """Parses the group to get the current team.
 
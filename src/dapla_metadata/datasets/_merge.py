@@ -87,8 +87,8 @@ def check_dataset_consistency(
     Returns:
         List of consistency check results.
     """
-    new_dataset_path_info = DaplaDatasetPathInfo(new_dataset_path)
-    existing_dataset_path_info = DaplaDatasetPathInfo(existing_dataset_path)
+    new_dataset_path_info = DaplaDatasetPathInfo.cached(new_dataset_path)
+    existing_dataset_path_info = DaplaDatasetPathInfo.cached(existing_dataset_path)
     return [
         DatasetConsistencyStatus(
             message=BUCKET_NAME_MESSAGE,
@@ -0,0 +1,426 @@
+"""Audit how well the datasets in buckets are documented.
+
+A bucket is listed once, and each parquet dataset is paired with its metadata
+document. Only the obligatory fields are taken from each document, and the
+completeness of all the datasets is computed on columnar tables. The result
+can be aggregated by bucket, team or dataset state.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import batched
+from typing import TYPE_CHECKING
+from typing import Any
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from datadoc_model.all_optional import model
+from upath import UPath
+
+from dapla_metadata.datasets.catalog import CATALOG_BATCH_SIZE
+from dapla_metadata.datasets.catalog import CATALOG_READ_WORKERS
+from dapla_metadata.datasets.catalog import describe_error
+from dapla_metadata.datasets.catalog import list_objects
+from dapla_metadata.datasets.catalog import read_datadoc
+from dapla_metadata.datasets.catalog import read_or_error
+from dapla_metadata.datasets.dapla_dataset_path_info import DaplaDatasetPathInfo
+from dapla_metadata.datasets.utility.constants import METADATA_DOCUMENT_FILE_SUFFIX
+from dapla_metadata.datasets.utility.constants import (
+    OBLIGATORY_DATASET_METADATA_IDENTIFIERS,
+)
+from dapla_metadata.datasets.utility.constants import (
+    OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS,
+)
+from dapla_metadata.datasets.utility.constants import PARQUET_DATASET_FILE_EXTENSION
+from dapla_metadata.datasets.utility.utils import build_metadata_document_path
+from dapla_metadata.datasets.variable_index import is_missing
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from upath.types import ReadablePathLike
+
+logger = logging.getLogger(__name__)
+
+DATASET_FIELDS = tuple(OBLIGATORY_DATASET_METADATA_IDENTIFIERS)
+VARIABLE_FIELDS = tuple(OBLIGATORY_VARIABLES_METADATA_IDENTIFIERS)
+
+# Like `Datadoc.percent_complete`, obligatory fields which the model lacks are
+# counted as completed
+_MODEL_DATASET_FIELDS = [f in model.Dataset.model_fields for f in DATASET_FIELDS]
+_MODEL_VARIABLE_FIELDS = [f in model.Variable.model_fields for f in VARIABLE_FIELDS]
+
+# The columns which audits are commonly aggregated by
+BUCKET = ("bucket_name",)
+TEAM = ("owner",)
+DATASET_STATE = ("dataset_state",)
+
+_AUDIT_COLUMNS: list[tuple[str, pa.DataType]] = [
+    ("dataset_path", pa.string()),
+    ("document_path", pa.string()),
+    ("bucket_name", pa.string()),
+    ("statistic_short_name", pa.string()),
+    ("owner", pa.string()),
+    ("dataset_state", pa.string()),
+    ("has_document", pa.bool_()),
+    ("error", pa.string()),
+    ("num_variables", pa.int64()),
+    ("percentage_complete", pa.int64()),
+    *[(f"missing_{f}", pa.bool_()) for f in DATASET_FIELDS],
+    *[(f"variables_missing_{f}", pa.int64()) for f in VARIABLE_FIELDS],
+]
+
+AUDIT_SCHEMA = pa.schema(_AUDIT_COLUMNS)
+
+# The level, column prefix and fields of the columns with missing fields
+_MISSING_COLUMNS = [
+    ("dataset", "missing_", DATASET_FIELDS),
+    ("variable", "variables_missing_", VARIABLE_FIELDS),
+]
+
+
+@dataclass
+class DocumentFields:
+    """The fields of a metadata document which are audited.
+
+    Attributes:
+        owner: The team which owns the dataset.
+        dataset_state: The state of the dataset.
+        missing_dataset_fields: Whether each of `DATASET_FIELDS` is missing.
+        missing_variable_fields: Whether each of `VARIABLE_FIELDS` is missing,
+            with one row per variable.
+    """
+
+    owner: str | None
+    dataset_state: str | None
+    missing_dataset_fields: list[bool]
+    missing_variable_fields: np.ndarray
+
+
+def read_document_fields(document_path: str) -> DocumentFields:
+    """Read the audited fields of a metadata document.
+
+    The variables are not validated against the model.
+
+    Raises:
+        OSError: If the document can't be read.
+        ValueError: If the content is not JSON.
+        UnknownModelVersionError: If the document version is not supported.
+    """
+    datadoc = read_datadoc(UPath(document_path).read_bytes())
+    dataset = datadoc.get("dataset") or {}
+    variables = datadoc.get("variables") or []
+    return DocumentFields(
+        owner=dataset.get("owner"),
+        dataset_state=dataset.get("dataset_state"),
+        missing_dataset_fields=[
+            in_model and is_missing(dataset.get(f))
+            for f, in_model in zip(DATASET_FIELDS, _MODEL_DATASET_FIELDS, strict=True)
+        ],
+        missing_variable_fields=np.array(
+            [
+                [
+                    in_model and is_missing(v.get(f))
+                    for f, in_model in zip(
+                        VARIABLE_FIELDS, _MODEL_VARIABLE_FIELDS, strict=True
+                    )
+                ]
+                for v in variables
+            ],
+            dtype=bool,
+        ).reshape(len(variables), len(VARIABLE_FIELDS)),
+    )
+
+
+def _read_or_error(document_path: str) -> DocumentFields | str:
+    fields = read_or_error(read_document_fields, document_path)
+    return describe_error(fields) if isinstance(fields, Exception) else fields
+
+
+def dataset_of(path: str) -> str | None:
+    """The dataset a parquet file belongs to, or None if it is not parquet.
+
+    Files in hive style partitions (e.g. `aar=2018`) and in directories named
+    like parquet files belong to the dataset of the directory.
+
+    Examples:
+        >>> dataset_of("gs://b/stat/inndata/data_p2018_v1/aar=2018/part-0.parquet")
+        'gs://b/stat/inndata/data_p2018_v1'
+        >>> dataset_of("gs://b/stat/inndata/data_p2018_v1.parquet")
+        'gs://b/stat/inndata/data_p2018_v1.parquet'
+    """
+    if not path.endswith(PARQUET_DATASET_FILE_EXTENSION):
+        return None
+    parts = path.split("/")
+    for index, part in enumerate(parts[:-1]):
+        key, separator, _ = part.partition("=")
+        if key and separator:
+            return "/".join(parts[:index])
+        if part.endswith(PARQUET_DATASET_FILE_EXTENSION):
+            return "/".join(parts[: index + 1])
+    return path
+
+
+@dataclass
+class CoverageAudit:
+    """The documentation of all the datasets in some buckets.
+
+    Attributes:
+        datasets: One row per parquet dataset, with the columns of
+            `AUDIT_SCHEMA`. Datasets without a readable document have null
+            completeness and missing fields.
+        orphaned_documents: Metadata documents without a dataset.
+    """
+
+    datasets: pa.Table
+    orphaned_documents: list[str] = field(default_factory=list)
+
+    def undocumented(self) -> pa.Table:
+        """The datasets without a metadata document."""
+        return self.datasets.filter(
+            pc.invert(self.datasets.column("has_document"))
+        ).select(
+            ["dataset_path", "bucket_name", "statistic_short_name", "dataset_state"]
+        )
+
+    def coverage(self, by: Sequence[str] = BUCKET) -> pa.Table:
+        """The number of documented datasets and their completeness, by group.
+
+        Args:
+            by: The columns to group by, such as `BUCKET`, `TEAM` or
+                `DATASET_STATE`.
+
+        Returns:
+            A table with the group columns and `num_datasets`,
+            `num_documented`, `num_undocumented`, `min_percentage_complete`,
+            `median_percentage_complete`, `mean_percentage_complete` and
+            `max_percentage_complete`. The median is approximate.
+        """
+        grouped = self.datasets.group_by(list(by), use_threads=False).aggregate(
+            [
+                ([], "count_all"),
+                ("has_document", "sum"),
+                ("percentage_complete", "min"),
+                ("percentage_complete", "approximate_median"),
+                ("percentage_complete", "mean"),
+                ("percentage_complete", "max"),
+            ]
+        )
+        num_datasets = grouped.column("count_all")
+        num_documented = pc.cast(grouped.column("has_document_sum"), pa.int64())
+        result = (
+            grouped.select(list(by))
+            .append_column("num_datasets", num_datasets)
+            .append_column("num_documented", num_documented)
+            .append_column(
+                "num_undocumented", pc.subtract(num_datasets, num_documented)
+            )
+        )
+        for statistic, aggregate in [
+            ("min", "min"),
+            ("median", "approximate_median"),
+            ("mean", "mean"),
+            ("max", "max"),
+        ]:
+            result = result.append_column(
+                f"{statistic}_percentage_complete",
+                grouped.column(f"percentage_complete_{aggregate}"),
+            )
+        return result
+
+    def completeness_histogram(
+        self,
+        by: Sequence[str] = BUCKET,
+        bin_width: int = 10,
+    ) -> pa.Table:
+        """The distribution of `percentage_complete` of the documented datasets.
+
+        Args:
+            by: The columns to group by.
+            bin_width: The width of the bins, in percentage points. Complete
+                datasets are in the last bin.
+
+        Returns:
+            A table with the group columns, `bin_start` and `num_datasets`,
+            with rows only for the bins with datasets.
+        """
+        documented = self.datasets.filter(
+            pc.is_valid(self.datasets.column("percentage_complete"))
+        )
+        percentage_complete = documented.column("percentage_complete")
+        bins = pc.min_element_wise(
+            pc.multiply(pc.divide(percentage_complete, bin_width), bin_width),
+            99 // bin_width * bin_width,
+        )
+        return (
+            documented.select(list(by))
+            .append_column("bin_start", bins)
+            .group_by([*by, "bin_start"], use_threads=False)
+            .aggregate([([], "count_all")])
+            .rename_columns([*by, "bin_start", "num_datasets"])
+            .sort_by([(c, "ascending") for c in [*by, "bin_start"]])
+        )
+
+    def missing_fields(self, by: Sequence[str] = TEAM) -> pa.Table:
+        """The number of datasets and variables missing each obligatory field, by group.
+
+        Args:
+            by: The columns to group by.
+
+        Returns:
+            A table with the group columns, `level` (`dataset` or `variable`),
+            `field` and `num_missing`, with rows only where fields are missing.
+        """
+        grouped = self.datasets.group_by(list(by), use_threads=False).aggregate(
+            [(f"missing_{f}", "sum") for f in DATASET_FIELDS]
+            + [(f"variables_missing_{f}", "sum") for f in VARIABLE_FIELDS]
+        )
+        tables = [
+            grouped.select(list(by))
+            .append_column("level", pa.repeat(level, grouped.num_rows))
+            .append_column("field", pa.repeat(field_name, grouped.num_rows))
+            .append_column(
+                "num_missing",
+                pc.cast(grouped.column(f"{prefix}{field_name}_sum"), pa.int64()),
+            )
+            for level, prefix, fields in _MISSING_COLUMNS
+            for field_name in fields
+        ]
+        result = pa.concat_tables(tables)
+        # Groups without documented datasets have null sums, which are dropped
+        return result.filter(pc.greater(result.column("num_missing"), pa.scalar(0)))
+
+
+def _completeness(columns: dict[str, Any]) -> pa.Array:
+    """Compute `percentage_complete` for all datasets, like `Datadoc.percent_complete`."""
+    num_variables = pa.array(columns["num_variables"], pa.int64())
+    completed = pa.repeat(0, len(num_variables)).cast(pa.int64())
+    for f in DATASET_FIELDS:
+        missing = pa.array(columns[f"missing_{f}"], pa.bool_())
+        completed = pc.add(completed, pc.cast(pc.invert(missing), pa.int64()))
+    for f in VARIABLE_FIELDS:
+        completed = pc.add(
+            completed,
+            pc.subtract(
+                num_variables, pa.array(columns[f"variables_missing_{f}"], pa.int64())
+            ),
+        )
+    total = pc.add(
+        pc.multiply(num_variables, len(VARIABLE_FIELDS)), len(DATASET_FIELDS)
+    )
+    return pc.cast(
+        pc.round(pc.multiply(pc.divide(pc.cast(completed, pa.float64()), total), 100)),
+        pa.int64(),
+    )
+
+
+def audit_coverage(
+    *prefixes: ReadablePathLike,
+    max_workers: int = CATALOG_READ_WORKERS,
+) -> CoverageAudit:
+    """Audit the documentation of the parquet datasets under the prefixes.
+
+    Each prefix is listed once, and the metadata documents of the datasets are
+    read in parallel.
+
+    Args:
+        prefixes: Buckets or directories in buckets, or local directories.
+        max_workers: The number of documents read at the same time.
+
+    Returns:
+        The audit of every dataset, which can be aggregated.
+
+    Examples:
+        >>> audit = audit_coverage("gs://ssb-befolkning-data-produkt-prod")  # doctest: +SKIP
+        >>> audit.coverage(by=TEAM).to_pandas()  # doctest: +SKIP
+    """
+    dataset_paths: dict[str, None] = {}
+    documents: set[str] = set()
+    for prefix in prefixes:
+        for path in list_objects(prefix):
+            if path.endswith(METADATA_DOCUMENT_FILE_SUFFIX):
+                documents.add(path)
+            elif dataset := dataset_of(path):
+                dataset_paths[dataset] = None
+    paired = {
+        dataset: document
+        for dataset in dataset_paths
+        if (document := str(build_metadata_document_path(dataset))) in documents
+    }
+    columns: dict[str, Any] = {c: [] for c in AUDIT_SCHEMA.names}
+    with ThreadPoolExecutor(
+        max_workers=max_workers, thread_name_prefix="audit"
+    ) as executor:
+        for batch in batched(dataset_paths, CATALOG_BATCH_SIZE):
+            fields = executor.map(
+                lambda d: _read_or_error(paired[d]) if d in paired else None, batch
+            )
+            _add_batch(columns, batch, paired, list(fields))
+    path_info = DaplaDatasetPathInfo.parse_many(columns["dataset_path"])
+    columns["bucket_name"] = path_info["bucket_name"]
+    columns["statistic_short_name"] = path_info["statistic_short_name"]
+    columns["dataset_state"] = pc.coalesce(
+        pa.array(columns["dataset_state"], pa.string()), path_info["dataset_state"]
+    )
+    columns["percentage_complete"] = _completeness(columns)
+    logger.info(
+        "Audited %d datasets, %d with metadata documents",
+        len(dataset_paths),
+        len(paired),
+    )
+    return CoverageAudit(
+        datasets=pa.table(
+            {c: columns[c] for c in AUDIT_SCHEMA.names}, schema=AUDIT_SCHEMA
+        ),
+        orphaned_documents=sorted(documents.difference(paired.values())),
+    )
+
+
+def _add_batch(
+    columns: dict[str, Any],
+    batch: Sequence[str],
+    paired: dict[str, str],
+    read: list[DocumentFields | str | None],
+) -> None:
+    """Add the rows of a batch of datasets, counting the missing variable fields on the batch."""
+    documents = [r if isinstance(r, DocumentFields) else None for r in read]
+    for dataset, result, document in zip(batch, read, documents, strict=True):
+        columns["dataset_path"].append(dataset)
+        columns["document_path"].append(paired.get(dataset))
+        columns["has_document"].append(dataset in paired)
+        columns["error"].append(result if isinstance(result, str) else None)
+        columns["owner"].append(document and document.owner)
+        columns["dataset_state"].append(document and document.dataset_state)
+        columns["num_variables"].append(
+            None if document is None else len(document.missing_variable_fields)
+        )
+        for f, missing in zip(
+            DATASET_FIELDS,
+            document.missing_dataset_fields
+            if document
+            else [None] * len(DATASET_FIELDS),
+            strict=True,
+        ):
+            columns[f"missing_{f}"].append(missing)
+    # The variables of the batch as one columnar table, one column per field
+    missing_fields = np.concatenate(
+        [d.missing_variable_fields for d in documents if d is not None]
+        or [np.empty((0, len(VARIABLE_FIELDS)), dtype=bool)]
+    )
+    rows = np.repeat(
+        np.arange(len(batch)),
+        [0 if d is None else len(d.missing_variable_fields) for d in documents],
+    )
+    for index, f in enumerate(VARIABLE_FIELDS):
+        counts = np.bincount(
+            rows, weights=missing_fields[:, index], minlength=len(batch)
+        ).astype(np.int64)
+        columns[f"variables_missing_{f}"].extend(
+            None if d is None else int(c)
+            for d, c in zip(documents, counts, strict=True)
+        )
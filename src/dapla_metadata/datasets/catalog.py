@@ -0,0 +1,538 @@
+"""Index the metadata documents in a bucket, for querying across datasets.
+
+The catalog is a SQLite database with a row for each dataset and each of its
+variables. Documents are read with a lightweight parser, without the defaults
+and lookups done when opening a `Datadoc`, and a rebuild only reads the
+documents whose object generation has changed since they were indexed.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import logging
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from itertools import batched
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Self
+
+from upath import UPath
+
+from dapla_metadata import metrics
+from dapla_metadata.datasets.compatibility._utils import DATADOC_KEY
+from dapla_metadata.datasets.compatibility._utils import UnknownModelVersionError
+from dapla_metadata.datasets.compatibility._utils import (
+    is_metadata_in_container_structure,
+)
+from dapla_metadata.datasets.compatibility.model_backwards_compatibility import (
+    upgrade_metadata,
+)
+from dapla_metadata.datasets.dapla_dataset_path_info import DaplaDatasetPathInfo
+from dapla_metadata.datasets.utility.constants import METADATA_DOCUMENT_FILE_SUFFIX
+from dapla_metadata.datasets.utility.urn import CombinedUrnConverter
+from dapla_metadata.datasets.utility.urn import klass_urn_converter
+from dapla_metadata.datasets.utility.urn import vardef_urn_converter
+from dapla_metadata.datasets.utility.utils import build_dataset_path
+from dapla_metadata.datasets.utility.utils import object_generation
+
+if TYPE_CHECKING:
+    import os
+    from collections.abc import Callable
+    from collections.abc import Iterable
+    from types import TracebackType
+
+    from upath.types import ReadablePathLike
+
+logger = logging.getLogger(__name__)
+
+CATALOG_READ_WORKERS = 32
+CATALOG_BATCH_SIZE = 1000
+
+CATALOG_DOCUMENTS = metrics.counter(
+    "dapla_metadata_catalog_documents_total",
+    "Metadata documents handled by catalog builds, by outcome.",
+)
+
+# Errors in the content of a document, which are kept until it is rewritten.
+# Errors reading a document, such as network errors, are retried by the next
+# build.
+DOCUMENT_CONTENT_ERRORS = (
+    ValueError,
+    KeyError,
+    TypeError,
+    AttributeError,
+    UnknownModelVersionError,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    path TEXT PRIMARY KEY,
+    generation TEXT NOT NULL,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS datasets (
+    document_path TEXT PRIMARY KEY REFERENCES documents (path) ON DELETE CASCADE,
+    dataset_path TEXT NOT NULL,
+    bucket_name TEXT,
+    statistic_short_name TEXT,
+    short_name TEXT,
+    dataset_state TEXT,
+    dataset_status TEXT,
+    version TEXT,
+    owner TEXT,
+    contains_data_from TEXT,
+    contains_data_until TEXT,
+    percentage_complete INTEGER,
+    num_variables INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variables (
+    document_path TEXT NOT NULL REFERENCES documents (path) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    short_name TEXT,
+    data_type TEXT,
+    variable_role TEXT,
+    definition_urn TEXT,
+    classification_urn TEXT,
+    PRIMARY KEY (document_path, position)
+);
+CREATE INDEX IF NOT EXISTS datasets_short_name ON datasets (short_name);
+CREATE INDEX IF NOT EXISTS datasets_owner ON datasets (owner);
+CREATE INDEX IF NOT EXISTS variables_short_name ON variables (short_name);
+CREATE INDEX IF NOT EXISTS variables_definition_urn ON variables (definition_urn);
+CREATE INDEX IF NOT EXISTS variables_classification_urn
+    ON variables (classification_urn);
+"""
+
+DATASET_COLUMNS = (
+    "document_path",
+    "dataset_path",
+    "bucket_name",
+    "statistic_short_name",
+    "short_name",
+    "dataset_state",
+    "dataset_status",
+    "version",
+    "owner",
+    "contains_data_from",
+    "contains_data_until",
+    "percentage_complete",
+    "num_variables",
+)
+
+VARIABLE_COLUMNS = (
+    "document_path",
+    "position",
+    "short_name",
+    "data_type",
+    "variable_role",
+    "definition_urn",
+    "classification_urn",
+)
+
+_URN_CONVERTER = CombinedUrnConverter([vardef_urn_converter, klass_urn_converter])
+
+
+@functools.lru_cache(maxsize=4096)
+def normalize_urn(value: str | None) -> str | None:
+    """Convert a known URL to its URN, keeping other values as they are.
+
+    Examples:
+        >>> normalize_urn("https://www.ssb.no/klass/klassifikasjoner/91")
+        'urn:ssb:classification:klass:91'
+        >>> normalize_urn("https://www.vg.no")
+        'https://www.vg.no'
+    """
+    if not value:
+        return None
+    urn = _URN_CONVERTER.convert_url_to_urn(value)
+    return value if urn is None else str(urn)
+
+
+@dataclass
+class CatalogEntry:
+    """The catalog rows of one metadata document.
+
+    Attributes:
+        dataset: The values of `DATASET_COLUMNS`.
+        variables: The values of `VARIABLE_COLUMNS` for each variable, in
+            document order.
+    """
+
+    dataset: dict[str, Any]
+    variables: list[dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class CatalogBuildResult:
+    """The outcome of building or rebuilding a catalog.
+
+    Attributes:
+        indexed: The documents which were read and indexed.
+        unchanged: The number of documents which were already indexed at their
+            current generation.
+        removed: The indexed documents which no longer exist.
+        failed: The error for each document which could not be indexed.
+            Documents with invalid content are not read again until their
+            generation changes, while documents which could not be read are
+            read again by the next build.
+    """
+
+    indexed: list[str] = field(default_factory=list)
+    unchanged: int = 0
+    removed: list[str] = field(default_factory=list)
+    failed: dict[str, str] = field(default_factory=dict)
+
+
+def list_objects(prefix: ReadablePathLike) -> dict[str, dict[str, Any]]:
+    """List all the objects under the prefix with one listing.
+
+    Args:
+        prefix: A bucket or a directory in a bucket, or a local directory.
+
+    Returns:
+        The details of each object, as listed by the filesystem, by path.
+    """
+    root = UPath(prefix)
+    base = str(root).rstrip("/")
+    # Listed paths have no protocol, and filesystems differ in leading slashes
+    skip = len(root.path.strip("/"))
+    return {
+        base + name.lstrip("/")[skip:]: info
+        for name, info in root.fs.find(root.path, detail=True).items()
+    }
+
+
+def list_metadata_documents(prefix: ReadablePathLike) -> dict[str, str]:
+    """List the metadata documents under the prefix with one listing.
+
+    Args:
+        prefix: A bucket or a directory in a bucket, or a local directory.
+
+    Returns:
+        The generation of each document, by path.
+    """
+    return {
+        path: object_generation(info)
+        for path, info in list_objects(prefix).items()
+        if path.endswith(METADATA_DOCUMENT_FILE_SUFFIX)
+    }
+
+
+def read_datadoc(content: str | bytes) -> dict[str, Any]:
+    """The upgraded `datadoc` part of a metadata document, as read from JSON.
+
+    The content is not validated against the model. Documents with an empty
+    `datadoc` part give an empty dict.
+
+    Raises:
+        ValueError: If the content is not JSON.
+        UnknownModelVersionError: If the document version is not supported.
+    """
+    document = upgrade_metadata(json.loads(content))
+    if is_metadata_in_container_structure(document):
+        return document[DATADOC_KEY] or {}
+    return document
+
+
+def _dataset_values(document: dict[str, Any]) -> tuple[dict[str, Any], list]:
+    dataset = document.get("dataset") or {}
+    return (
+        {
+            "short_name": dataset.get("short_name"),
+            "dataset_state": dataset.get("dataset_state"),
+            "dataset_status": dataset.get("dataset_status"),
+            "version": dataset.get("version"),
+            "owner": dataset.get("owner"),
+            "contains_data_from": dataset.get("contains_data_from"),
+            "contains_data_until": dataset.get("contains_data_until"),
+            "percentage_complete": document.get("percentage_complete"),
+        },
+        document.get("variables") or [],
+    )
+
+
+def parse_metadata_document(path: str, content: str | bytes) -> CatalogEntry:
+    """Extract the catalog rows from the content of a metadata document.
+
+    Only the indexed fields are read, and none of the variables are validated
+    against the model. URLs of variable definitions and classifications are
+    converted to URNs.
+
+    Args:
+        path: The path of the metadata document.
+        content: The content of the metadata document.
+
+    Raises:
+        ValueError: If the content is not JSON.
+        UnknownModelVersionError: If the document version is not supported.
+    """
+    dataset, variables = _dataset_values(read_datadoc(content))
+    return CatalogEntry(
+        dataset={
+            "document_path": path,
+            "dataset_path": str(build_dataset_path(path)),
+            **dataset,
+            "num_variables": len(variables),
+        },
+        variables=[
+            {
+                "document_path": path,
+                "position": position,
+                "short_name": variable.get("short_name"),
+                "data_type": variable.get("data_type"),
+                "variable_role": variable.get("variable_role"),
+                "definition_urn": normalize_urn(variable.get("definition_uri")),
+                "classification_urn": normalize_urn(variable.get("classification_uri")),
+            }
+            for position, variable in enumerate(variables)
+        ],
+    )
+
+
+def read_catalog_entry(path: str) -> CatalogEntry:
+    """Read a metadata document and extract its catalog rows.
+
+    Raises:
+        OSError: If the document can't be read.
+        ValueError: If the content is not JSON.
+        UnknownModelVersionError: If the document version is not supported.
+    """
+    return parse_metadata_document(path, UPath(path).read_bytes())
+
+
+def read_or_error[T](read: Callable[[str], T], path: str) -> T | Exception:
+    """Read a metadata document, giving the error if it can't be read or parsed.
+
+    Args:
+        read: Reads and parses the document at a path.
+        path: The path of the metadata document.
+
+    Returns:
+        What `read` returned, or the `OSError` or one of the
+        `DOCUMENT_CONTENT_ERRORS` it raised.
+    """
+    try:
+        return read(path)
+    except (OSError, *DOCUMENT_CONTENT_ERRORS) as e:
+        logger.warning("Could not read metadata document %s", path, exc_info=True)
+        return e
+
+
+def _read_or_error(path: str) -> CatalogEntry | Exception:
+    return read_or_error(read_catalog_entry, path)
+
+
+def describe_error(error: Exception) -> str:
+    """Describe an error in one line, starting with its type.
+
+    Examples:
+        >>> describe_error(ValueError("Not JSON"))
+        'ValueError: Not JSON'
+    """
+    return f"{type(error).__name__}: {error}"
+
+
+def _add_path_fields(entries: list[CatalogEntry]) -> None:
+    """Fill in the bucket and statistic, and any period missing in the document, from the path."""
+    paths = DaplaDatasetPathInfo.parse_many(
+        [e.dataset["dataset_path"] for e in entries]
+    ).to_pylist()
+    for entry, path_info in zip(entries, paths, strict=True):
+        dataset = entry.dataset
+        dataset["bucket_name"] = path_info["bucket_name"]
+        dataset["statistic_short_name"] = path_info["statistic_short_name"]
+        for key in ("contains_data_from", "contains_data_until"):
+            if dataset[key] is None and path_info[key] is not None:
+                dataset[key] = path_info[key].isoformat()
+
+
+class MetadataCatalog:
+    """A local index of the datasets and variables in metadata documents.
+
+    Examples:
+        >>> with MetadataCatalog("catalog.sqlite") as catalog:  # doctest: +SKIP
+        ...     catalog.build("gs://ssb-befolkning-data-produkt-prod")
+        ...     catalog.find_variables(short_name="fnr")
+    """
+
+    def __init__(self, database: str | os.PathLike[str] = ":memory:") -> None:
+        """Open the catalog, creating the tables if necessary.
+
+        Args:
+            database: The SQLite database file. The catalog is kept in memory
+                by default.
+        """
+        self.connection = sqlite3.connect(database)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA foreign_keys = ON")
+        self.connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> Self:
+        """Use the catalog in a `with` block, which closes it."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Close the catalog."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.connection.close()
+
+    def generations(self, prefix: ReadablePathLike) -> dict[str, str]:
+        """The generation each indexed document under the prefix was read at."""
+        directory = f"{str(UPath(prefix)).rstrip('/')}/"
+        return dict(
+            self.connection.execute(
+                "SELECT path, generation FROM documents WHERE path >= ? AND path < ?",
+                (directory, f"{directory}\U0010ffff"),
+            ).fetchall()
+        )
+
+    def build(
+        self,
+        prefix: ReadablePathLike,
+        max_workers: int = CATALOG_READ_WORKERS,
+    ) -> CatalogBuildResult:
+        """Index the metadata documents under the prefix.
+
+        The prefix is listed once. Only new documents and documents whose
+        generation has changed are read, in parallel, and documents which no
+        longer exist are removed. The changes are committed in batches, so an
+        interrupted build continues where it stopped.
+
+        Args:
+            prefix: A bucket or a directory in a bucket, or a local directory.
+            max_workers: The number of documents read at the same time.
+
+        Returns:
+            What the build indexed, skipped and removed.
+        """
+        listed = list_metadata_documents(prefix)
+        known = self.generations(prefix)
+        result = CatalogBuildResult(
+            removed=[p for p in known if p not in listed],
+        )
+        changed = [p for p, g in listed.items() if known.get(p) != g]
+        result.unchanged = len(listed) - len(changed)
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM documents WHERE path = ?",
+                [(p,) for p in result.removed],
+            )
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="catalog"
+        ) as executor:
+            for batch in batched(changed, CATALOG_BATCH_SIZE):
+                read = dict(
+                    zip(batch, executor.map(_read_or_error, batch), strict=True)
+                )
+                self._store(read, listed)
+                for path, entry in read.items():
+                    if isinstance(entry, Exception):
+                        result.failed[path] = describe_error(entry)
+                    else:
+                        result.indexed.append(path)
+        CATALOG_DOCUMENTS.inc(len(result.indexed), outcome="indexed")
+        CATALOG_DOCUMENTS.inc(result.unchanged, outcome="unchanged")
+        CATALOG_DOCUMENTS.inc(len(result.removed), outcome="removed")
+        CATALOG_DOCUMENTS.inc(len(result.failed), outcome="failed")
+        logger.info(
+            "Indexed %d metadata documents under %s, %d unchanged, %d removed, %d failed",
+            len(result.indexed),
+            prefix,
+            result.unchanged,
+            len(result.removed),
+            len(result.failed),
+        )
+        return result
+
+    def _store(
+        self,
+        read: dict[str, CatalogEntry | Exception],
+        generations: dict[str, str],
+    ) -> None:
+        # Documents which could not be read keep their rows and generation,
+        # so the next build reads them again
+        stored = {p: e for p, e in read.items() if not isinstance(e, OSError)}
+        entries = [e for e in stored.values() if isinstance(e, CatalogEntry)]
+        _add_path_fields(entries)
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM documents WHERE path = ?", [(p,) for p in stored]
+            )
+            self.connection.executemany(
+                "INSERT INTO documents (path, generation, error) VALUES (?, ?, ?)",
+                [
+                    (
+                        p,
+                        generations[p],
+                        describe_error(e) if isinstance(e, Exception) else None,
+                    )
+                    for p, e in stored.items()
+                ],
+            )
+            self.connection.executemany(
+                f"INSERT INTO datasets VALUES ({', '.join('?' * len(DATASET_COLUMNS))})",  # noqa: S608
+                [tuple(e.dataset[c] for c in DATASET_COLUMNS) for e in entries],
+            )
+            self.connection.executemany(
+                f"INSERT INTO variables VALUES ({', '.join('?' * len(VARIABLE_COLUMNS))})",  # noqa: S608
+                [
+                    tuple(v[c] for c in VARIABLE_COLUMNS)
+                    for e in entries
+                    for v in e.variables
+                ],
+            )
+
+    def find_datasets(self, **criteria: object) -> list[dict[str, Any]]:
+        """The datasets with all the given column values, ordered by path.
+
+        Examples:
+            >>> catalog.find_datasets(owner="team-statistikk", dataset_state="INPUT_DATA")  # doctest: +SKIP
+
+        Raises:
+            ValueError: If a criterion is not one of `DATASET_COLUMNS`.
+        """
+        return self._find("datasets", DATASET_COLUMNS, criteria, "document_path")
+
+    def find_variables(self, **criteria: object) -> list[dict[str, Any]]:
+        """The variables with all the given column values, ordered by document and position.
+
+        Examples:
+            >>> catalog.find_variables(definition_urn="urn:ssb:variable-definition:vardef:ab12cd34")  # doctest: +SKIP
+
+        Raises:
+            ValueError: If a criterion is not one of `VARIABLE_COLUMNS`.
+        """
+        return self._find(
+            "variables", VARIABLE_COLUMNS, criteria, "document_path, position"
+        )
+
+    def _find(
+        self,
+        table: str,
+        columns: Iterable[str],
+        criteria: dict[str, object],
+        order: str,
+    ) -> list[dict[str, Any]]:
+        columns = tuple(columns)
+        unknown = [c for c in criteria if c not in columns]
+        if unknown:
+            msg = f"Unknown {table} columns: {unknown}, must be among {columns}"
+            raise ValueError(msg)
+        where = " AND ".join(f"{c} IS ?" for c in criteria) or "1"
+        rows = self.connection.execute(
+            f"SELECT * FROM {table} WHERE {where} ORDER BY {order}",  # noqa: S608
+            tuple(criteria.values()),
+        )
+        return [dict(row) for row in rows]
@@ -1,20 +1,139 @@
 from __future__ import annotations
 
+import bisect
+import functools
 import logging
+from abc import ABC
+from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+from dapla_metadata import metrics
+from dapla_metadata.datasets.external_sources.cache import TtlLruCache
 from dapla_metadata.datasets.external_sources.external_sources import GetExternalSource
 from dapla_metadata.datasets.utility.enums import SupportedLanguages
 
 if TYPE_CHECKING:
-    from concurrent.futures import ThreadPoolExecutor
+    import datetime as dt
+    from collections.abc import Hashable
 
     import pandas as pd
 from klass.classes.classification import KlassClassification
 
 logger = logging.getLogger(__name__)
 
+CODE_LIST_CACHE_MAXSIZE = 256
+CODE_LIST_CACHE_TTL_SECONDS = 60 * 60
+
+type CodeListCacheKey = tuple[
+    CodeListSource, int | None, int | None, SupportedLanguages, dt.date | None
+]
+
+# Shared by all CodeList instances in the process. Keyed by source,
+# classification ID, level, language and validity date. The cached dataframes
+# must not be modified.
+code_list_cache: TtlLruCache[CodeListCacheKey, pd.DataFrame] = TtlLruCache(
+    maxsize=CODE_LIST_CACHE_MAXSIZE,
+    ttl=CODE_LIST_CACHE_TTL_SECONDS,
+    name="KlassCodes",
+)
+
+
+KLASS_REQUESTS = metrics.counter(
+    "dapla_metadata_klass_requests_total",
+    "Requests for codes to the Klass API, by language.",
+)
+KLASS_REQUEST_SECONDS = metrics.histogram(
+    "dapla_metadata_klass_request_seconds",
+    "Seconds spent on requests for codes to the Klass API, by language.",
+)
+
+
+class CodeListSource(ABC):
+    """Where CodeList gets the codes of classifications from."""
+
+    @abstractmethod
+    def get_codes(
+        self,
+        classification_id: int | None,
+        language: SupportedLanguages,
+        level: int | None = None,
+        date: dt.date | None = None,
+    ) -> pd.DataFrame:
+        """Get the codes of a classification.
+
+        Args:
+            classification_id: The ID of the classification.
+            language: The language of the titles.
+            level: The hierarchical level of codes to get. Defaults to all levels.
+            date: The date the codes should be valid for. Defaults to the current date.
+
+        Returns:
+            A dataframe with the columns returned by the Klass API, such as `code`,
+            `parentCode`, `level` and `name`.
+        """
+
+
+class KlassApiSource(CodeListSource):
+    """Gets the codes from the Klass API."""
+
+    def get_codes(
+        self,
+        classification_id: int | None,
+        language: SupportedLanguages,
+        level: int | None = None,
+        date: dt.date | None = None,
+    ) -> pd.DataFrame:
+        """Get the codes of a classification from the Klass API."""
+        KLASS_REQUESTS.inc(language=language.lower())
+        with KLASS_REQUEST_SECONDS.time(language=language.lower()):
+            return (
+                KlassClassification(
+                    str(classification_id),
+                    language.lower(),  # type: ignore [arg-type]
+                )
+                .get_codes(
+                    from_date=date.isoformat() if date else None,
+                    select_level=level,
+                )
+                .data
+            )
+
+
+_default_source: CodeListSource = KlassApiSource()
+
+
+def get_default_code_list_source() -> CodeListSource:
+    """Get the source used by CodeList instances created without a source."""
+    return _default_source
+
+
+def set_default_code_list_source(source: CodeListSource) -> None:
+    """Set the source used by CodeList instances created without a source.
+
+    This makes it possible to use a local snapshot of Klass everywhere, for
+    example in tests or in jobs without network access.
+
+    Args:
+        source: The source to use.
+    """
+    global _default_source  # noqa: PLW0603
+    _default_source = source
+
+
+@functools.cache
+def _klass_executor() -> ThreadPoolExecutor:
+    """Executor for fetching the languages of a code list concurrently.
+
+    This is separate from the executor passed to CodeList, since the fetches
+    are started from a task running on that executor.
+    """
+    return ThreadPoolExecutor(
+        max_workers=len(SupportedLanguages) * 2,
+        thread_name_prefix="klass",
+    )
+
 
 @dataclass
 class CodeListItem:
@@ -23,10 +142,14 @@ class CodeListItem:
     Attributes:
         titles: A dictionary mapping language codes to titles.
         code: The code associated with the item.
+        parent_code: The code of the parent item in hierarchical classifications.
+        level: The hierarchical level of the item.
     """
 
     titles: dict[SupportedLanguages, str]
     code: str
+    parent_code: str | None = None
+    level: str | None = None
 
     def get_title(self, language: SupportedLanguages) -> str:
         """Return the title in the specified language.
@@ -64,15 +187,135 @@ class CodeListItem:
                 return ""
 
 
+def _column_values(frame: pd.DataFrame, column: str) -> list:
+    """Return the values of a column as a list, with missing values as None."""
+    if column not in frame:
+        return [None] * len(frame)
+    values = frame[column].astype(object)
+    return values.where(values.notna(), None).tolist()
+
+
+class CodeIndex:
+    """A columnar index of the codes in a code list.
+
+    Each attribute is a list with one value per code, in the order received from
+    Klass. Lookup by code is O(1) and prefix search is done by binary search.
+    CodeListItem objects are only created for the codes which are accessed.
+
+    Attributes:
+        codes: The codes.
+        parent_codes: The code of the parent of each code.
+        levels: The hierarchical level of each code.
+        titles: The titles of the codes for each language.
+    """
+
+    def __init__(self, dataframes: dict[SupportedLanguages, pd.DataFrame]) -> None:
+        """Build the index from the code list dataframes for each language.
+
+        The titles of each language are joined to the Norwegian Bokmål codes on
+        the `code` column. Dataframes without a `code` column are joined on
+        position instead.
+
+        Args:
+            dataframes: A dictionary mapping language codes to pandas DataFrames
+                containing classification data.
+        """
+        base = dataframes[SupportedLanguages.NORSK_BOKMÅL]
+        self.codes: list[str | None] = _column_values(base, "code")
+        self.parent_codes: list[str | None] = _column_values(base, "parentCode")
+        self.levels: list[str | None] = _column_values(base, "level")
+        self.titles: dict[SupportedLanguages, list[str | None]] = {}
+        for language, frame in dataframes.items():
+            if "name" not in frame:
+                self.titles[language] = [None] * len(base)
+            elif "code" in base and "code" in frame:
+                names = frame.drop_duplicates("code").set_index("code")["name"]
+                self.titles[language] = _column_values(
+                    base["code"].map(names).to_frame("name"), "name"
+                )
+            else:
+                self.titles[language] = _column_values(
+                    frame["name"].reindex(base.index).to_frame("name"), "name"
+                )
+
+        self._positions: dict[str, int] = {}
+        self._children: dict[str, list[int]] = {}
+        for position, (code, parent_code) in enumerate(
+            zip(self.codes, self.parent_codes, strict=True)
+        ):
+            if code is not None:
+                self._positions.setdefault(code, position)
+            if parent_code is not None:
+                self._children.setdefault(parent_code, []).append(position)
+        self._sorted_codes = sorted(self._positions)
+        self._items: list[CodeListItem | None] = [None] * len(self.codes)
+
+    def __len__(self) -> int:
+        """The number of codes."""
+        return len(self.codes)
+
+    def __contains__(self, code: object) -> bool:
+        """Whether the code is in the code list."""
+        return code in self._positions
+
+    def item(self, position: int) -> CodeListItem:
+        """Return the item at the given position."""
+        item = self._items[position]
+        if item is None:
+            # Codes and titles which are missing from Klass are None
+            titles = {
+                language: values[position] for language, values in self.titles.items()
+            }
+            item = self._items[position] = CodeListItem(
+                titles,  # type: ignore [arg-type]
+                self.codes[position],  # type: ignore [arg-type]
+                self.parent_codes[position],
+                self.levels[position],
+            )
+        return item
+
+    def items(self) -> list[CodeListItem]:
+        """Return all items, in the order received from Klass."""
+        return [self.item(position) for position in range(len(self))]
+
+    def get(self, code: str) -> CodeListItem | None:
+        """Return the item with the given code, if any."""
+        position = self._positions.get(code)
+        return None if position is None else self.item(position)
+
+    def children(self, code: str) -> list[CodeListItem]:
+        """Return the items which have the given code as parent."""
+        return [self.item(position) for position in self._children.get(code, [])]
+
+    def parent(self, code: str) -> CodeListItem | None:
+        """Return the parent of the item with the given code, if any."""
+        position = self._positions.get(code)
+        if position is None or self.parent_codes[position] is None:
+            return None
+        return self.get(self.parent_codes[position])  # type: ignore [arg-type]
+
+    def search_prefix(self, prefix: str) -> list[CodeListItem]:
+        """Return the items with codes starting with the prefix, sorted by code."""
+        start = bisect.bisect_left(self._sorted_codes, prefix)
+        items = []
+        for code in self._sorted_codes[start:]:
+            if not code.startswith(prefix):
+                break
+            items.append(self.item(self._positions[code]))
+        return items
+
+
 class CodeList(GetExternalSource):
     """Class for retrieving classifications from Klass.
 
     This class fetches a classification given a classification ID
-    and supports multiple languages.
+    and supports multiple languages. The codes are fetched from a
+    CodeListSource, which is the Klass API unless another source is given.
 
     Attributes:
         supported_languages: A list of supported language codes.
         _classifications: A list to store classification items.
+        _index: A columnar index of the classification items.
         classification_id: The ID of the classification to retrieve.
         classifications_dataframes: A dictionary to store dataframes of
             classifications.
@@ -80,24 +323,32 @@ class CodeList(GetExternalSource):
 
     def __init__(
         self,
-        executor: ThreadPoolExecutor,
+        executor: ThreadPoolExecutor | None,
         classification_id: int | None,
         level: int | None = None,
+        date: dt.date | None = None,
+        source: CodeListSource | None = None,
     ) -> None:
         """Initialize the CodeList with the given classification ID and executor.
 
         Args:
             executor: An instance of ThreadPoolExecutor to manage the asynchronous
-                execution of data fetching.
+                execution of data fetching, or None to use the shared executor.
             classification_id: The ID of the classification to retrieve.
             level: The specific heirarchical level of codes to retrieve. Defaults to all levels.
+            date: The date the codes should be valid for. Defaults to the current date.
+            source: Where to get the codes from. Defaults to the source set with
+                `set_default_code_list_source`, which is the Klass API unless changed.
         """
         self._classifications: list[CodeListItem] = []
+        self._index: CodeIndex | None = None
         self.classification_id = classification_id
         self.classifications_dataframes: (
             dict[SupportedLanguages, pd.DataFrame] | None
         ) = None
         self.level = level
+        self.date = date
+        self.source = source or get_default_code_list_source()
         super().__init__(executor)
 
     def _fetch_data_from_external_source(
@@ -105,38 +356,35 @@ class CodeList(GetExternalSource):
     ) -> dict[SupportedLanguages, pd.DataFrame] | None:
         """Fetch the classifications from Klass by classification ID.
 
-        This method retrieves classification data for each supported language and
-        stores it in a dictionary where the keys are language codes and the values
-        are pandas DataFrames containing the classification data.
+        This method retrieves classification data for all supported languages
+        concurrently and stores it in a dictionary where the keys are language
+        codes and the values are pandas DataFrames containing the classification
+        data. The data for each language is cached in `code_list_cache`.
 
         Returns:
             A dictionary mapping language codes to pandas DataFrames containing the
             classification data for the given classification ID.
-            If an exception occurs during the fetching process, logs the exception
-            and returns None.
+            Exceptions are raised to GetExternalSource, which retries transient
+            errors and otherwise logs the exception and returns None.
         """
-        classifications_dataframes: dict[SupportedLanguages, pd.DataFrame] = {}
-        for i in [
-            SupportedLanguages.NORSK_BOKMÅL,
-            SupportedLanguages.ENGLISH,
-        ]:
-            try:
-                classifications_dataframes[i] = (
-                    KlassClassification(
-                        str(self.classification_id),
-                        i.lower(),  # type: ignore [arg-type]
-                    )
-                    .get_codes(select_level=self.level)
-                    .data
-                )
-            except Exception:
-                logger.exception(
-                    "Exception while getting classifications from Klass",
-                )
-                return None
-            else:
-                return classifications_dataframes
-        return None
+        futures = {
+            language: _klass_executor().submit(self._fetch_codes, language)
+            for language in SupportedLanguages
+        }
+        return {language: future.result() for language, future in futures.items()}
+
+    def _dedup_key(self) -> Hashable:
+        """Share fetches of the same code list from the same source."""
+        return (self.source, self.classification_id, self.level, self.date)
+
+    def _fetch_codes(self, language: SupportedLanguages) -> pd.DataFrame:
+        """Fetch the codes in one language, sharing the result through the cache."""
+        return code_list_cache.get_or_load(
+            (self.source, self.classification_id, self.level, language, self.date),
+            lambda: self.source.get_codes(
+                self.classification_id, language, self.level, self.date
+            ),
+        )
 
     def _extract_titles(
         self,
@@ -144,10 +392,6 @@ class CodeList(GetExternalSource):
     ) -> list[dict[SupportedLanguages, str]]:
         """Extract titles from the dataframes for each supported language.
 
-        This method processes the provided dataframes and extracts the title from
-        each row for all supported languages, creating a list of dictionaries where
-        each dictionary maps language codes to titles.
-
         Args:
             dataframes: A dictionary mapping language codes to pandas DataFrames
                 containing classification data.
@@ -157,17 +401,7 @@ class CodeList(GetExternalSource):
             If a title is not available in a dataframe, the corresponding dictionary
             value will be None.
         """
-        list_of_titles = []
-        languages = list(dataframes)
-        for i in range(len(dataframes[SupportedLanguages.NORSK_BOKMÅL])):
-            titles = {}
-            for j in languages:
-                if "name" in dataframes[j]:
-                    titles[j] = dataframes[j].loc[:, "name"][i]
-                else:
-                    titles[j] = None
-            list_of_titles.append(titles)
-        return list_of_titles
+        return [item.titles for item in CodeIndex(dataframes).items()]
 
     def _create_code_list_from_dataframe(
         self,
@@ -175,10 +409,6 @@ class CodeList(GetExternalSource):
     ) -> list[CodeListItem]:
         """Create a list of CodeListItem objects from the classification dataframes.
 
-        This method extracts titles from the provided dataframes and pairs them
-        with their corresponding classification codes to create a list of
-        CodeListItem objects.
-
         Args:
             classifications_dataframes: A dictionary mapping language codes to
                 pandas DataFrames containing classification data.
@@ -187,23 +417,7 @@ class CodeList(GetExternalSource):
             A list of CodeListItem objects containing classification titles
             and codes.
         """
-        classification_names = self._extract_titles(classifications_dataframes)
-        classification_codes: list
-        if "code" in classifications_dataframes[SupportedLanguages.NORSK_BOKMÅL]:
-            classification_codes = (
-                classifications_dataframes[SupportedLanguages.NORSK_BOKMÅL]
-                .loc[:, "code"]
-                .to_list()
-            )
-        else:
-            classification_codes = [None] * len(classification_names)
-        classification_items = []
-        for a, b in zip(classification_names, classification_codes, strict=False):
-            classification_items.append(
-                CodeListItem(a, b),
-            )
-
-        return classification_items
+        return CodeIndex(classifications_dataframes).items()
 
     def _get_classification_dataframe_if_loaded(self) -> bool:
         """Check if the classification data from Klass is loaded.
@@ -217,15 +431,13 @@ class CodeList(GetExternalSource):
             True if the data is loaded and classifications are successfully extracted,
             False otherwise.
         """
-        if not self._classifications:
+        if self._index is None:
             self.classifications_dataframes = self.retrieve_external_data()
             if self.classifications_dataframes is not None:
-                self._classifications = self._create_code_list_from_dataframe(
-                    self.classifications_dataframes,
-                )
+                self._index = CodeIndex(self.classifications_dataframes)
                 logger.debug(
                     "Thread finished. found %s classifications",
-                    len(self._classifications),
+                    len(self._index),
                 )
                 return True
             logger.warning(
@@ -241,6 +453,56 @@ class CodeList(GetExternalSource):
             A list of CodeListItem objects.
         """
         self._get_classification_dataframe_if_loaded()
+        if self._index is not None and not self._classifications:
+            self._classifications = self._index.items()
 
         logger.debug("Got %s classifications subjects", len(self._classifications))
         return self._classifications
+
+    def get_item(self, code: str) -> CodeListItem | None:
+        """Get the item with the given code.
+
+        Args:
+            code: The code to look up.
+
+        Returns:
+            The item, or None if the code is not in the code list.
+        """
+        self._get_classification_dataframe_if_loaded()
+        return self._index.get(code) if self._index is not None else None
+
+    def get_children(self, code: str) -> list[CodeListItem]:
+        """Get the items on the level below the given code.
+
+        Args:
+            code: The code of the parent item.
+
+        Returns:
+            The items which have the given code as their parent.
+        """
+        self._get_classification_dataframe_if_loaded()
+        return self._index.children(code) if self._index is not None else []
+
+    def get_parent(self, code: str) -> CodeListItem | None:
+        """Get the item on the level above the given code.
+
+        Args:
+            code: The code of the child item.
+
+        Returns:
+            The parent item, or None for top level items and unknown codes.
+        """
+        self._get_classification_dataframe_if_loaded()
+        return self._index.parent(code) if self._index is not None else None
+
+    def search_prefix(self, prefix: str) -> list[CodeListItem]:
+        """Get the items with codes starting with the given prefix.
+
+        Args:
+            prefix: The start of the codes to find.
+
+        Returns:
+            The matching items, sorted by code.
+        """
+        self._get_classification_dataframe_if_loaded()
+        return self._index.search_prefix(prefix) if self._index is not None else []
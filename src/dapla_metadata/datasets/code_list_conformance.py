@@ -0,0 +1,214 @@
+"""Check that the values in dataset columns conform to their Klass classifications.
+
+Each variable with a `classification_uri` referring to a Klass classification is
+checked by streaming its column from the parquet file, one batch of rows at a
+time, and testing the values for membership in the code list.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import parquet as pq
+from upath import UPath
+
+from dapla_metadata.datasets.code_list import CodeList
+from dapla_metadata.datasets.utility.urn import klass_urn_converter
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Collection
+    from collections.abc import Iterable
+
+    from datadoc_model.all_optional.model import Variable
+    from upath.types import ReadablePathLike
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_BATCH_SIZE = 64 * 1024
+DEFAULT_TOP_N = 10
+
+# The number of distinct invalid values counted per column. When exceeded, the
+# least common values are dropped, so top offenders are approximate for columns
+# with very many distinct invalid values. The count of invalid values is exact.
+MAX_TRACKED_INVALID_VALUES = 10_000
+
+
+@dataclass
+class ColumnConformance:
+    """The result of checking one column against its code list.
+
+    Attributes:
+        short_name: The short name of the variable and column.
+        classification_id: The ID of the Klass classification.
+        num_values: The number of values in the column.
+        num_nulls: The number of missing values, these are not counted as invalid.
+        num_invalid: The number of values which are not codes in the code list.
+        top_invalid: The most common invalid values and their counts.
+        error: Describes why the column could not be checked, if it could not.
+    """
+
+    short_name: str
+    classification_id: int | None
+    num_values: int = 0
+    num_nulls: int = 0
+    num_invalid: int = 0
+    top_invalid: list[tuple[str, int]] = field(default_factory=list)
+    error: str | None = None
+
+    @property
+    def conforms(self) -> bool:
+        """Whether the column was checked and all values are in the code list."""
+        return self.error is None and self.num_invalid == 0
+
+
+def load_codes_from_klass(
+    classification_ids: Iterable[int],
+) -> dict[int, Collection[str]]:
+    """Load the codes of several classifications from Klass concurrently.
+
+    Args:
+        classification_ids: The IDs of the classifications.
+
+    Returns:
+        The codes for each classification. Classifications which could not be
+        loaded are left out.
+    """
+    code_lists = {i: CodeList(None, i) for i in set(classification_ids)}
+    for code_list in code_lists.values():
+        code_list.wait_for_external_result()
+    codes = {
+        i: {item.code for item in code_list.classifications if item.code}
+        for i, code_list in code_lists.items()
+    }
+    return {i: c for i, c in codes.items() if c}
+
+
+def _classification_id(variable: Variable) -> int | None:
+    if not variable.classification_uri:
+        return None
+    identifier = klass_urn_converter.get_id(str(variable.classification_uri))
+    if identifier is None or not klass_urn_converter.is_id(identifier):
+        return None
+    return int(identifier)
+
+
+def _check_column(
+    dataset: UPath,
+    result: ColumnConformance,
+    codes: pa.Array,
+    batch_size: int,
+    top_n: int,
+) -> ColumnConformance:
+    invalid_counts: Counter[str] = Counter()
+    with dataset.open(mode="rb") as f:
+        parquet_file = pq.ParquetFile(f)
+        if result.short_name not in parquet_file.schema_arrow.names:
+            result.error = "The column is not in the dataset"
+            return result
+        for batch in parquet_file.iter_batches(
+            batch_size=batch_size,
+            columns=[result.short_name],
+        ):
+            values = batch.column(0)
+            if not pa.types.is_string(values.type):
+                values = pc.cast(values, pa.string())
+            invalid = pc.filter(
+                values,
+                pc.and_(pc.is_valid(values), pc.invert(pc.is_in(values, codes))),
+            )
+            result.num_values += len(values)
+            result.num_nulls += values.null_count
+            result.num_invalid += len(invalid)
+            if len(invalid):
+                counts = pc.value_counts(invalid)
+                invalid_values: list = counts.field("values").to_pylist()
+                value_counts: list = counts.field("counts").to_pylist()
+                invalid_counts.update(
+                    dict(zip(invalid_values, value_counts, strict=True))
+                )
+                if len(invalid_counts) > MAX_TRACKED_INVALID_VALUES:
+                    invalid_counts = Counter(
+                        dict(
+                            invalid_counts.most_common(MAX_TRACKED_INVALID_VALUES // 2)
+                        )
+                    )
+    result.top_invalid = invalid_counts.most_common(top_n)
+    return result
+
+
+def check_code_list_conformance(
+    dataset: ReadablePathLike,
+    variables: Iterable[Variable],
+    *,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    top_n: int = DEFAULT_TOP_N,
+    load_codes: Callable[
+        [Iterable[int]], dict[int, Collection[str]]
+    ] = load_codes_from_klass,
+) -> list[ColumnConformance]:
+    """Check the values of columns against the Klass classifications of their variables.
+
+    Variables without a Klass `classification_uri` are skipped. The columns are
+    checked in parallel, and each column is streamed in batches so memory use
+    does not grow with the number of rows.
+
+    Args:
+        dataset: Path to a parquet file.
+        variables: The documented variables of the dataset.
+        max_workers: The maximum number of columns checked at the same time.
+        batch_size: The number of rows read at a time for each column.
+        top_n: The number of most common invalid values to report per column.
+        load_codes: Loads the codes for classification IDs. Defaults to loading
+            them from Klass.
+
+    Returns:
+        One result per variable which refers to a Klass classification.
+    """
+    dataset = UPath(dataset)
+    results = [
+        ColumnConformance(v.short_name, _classification_id(v))
+        for v in variables
+        if v.short_name and v.classification_uri
+    ]
+    codes = load_codes(
+        r.classification_id for r in results if r.classification_id is not None
+    )
+    code_arrays = {i: pa.array(sorted(c), pa.string()) for i, c in codes.items()}
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for result in results:
+            if result.classification_id is None:
+                result.error = "The classification URI does not refer to Klass"
+            elif result.classification_id not in code_arrays:
+                result.error = "Could not load the code list"
+            else:
+                futures[result.short_name] = executor.submit(
+                    _check_column,
+                    dataset,
+                    result,
+                    code_arrays[result.classification_id],
+                    batch_size,
+                    top_n,
+                )
+    for result in results:
+        if (future := futures.get(result.short_name)) is None:
+            continue
+        try:
+            future.result()
+        except (pa.ArrowException, OSError) as e:
+            logger.exception(
+                "Could not check code list conformance for %s", result.short_name
+            )
+            result.error = str(e)
+    return results
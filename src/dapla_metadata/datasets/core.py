@@ -2,18 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
 import copy
+import functools
 import json
 import logging
+from collections.abc import Mapping
+from concurrent.futures import Future
+from concurrent.futures import InvalidStateError
 from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import cast
 
 import datadoc_model.all_optional.model as all_optional_model
 import datadoc_model.required.model as required_model
 from datadoc_model.all_optional.model import DataSetStatus
+from pydantic import ValidationError
 from upath import UPath
 
+from dapla_metadata import metrics
 from dapla_metadata._shared import config
 from dapla_metadata.dapla import user_info
 from dapla_metadata.datasets._merge import DatasetConsistencyStatus
@@ -32,14 +42,16 @@ from dapla_metadata.datasets.dataset_parser import DatasetParser
 from dapla_metadata.datasets.dataset_parser import pretty_print_supported_types
 from dapla_metadata.datasets.model_validation import ValidateDatadocMetadata
 from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from dapla_metadata.datasets.tracing import Tracer
+from dapla_metadata.datasets.utility import async_fs
 from dapla_metadata.datasets.utility.constants import (
     DEFAULT_SPATIAL_COVERAGE_DESCRIPTION,
 )
 from dapla_metadata.datasets.utility.constants import NUM_OBLIGATORY_DATASET_FIELDS
 from dapla_metadata.datasets.utility.constants import NUM_OBLIGATORY_VARIABLES_FIELDS
 from dapla_metadata.datasets.utility.urn import convert_uris_to_urns
-from dapla_metadata.datasets.utility.urn import klass_urn_converter
-from dapla_metadata.datasets.utility.urn import vardef_urn_converter
+from dapla_metadata.datasets.utility.urn import klass_combined_urn_converter
+from dapla_metadata.datasets.utility.urn import vardef_combined_urn_converter
 from dapla_metadata.datasets.utility.utils import OptionalDatadocMetadataType
 from dapla_metadata.datasets.utility.utils import PseudonymizationType
 from dapla_metadata.datasets.utility.utils import VariableListType
@@ -55,20 +67,67 @@ from dapla_metadata.datasets.utility.utils import (
 from dapla_metadata.datasets.utility.utils import (
     num_obligatory_variables_fields_completed,
 )
-from dapla_metadata.datasets.utility.utils import read_variables_from_metadata_document
+from dapla_metadata.datasets.utility.utils import read_source_document
 from dapla_metadata.datasets.utility.utils import set_dataset_owner
 from dapla_metadata.datasets.utility.utils import set_default_values_dataset
 from dapla_metadata.datasets.utility.utils import set_default_values_pseudonymization
+from dapla_metadata.datasets.utility.utils import set_default_values_pseudonymizations
 from dapla_metadata.datasets.utility.utils import set_default_values_variables
 from dapla_metadata.datasets.utility.utils import set_variables_inherit_from_dataset
+from dapla_metadata.datasets.variable_index import VariableIndex
+from dapla_metadata.datasets.variable_index import VariableSelector
+from dapla_metadata.datasets.variable_table import COLUMN_FIELDS
+from dapla_metadata.datasets.variable_table import VariableChanges
+from dapla_metadata.datasets.variable_table import conform_table
+from dapla_metadata.datasets.variable_table import field_columns
+from dapla_metadata.datasets.variable_table import row_to_fields
+from dapla_metadata.datasets.variable_table import variable_row
+from dapla_metadata.datasets.variable_table import variables_to_arrow
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from datetime import datetime
 
+    import pyarrow as pa
     from upath.types import ReadablePathLike
 
+    from dapla_metadata.dapla.user_info import UserInfo
+
 logger = logging.getLogger(__name__)
 
+DOCUMENT_IO = metrics.counter(
+    "dapla_metadata_document_io_total",
+    "Reads and writes of metadata documents, by operation.",
+)
+DOCUMENT_IO_SECONDS = metrics.histogram(
+    "dapla_metadata_document_io_seconds",
+    "Seconds spent reading and writing metadata documents, by operation.",
+)
+
+DATADOC_IO_MAX_WORKERS = 16
+
+
+@functools.cache
+def datadoc_io_executor() -> ThreadPoolExecutor:
+    """The executor which reads documents, schemas and user info for Datadoc.
+
+    It is separate from the executor of the external sources, so opening a
+    Datadoc is not queued behind slow fetches from Klass or the statistical
+    subject mapping.
+    """
+    return ThreadPoolExecutor(
+        max_workers=DATADOC_IO_MAX_WORKERS,
+        thread_name_prefix="datadoc-io",
+    )
+
+
+async def _cancel_opening(
+    opening: asyncio.Task[None], document_content: Future[str | None]
+) -> None:
+    """Stop opening metadata whose document could not be read, and wait for it."""
+    document_content.cancel()
+    await asyncio.gather(opening, return_exceptions=True)
+
 
 class Datadoc:
     """Handle reading, updating and writing of metadata.
@@ -83,6 +142,7 @@ class Datadoc:
         dataset_path: A file path to the path to where the dataset is stored.
         metadata_document_path: A path to a metadata document if it exists.
         statistic_subject_mapping: An instance of StatisticSubjectMapping.
+        tracer: The time spent in each stage of reading and writing metadata.
     """
 
     def __init__(
@@ -111,6 +171,7 @@ class Datadoc:
                 which validates whether required fields are present when reading
                 in an existing metadata file.
         """
+        self.tracer = Tracer()
         self._statistic_subject_mapping = statistic_subject_mapping
         self.errors_as_warnings = errors_as_warnings
         self.validate_required_fields_on_existing_metadata = (
@@ -130,28 +191,97 @@ class Datadoc:
         self.dataset_path: UPath | None = None
         self.dataset = all_optional_model.Dataset()
         self.variables: VariableListType = []
-        self.variables_lookup: dict[str, VariableType] = {}
+        self._variable_index = VariableIndex()
         self.explicitly_defined_metadata_document = False
         self.dataset_consistency_status: list[DatasetConsistencyStatus] = []
         self.concrete_data_types_lookup: dict[str, str] = {}
+        self._set_paths(dataset_path, metadata_document_path)
+        if metadata_document_path and not UPath(metadata_document_path).exists():
+            raise self._missing_metadata_document_error()
+        if metadata_document_path or dataset_path:
+            self._open()
+
+    @classmethod
+    async def aopen(
+        cls,
+        dataset_path: ReadablePathLike | None = None,
+        metadata_document_path: ReadablePathLike | None = None,
+        statistic_subject_mapping: StatisticSubjectMapping | None = None,
+        errors_as_warnings: bool = False,
+        validate_required_fields_on_existing_metadata: bool = False,
+    ) -> Datadoc:
+        """Create a Datadoc instance without blocking the event loop.
+
+        This is the asynchronous counterpart of the constructor, for use in
+        async web services, and takes the same arguments. The metadata
+        document is read with asynchronous filesystem operations where the
+        filesystem supports them. Reading the dataset schema, fetching the
+        statistical subject mapping and validating the metadata run in a
+        thread.
+
+        Raises:
+            ValueError: If the given metadata document does not exist, or
+                the metadata could not be read.
+        """
+        datadoc = cls(
+            statistic_subject_mapping=statistic_subject_mapping,
+            errors_as_warnings=errors_as_warnings,
+            validate_required_fields_on_existing_metadata=validate_required_fields_on_existing_metadata,
+        )
+        datadoc._set_paths(dataset_path, metadata_document_path)
+        if not datadoc.metadata_document:
+            return datadoc
+        # The thread starts reading the dataset while the document is read here
+        document_content: Future[str | None] = Future()
+        opening = asyncio.create_task(
+            asyncio.to_thread(datadoc._open, document_content)
+        )
+        try:
+            content = await datadoc._aread_metadata_document(datadoc.metadata_document)
+        except BaseException:
+            await _cancel_opening(opening, document_content)
+            raise
+        if content is None and datadoc.explicitly_defined_metadata_document:
+            await _cancel_opening(opening, document_content)
+            raise datadoc._missing_metadata_document_error()
+        # Already cancelled if opening failed before it needed the document
+        with contextlib.suppress(InvalidStateError):
+            document_content.set_result(content)
+        await opening
+        return datadoc
+
+    def _set_paths(
+        self,
+        dataset_path: ReadablePathLike | None,
+        metadata_document_path: ReadablePathLike | None,
+    ) -> None:
         if metadata_document_path:
             self.metadata_document = UPath(metadata_document_path)
             self.explicitly_defined_metadata_document = True
-            if not self.metadata_document.exists():
-                msg = f"Metadata document does not exist! Provided path: {self.metadata_document}"
-                raise ValueError(
-                    msg,
-                )
         if dataset_path:
             self.dataset_path = UPath(dataset_path)
             if not metadata_document_path:
                 self.metadata_document = build_metadata_document_path(
                     self.dataset_path,
                 )
-        if metadata_document_path or dataset_path:
-            self._extract_metadata_from_files()
 
-    def _extract_metadata_from_files(self) -> None:
+    def _missing_metadata_document_error(self) -> ValueError:
+        msg = (
+            f"Metadata document does not exist! Provided path: {self.metadata_document}"
+        )
+        return ValueError(msg)
+
+    def _open(self, document_content: Future[str | None] | None = None) -> None:
+        with self.tracer.span(
+            "open",
+            dataset_path=self.dataset_path,
+            metadata_document=self.metadata_document,
+        ):
+            self._extract_metadata_from_files(document_content)
+
+    def _extract_metadata_from_files(
+        self, document_content: Future[str | None] | None = None
+    ) -> None:
         """Read metadata from an existing metadata document or create one.
 
         If a metadata document exists, it reads and extracts metadata from it.
@@ -168,52 +298,100 @@ class Datadoc:
             values are None.
         - The 'contains_personal_data' attribute is set to False if not specified.
         - A lookup dictionary for variables is created based on their short names.
+
+        The metadata document, the dataset schema, the user info and the
+        statistical subject mapping are read concurrently, and each is waited
+        for where it is needed.
+
+        Args:
+            document_content: The content of the metadata document, if it is
+                being read elsewhere. None when it doesn't exist.
         """
         extracted_metadata: all_optional_model.DatadocMetadata | None = None
         existing_metadata: OptionalDatadocMetadataType = None
 
-        if self.metadata_document and self.metadata_document.exists():
-            existing_metadata = self._extract_metadata_from_existing_document(
-                self.metadata_document,
+        executor = datadoc_io_executor()
+        futures: list[Future] = []
+        document_future: Future[str | None] | None = None
+        if self.metadata_document:
+            document_future = document_content or executor.submit(
+                self._read_metadata_document, self.metadata_document
             )
-
+            futures.append(document_future)
         if self.dataset_path:
-            extracted_metadata = self._extract_metadata_from_dataset(self.dataset_path)
-            self.dataset_consistency_status.extend(
-                self.check_illegal_variable_data_type(
-                    extracted_metadata.variables or [], self.concrete_data_types_lookup
+            schema_future = executor.submit(self._read_schema, self.dataset_path)
+            user_info_future = executor.submit(
+                user_info.get_user_info_for_current_platform
+            )
+            futures.extend([schema_future, user_info_future])
+            # Creating the mapping starts fetching it
+            statistic_subject_mapping = (
+                self._statistic_subject_mapping
+                if self._statistic_subject_mapping is not None
+                else StatisticSubjectMapping(
+                    None,
+                    config.get_statistical_subject_source_url(),
                 )
             )
 
+        try:
+            if self.metadata_document and document_future:
+                content = document_future.result()
+                if content is not None:
+                    existing_metadata = self._extract_metadata_from_existing_document(
+                        self.metadata_document, content
+                    )
+
+            if self.dataset_path:
+                with self.tracer.span("extract_dataset"):
+                    extracted_metadata = self._extract_metadata_from_dataset(
+                        self.dataset_path,
+                        schema_future,
+                        user_info_future,
+                        statistic_subject_mapping,
+                    )
+                self.dataset_consistency_status.extend(
+                    self.check_illegal_variable_data_type(
+                        extracted_metadata.variables or [],
+                        self.concrete_data_types_lookup,
+                    )
+                )
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
         if (
             self.dataset_path
             and self.metadata_document
             and extracted_metadata
             and existing_metadata
         ):
-            if extracted_metadata.dataset and existing_metadata.dataset:
+            with self.tracer.span("consistency_checks"):
+                if extracted_metadata.dataset and existing_metadata.dataset:
+                    self.dataset_consistency_status.extend(
+                        check_dataset_consistency(
+                            UPath(str(extracted_metadata.dataset.file_path)),
+                            UPath(str(existing_metadata.dataset.file_path)),
+                        )
+                    )
                 self.dataset_consistency_status.extend(
-                    check_dataset_consistency(
-                        UPath(str(extracted_metadata.dataset.file_path)),
-                        UPath(str(existing_metadata.dataset.file_path)),
+                    check_variables_consistency(
+                        extracted_metadata.variables or [],
+                        existing_metadata.variables or [],
                     )
                 )
-            self.dataset_consistency_status.extend(
-                check_variables_consistency(
-                    extracted_metadata.variables or [],
-                    existing_metadata.variables or [],
+                report_metadata_consistency(
+                    self.dataset_consistency_status,
+                    errors_as_warnings=self.errors_as_warnings,
                 )
-            )
-            report_metadata_consistency(
-                self.dataset_consistency_status,
-                errors_as_warnings=self.errors_as_warnings,
-            )
             # Merge existing metadata with a new dataset
-            merged_metadata = merge_metadata(
-                extracted_metadata,
-                existing_metadata,
-                explicitly_defined_metadata_document=self.explicitly_defined_metadata_document,
-            )
+            with self.tracer.span("merge"):
+                merged_metadata = merge_metadata(
+                    extracted_metadata,
+                    existing_metadata,
+                    explicitly_defined_metadata_document=self.explicitly_defined_metadata_document,
+                )
             # Ensure the document path corresponds to the dataset path
             self.metadata_document = build_metadata_document_path(
                 self.dataset_path,
@@ -259,35 +437,240 @@ class Datadoc:
         self.dataset = cast("all_optional_model.Dataset", metadata.dataset)
         self.variables = metadata.variables
 
-        set_default_values_variables(self.variables)
-        set_default_values_dataset(cast("all_optional_model.Dataset", self.dataset))
-        set_dataset_owner(self.dataset)
-        convert_uris_to_urns(self.variables, "definition_uri", [vardef_urn_converter])
-        convert_uris_to_urns(
-            self.variables, "classification_uri", [klass_urn_converter]
-        )
+        with self.tracer.span("defaults"):
+            set_default_values_variables(self.variables)
+            set_default_values_dataset(cast("all_optional_model.Dataset", self.dataset))
+            set_dataset_owner(self.dataset)
+        with self.tracer.span("urn_conversion"):
+            convert_uris_to_urns(
+                self.variables, "definition_uri", vardef_combined_urn_converter
+            )
+            convert_uris_to_urns(
+                self.variables, "classification_uri", klass_combined_urn_converter
+            )
         self._create_variables_lookup()
 
     def _create_variables_lookup(self) -> None:
-        self.variables_lookup = {
-            v.short_name: v for v in self.variables if v.short_name
+        self._variable_index = VariableIndex(self.variables)
+
+    @property
+    def variables_lookup(self) -> Mapping[str, VariableType]:
+        """The variables by short name, as a read-only view.
+
+        Replace variables through Datadoc, so the variable index stays
+        consistent.
+        """
+        return MappingProxyType(self._variable_index.by_short_name)
+
+    def find(
+        self,
+        *,
+        data_type: all_optional_model.DataType | str | None = None,
+        variable_role: all_optional_model.VariableRole | str | None = None,
+        definition_uri: str | None = None,
+        classification_uri: str | None = None,
+        pseudonymized: bool | None = None,
+        missing: str | Iterable[str] | None = None,
+    ) -> list[VariableType]:
+        """Find the variables which match all the given criteria.
+
+        Criteria which are None are not used. All but `missing` are looked up
+        in indexes, so the variables don't have to be scanned. Changes made
+        directly to variables are picked up.
+
+        Args:
+            data_type: The data type of the variables.
+            variable_role: The role of the variables.
+            definition_uri: The URN of the variable definition, as stored
+                in the metadata document.
+            classification_uri: The URN of the classification, as stored in
+                the metadata document.
+            pseudonymized: Whether the variables have a pseudonymization.
+            missing: The name of a field, or several, which the variables
+                are missing a value for.
+
+        Returns:
+            The matching variables, in document order.
+
+        Example:
+            >>> metadata.find(data_type="FLOAT", missing="unit_type")  # doctest: +SKIP
+        """
+        criteria = {
+            "data_type": data_type,
+            "variable_role": variable_role,
+            "definition_uri": definition_uri,
+            "classification_uri": classification_uri,
+            "pseudonymized": pseudonymized,
         }
+        return self._variable_index.find(
+            missing=missing,
+            **{field: value for field, value in criteria.items() if value is not None},
+        )
+
+    def variables_to_arrow(self) -> pa.Table:
+        """Flatten the variables into an Arrow table, for editing many at once.
+
+        There is one row per variable, with multilanguage fields split into
+        one column per language and the pseudonymization as a struct. See
+        `variable_table.VARIABLES_SCHEMA` for the columns.
+
+        Returns:
+            The table, in the order of the variables.
+
+        Example:
+            >>> df = metadata.variables_to_arrow().to_pandas()  # doctest: +SKIP
+        """
+        return variables_to_arrow(self.variables)
+
+    def variables_from_arrow(
+        self,
+        table: pa.Table,
+        merge_on: str = "short_name",
+    ) -> VariableChanges:
+        """Apply the changes in a table of variables, like one from `variables_to_arrow`.
+
+        Only the columns in the table are changed, and its rows may be any
+        subset of the variables. The changed variables are validated before
+        any of them is replaced, so nothing is changed if one is invalid.
+
+        Args:
+            table: The variables to change, with the column given by
+                `merge_on` and any other columns of `VARIABLES_SCHEMA`.
+            merge_on: The column rows are matched to variables by, either
+                `short_name` or `id`.
+
+        Returns:
+            The changed fields of each changed variable.
+
+        Raises:
+            ValueError: If a row doesn't match exactly one variable, the
+                table has unknown columns, a short name would be changed, or
+                a changed variable is invalid.
+
+        Example:
+            >>> table = pa.Table.from_pandas(df, preserve_index=False)  # doctest: +SKIP
+            >>> metadata.variables_from_arrow(table)  # doctest: +SKIP
+        """
+        if merge_on not in ("short_name", "id"):
+            msg = f"Can only merge on short_name or id, not {merge_on}"
+            raise ValueError(msg)
+        table = conform_table(table)
+        if merge_on not in table.column_names:
+            msg = f"The table has no {merge_on} column to merge on"
+            raise ValueError(msg)
+
+        short_names = (
+            {short_name: short_name for short_name in self.variables_lookup}
+            if merge_on == "short_name"
+            else {
+                str(v.id): short_name
+                for short_name, v in self.variables_lookup.items()
+                if v.id is not None
+            }
+        )
+        rows = table.to_pylist()
+        keys = [row[merge_on] for row in rows]
+        unmatched = [key for key in keys if key not in short_names]
+        if unmatched:
+            msg = f"No variables with {merge_on} {unmatched}"
+            raise ValueError(msg)
+        if len(set(keys)) != len(keys):
+            msg = f"Several rows have the same {merge_on}"
+            raise ValueError(msg)
+
+        changes = VariableChanges()
+        updates: dict[str, VariableType] = {}
+        for key, row in zip(keys, rows, strict=True):
+            short_name = short_names[key]
+            variable = self.variables_lookup[short_name]
+            existing = variable_row(variable)
+            changed_fields = list(
+                dict.fromkeys(
+                    COLUMN_FIELDS[column]
+                    for column, value in row.items()
+                    if existing[column] != value
+                )
+            )
+            if not changed_fields:
+                changes.unchanged.append(short_name)
+                continue
+            if "short_name" in changed_fields:
+                msg = f"Can't change the short name of {short_name}"
+                raise ValueError(msg)
+            merged = {**existing, **row}
+            fields = row_to_fields(
+                {
+                    column: merged[column]
+                    for field_name in changed_fields
+                    for column in field_columns(field_name)
+                }
+            )
+            updates[short_name] = type(variable).model_validate(
+                {**variable.model_dump(), **fields}
+            )
+            changes.changed[short_name] = changed_fields
+
+        self._update_variables(updates)
+        return changes
+
+    def reindex_variable(self, variable_short_name: str) -> None:
+        """Update the variable index after a variable was changed directly.
+
+        `find` picks up changes made directly to variables by itself, so this
+        is only needed to update the index right away.
+
+        Args:
+            variable_short_name: The short name of the changed variable.
+        """
+        self._variable_index.reindex(variable_short_name)
+
+    def _read_metadata_document(self, document: UPath) -> str | None:
+        """Read the content of the metadata document, or None if it doesn't exist.
+
+        Opening the document directly, rather than first checking whether it
+        exists, saves a round trip when it is stored in a bucket.
+        """
+        try:
+            with (
+                self.tracer.span("read_document", path=document),
+                DOCUMENT_IO_SECONDS.time(operation="read"),
+            ):
+                content = document.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return None
+        DOCUMENT_IO.inc(operation="read")
+        logger.info("Opened existing metadata file %s", document)
+        return content
+
+    async def _aread_metadata_document(self, document: UPath) -> str | None:
+        """Read the content of the metadata document without blocking the event loop."""
+        try:
+            with (
+                self.tracer.span("read_document", path=document),
+                DOCUMENT_IO_SECONDS.time(operation="read"),
+            ):
+                content = await async_fs.read_text(document)
+        except FileNotFoundError:
+            return None
+        DOCUMENT_IO.inc(operation="read")
+        logger.info("Opened existing metadata file %s", document)
+        return content
 
     def _extract_metadata_from_existing_document(
         self,
         document: UPath,
+        content: str,
     ) -> OptionalDatadocMetadataType:
-        """Read metadata from an existing metadata document.
+        """Extract metadata from the content of an existing metadata document.
 
-        If an existing metadata document is available, this method reads and
-        loads the metadata from it. It validates and upgrades the metadata as
-        necessary. If we have read in a file with an empty "datadoc" structure
-        the process ends.
+        It validates and upgrades the metadata as necessary. If we have read
+        in a file with an empty "datadoc" structure the process ends.
         A typical example causing a empty datadoc is a file produced from a
         pseudonymization process.
 
         Args:
             document: A path to the existing metadata document.
+            content: The content of the metadata document.
 
         Raises:
             json.JSONDecodeError: If the metadata document cannot be parsed.
@@ -295,26 +678,26 @@ class Datadoc:
         """
         fresh_metadata = {}
         try:
-            with document.open(mode="r", encoding="utf-8") as file:
-                fresh_metadata = json.load(file)
-            logger.info("Opened existing metadata file %s", document)
-            fresh_metadata = upgrade_metadata(
-                fresh_metadata,
-            )
-            if is_metadata_in_container_structure(fresh_metadata):
-                self.container = (
-                    self.metadata_model.MetadataContainer.model_validate_json(
-                        json.dumps(fresh_metadata),
+            fresh_metadata = json.loads(content)
+            with self.tracer.span("upgrade_metadata"):
+                fresh_metadata = upgrade_metadata(
+                    fresh_metadata,
+                )
+            with self.tracer.span("validate"):
+                if is_metadata_in_container_structure(fresh_metadata):
+                    self.container = (
+                        self.metadata_model.MetadataContainer.model_validate_json(
+                            json.dumps(fresh_metadata),
+                        )
                     )
+                    datadoc_metadata = fresh_metadata["datadoc"]
+                else:
+                    datadoc_metadata = fresh_metadata
+                if datadoc_metadata is None:
+                    return None
+                existing = self.metadata_model.DatadocMetadata.model_validate_json(
+                    json.dumps(datadoc_metadata),
                 )
-                datadoc_metadata = fresh_metadata["datadoc"]
-            else:
-                datadoc_metadata = fresh_metadata
-            if datadoc_metadata is None:
-                return None
-            existing = self.metadata_model.DatadocMetadata.model_validate_json(
-                json.dumps(datadoc_metadata),
-            )
 
             # Always override the stored dataset path to ensure it matches
             if existing.dataset:
@@ -332,9 +715,26 @@ class Datadoc:
         else:
             return existing
 
+    def _read_schema(
+        self, dataset: UPath
+    ) -> tuple[list[all_optional_model.Variable], dict[str, str]]:
+        """Read the variables and their concrete data types from the dataset."""
+        with self.tracer.span("schema_read", path=dataset):
+            parser = DatasetParser.for_file(dataset)
+            variables = parser.get_fields()
+            try:
+                concrete_data_types = parser.get_concrete_data_types()
+            except RuntimeError:
+                logger.exception(
+                    "Failed to get concrete data types for dataset %s", dataset
+                )
+                concrete_data_types = {}
+        return variables, concrete_data_types
+
     def _extract_subject_field_from_path(
         self,
         dapla_dataset_path_info: DaplaDatasetPathInfo,
+        statistic_subject_mapping: StatisticSubjectMapping,
     ) -> str | None:
         """Extract the statistic short name from the dataset file path.
 
@@ -344,26 +744,25 @@ class Datadoc:
         Args:
             dapla_dataset_path_info: The object representing the decomposed file
                 path.
+            statistic_subject_mapping: The mapping to use. It is waited for
+                unless it was supplied on initialization.
 
         Returns:
             The code for the statistical subject or None if we couldn't map to one.
         """
-        if self._statistic_subject_mapping is None:
-            with ThreadPoolExecutor(max_workers=12) as executor:
-                return StatisticSubjectMapping(
-                    executor,
-                    config.get_statistical_subject_source_url(),
-                ).get_secondary_subject(
-                    dapla_dataset_path_info.statistic_short_name,
-                )
-        else:
-            return self._statistic_subject_mapping.get_secondary_subject(
+        with self.tracer.span("subject_mapping"):
+            if statistic_subject_mapping is not self._statistic_subject_mapping:
+                statistic_subject_mapping.wait_for_external_result()
+            return statistic_subject_mapping.get_secondary_subject(
                 dapla_dataset_path_info.statistic_short_name,
             )
 
     def _extract_metadata_from_dataset(
         self,
         dataset: UPath,
+        schema: Future[tuple[list[all_optional_model.Variable], dict[str, str]]],
+        current_user_info: Future[UserInfo],
+        statistic_subject_mapping: StatisticSubjectMapping,
     ) -> all_optional_model.DatadocMetadata:
         """Obtain what metadata we can from the dataset itself.
 
@@ -374,6 +773,10 @@ class Datadoc:
         Args:
             dataset: The path to the dataset file, which can be a local or
                 cloud path.
+            schema: The variables and concrete data types being read from the
+                dataset.
+            current_user_info: The info about the user being looked up.
+            statistic_subject_mapping: The mapping from statistics to subjects.
 
         Side Effects:
             Updates the following instance attributes:
@@ -401,21 +804,14 @@ class Datadoc:
             contains_data_from=dapla_dataset_path_info.contains_data_from,
             contains_data_until=dapla_dataset_path_info.contains_data_until,
             file_path=str(self.dataset_path),
-            metadata_created_by=user_info.get_user_info_for_current_platform().short_email,
+            metadata_created_by=current_user_info.result().short_email,
             subject_field=self._extract_subject_field_from_path(
                 dapla_dataset_path_info,
+                statistic_subject_mapping,
             ),
             spatial_coverage_description=DEFAULT_SPATIAL_COVERAGE_DESCRIPTION,
         )
-        metadata.variables = DatasetParser.for_file(dataset).get_fields()
-        try:
-            self.concrete_data_types_lookup = DatasetParser.for_file(
-                dataset
-            ).get_concrete_data_types()
-        except RuntimeError:
-            logger.exception(
-                "Failed to get concrete data types for dataset %s", dataset
-            )
+        metadata.variables, self.concrete_data_types_lookup = schema.result()
         return metadata
 
     def datadoc_model(
@@ -448,32 +844,74 @@ class Datadoc:
         Raises:
             ValueError: If no metadata document is specified for saving.
         """
+        with self.tracer.span("write", metadata_document=self.metadata_document):
+            document, content = self._serialize_metadata_document()
+            DOCUMENT_IO.inc(operation="write")
+            with (
+                self.tracer.span("write_file", path=document),
+                DOCUMENT_IO_SECONDS.time(operation="write"),
+            ):
+                document.write_text(content)
+            self._log_saved_metadata_document(document, content)
+
+    async def asave(self) -> None:
+        """Write all currently known metadata to file without blocking the event loop.
+
+        This is the asynchronous counterpart of `write_metadata_document`,
+        with the same side effects. Validation runs in a thread and the file
+        is written with asynchronous filesystem operations where the
+        filesystem supports them.
+
+        Raises:
+            ValueError: If no metadata document is specified for saving.
+        """
+        with self.tracer.span("write", metadata_document=self.metadata_document):
+            document, content = await asyncio.to_thread(
+                self._serialize_metadata_document
+            )
+            DOCUMENT_IO.inc(operation="write")
+            with (
+                self.tracer.span("write_file", path=document),
+                DOCUMENT_IO_SECONDS.time(operation="write"),
+            ):
+                await async_fs.write_text(document, content)
+            self._log_saved_metadata_document(document, content)
+
+    def _serialize_metadata_document(self) -> tuple[UPath, str]:
+        """Validate the metadata and serialize it for the metadata document.
+
+        Returns:
+            The path of the metadata document and its new content.
+        """
         timestamp: datetime = get_timestamp_now()
         self.dataset.metadata_last_updated_date = timestamp
         self.dataset.metadata_last_updated_by = (
             user_info.get_user_info_for_current_platform().short_email
         )
         self.dataset.file_path = str(self.dataset_path)
-        datadoc: ValidateDatadocMetadata = ValidateDatadocMetadata(
-            percentage_complete=self.percent_complete,
-            dataset=self.dataset,
-            variables=self.variables,
-        )
+        with self.tracer.span("write_validate"):
+            datadoc: ValidateDatadocMetadata = ValidateDatadocMetadata(
+                percentage_complete=self.percent_complete,
+                dataset=self.dataset,
+                variables=self.variables,
+            )
         if self.container:
             self.container.datadoc = datadoc
         else:
             self.container = all_optional_model.MetadataContainer(datadoc=datadoc)
-        if self.metadata_document:
-            content = self.container.model_dump_json(indent=4)
-            self.metadata_document.write_text(content)
-            logger.info("Saved metadata document %s", self.metadata_document)
-            logger.info(
-                "Metadata content",
-                extra={"metadata_content": json.loads(content)},
-            )
-        else:
+        if not self.metadata_document:
             msg = "No metadata document to save"
             raise ValueError(msg)
+        with self.tracer.span("write_serialize"):
+            return self.metadata_document, self.container.model_dump_json(indent=4)
+
+    @staticmethod
+    def _log_saved_metadata_document(document: UPath, content: str) -> None:
+        logger.info("Saved metadata document %s", document)
+        logger.info(
+            "Metadata content",
+            extra={"metadata_content": json.loads(content)},
+        )
 
     @property
     def percent_complete(self) -> int:
@@ -516,6 +954,128 @@ class Datadoc:
                 msg = "Can't add empty pseudonymization object when validating required fields! Try setting `validate_required_fields_on_existing_metadata` to `False`."
                 raise ValueError(msg)
             variable.pseudonymization = all_optional_model.Pseudonymization()
+        self._variable_index.reindex(variable_short_name)
+
+    def bulk_add_pseudonymization(
+        self,
+        selector: VariableSelector,
+        pseudonymization: PseudonymizationType | None = None,
+    ) -> VariableChanges:
+        """Add a pseudonymization to all the selected variables.
+
+        Each selected variable which has no pseudonymization gets its own copy
+        of the given one, with defaults filled in as in
+        `add_pseudonymization`. The defaults are computed once.
+
+        Args:
+            selector: A glob such as `fnr_*` or a compiled regular expression
+                matching the whole short name, or a predicate which is
+                called with each variable.
+            pseudonymization: The pseudonymization to add. If not supplied,
+                an empty one is added.
+
+        Returns:
+            The variables which were given a pseudonymization. Those which
+            already had one are unchanged.
+
+        Example:
+            >>> metadata.bulk_add_pseudonymization(
+            ...     "fnr_*",
+            ...     Pseudonymization(encryption_algorithm="TINK-DAEAD"),
+            ... )  # doctest: +SKIP
+        """
+        if (
+            pseudonymization is None
+            and self.validate_required_fields_on_existing_metadata
+        ):
+            msg = "Can't add empty pseudonymization object when validating required fields! Try setting `validate_required_fields_on_existing_metadata` to `False`."
+            raise ValueError(msg)
+        selected = self._variable_index.select(selector)
+        pseudonymized = set_default_values_pseudonymizations(
+            [self.variables_lookup[short_name] for short_name in selected],
+            pseudonymization or all_optional_model.Pseudonymization(),
+        )
+        changes = VariableChanges()
+        for variable in pseudonymized:
+            if variable.short_name:
+                self._variable_index.reindex(variable.short_name)
+                changes.changed[variable.short_name] = ["pseudonymization"]
+        changes.unchanged = [s for s in selected if s not in changes.changed]
+        return changes
+
+    def update_variables(
+        self,
+        selector: VariableSelector,
+        **fields: Any,
+    ) -> VariableChanges:
+        """Set fields to the same values on all the selected variables.
+
+        The values are validated once, and all the selected variables are
+        replaced with updated copies in one batch. Nothing is changed if a
+        value is invalid.
+
+        Args:
+            selector: A glob such as `fnr_*` or a compiled regular expression
+                matching the whole short name, or a predicate which is
+                called with each variable.
+            fields: The values of the fields to set.
+
+        Returns:
+            The changed fields of each changed variable.
+
+        Raises:
+            ValueError: If a field is not a field of variables, is the short
+                name, or a value is invalid.
+
+        Example:
+            >>> metadata.update_variables(
+            ...     "fnr_*", is_personal_data=True, unit_type="PERSON"
+            ... )  # doctest: +SKIP
+        """
+        for field_name in fields:
+            if field_name not in all_optional_model.Variable.model_fields:
+                msg = f"'{field_name}' is not a field of variables"
+                raise ValueError(msg)
+        if "short_name" in fields:
+            msg = "Can't change the short name of variables in bulk"
+            raise ValueError(msg)
+
+        # Validate the values once for each model in use, on a throwaway copy
+        validated: dict[type, dict[str, Any]] = {}
+        changes = VariableChanges()
+        updates: dict[str, VariableType] = {}
+        for short_name in self._variable_index.select(selector):
+            variable = self.variables_lookup[short_name]
+            values = validated.get(type(variable))
+            if values is None:
+                template = variable.model_copy()
+                for field_name, value in fields.items():
+                    try:
+                        setattr(template, field_name, value)
+                    except ValidationError as e:
+                        msg = f"Invalid value for {field_name}: {e}"
+                        raise ValueError(msg) from e
+                values = validated[type(variable)] = {
+                    field_name: getattr(template, field_name) for field_name in fields
+                }
+            changed_fields = [
+                field_name
+                for field_name, value in values.items()
+                if getattr(variable, field_name) != value
+            ]
+            if not changed_fields:
+                changes.unchanged.append(short_name)
+                continue
+            updates[short_name] = variable.model_copy(
+                update={
+                    field_name: copy.deepcopy(values[field_name])
+                    for field_name in changed_fields
+                }
+            )
+            changes.changed[short_name] = changed_fields
+
+        self._update_variables(updates)
+        return changes
 
     def remove_pseudonymization(self, variable_short_name: str) -> None:
         """Removes a pseudo variable by using the shortname.
@@ -527,6 +1087,7 @@ class Datadoc:
         """
         if self.variables_lookup[variable_short_name].pseudonymization is not None:
             self.variables_lookup[variable_short_name].pseudonymization = None
+            self._variable_index.reindex(variable_short_name)
 
     def _update_variable(
         self, target_short_name: str, source_variable: VariableType
@@ -537,15 +1098,22 @@ class Datadoc:
             target_short_name: The short name for the variable that one wants to update.
             source_variable: The variable data to update with.
         """
-        for i, variable in enumerate(self.variables):
-            if (
-                hasattr(variable, "short_name")
-                and variable.short_name == target_short_name
-            ):
-                self.variables[i] = source_variable  # type: ignore[assignment]
-                return
-        msg = f"Variable with short_name '{target_short_name}' not found."
-        raise ValueError(msg)
+        self._update_variables({target_short_name: source_variable})
+
+    def _update_variables(self, updates: Mapping[str, VariableType]) -> None:
+        """Replace variables by short_name, through the variable index.
+
+        Args:
+            updates: The new variable for each short name.
+        """
+        for target_short_name in updates:
+            if target_short_name not in self._variable_index:
+                msg = f"Variable with short_name '{target_short_name}' not found."
+                raise ValueError(msg)
+        for target_short_name, variable in updates.items():
+            position = self._variable_index.position(target_short_name)
+            self.variables[position] = variable  # type: ignore[assignment]
+            self._variable_index.replace(target_short_name, variable)
 
     def copy_variable(
         self,
@@ -560,32 +1128,57 @@ class Datadoc:
             target_short_name: The short name for the variable that one wants to copy to.
             source_short_name: The short name for the variable that one wants to copy from. If None, the target short name is used.
         """
-        if target_short_name not in self.variables_lookup:
-            msg = f"Target variable {target_short_name} does not exist in the metadata document you are copying into!"
-            raise ValueError(msg)
-
-        source_short_name = source_short_name or target_short_name
-
-        source_variables = read_variables_from_metadata_document(metadata_document_path)
+        self.copy_variables(
+            metadata_document_path,
+            {target_short_name: source_short_name or target_short_name},
+        )
 
-        source_variables_lookup = {
-            v.short_name: v for v in source_variables if v.short_name is not None
-        }
+    def copy_variables(
+        self,
+        metadata_document_path: ReadablePathLike,
+        mapping: Mapping[str, str] | Iterable[str],
+    ) -> None:
+        """Copies several variables from the given dataset to the current dataset.
 
-        if source_short_name not in source_variables_lookup:
-            msg = f"{source_short_name} does not exist!"
-            raise ValueError(msg)
+        The source metadata document is read once and kept in a cache shared
+        by all Datadoc instances, so copying from the same document again is
+        cheap until the document changes. No variables are copied if any of them does not exist.
 
-        # Clone object and rename to ensure that we have the correct short_name after copy
-        source_variable = copy.deepcopy(source_variables_lookup[source_short_name])
-        source_variable.short_name = target_short_name
+        Args:
+            metadata_document_path: The path to the metadata document one wants to copy from.
+            mapping: The short name of the variable to copy from for each
+                short name to copy to, or short names which are the same in
+                both.
+
+        Example:
+            >>> metadata.copy_variables(
+            ...     "gs://ssb-prod-befolkning-data-produkt/master__DOC.json",
+            ...     {"pers_id": "fnr", "sivilstand": "sivilstand"},
+            ... )  # doctest: +SKIP
+        """
+        if not isinstance(mapping, Mapping):
+            mapping = {short_name: short_name for short_name in mapping}
 
-        # Always override the data type to ensure it matches the physical dataset.
-        source_variable.data_type = self.variables_lookup[  # type: ignore[assignment]
-            target_short_name
-        ].data_type
+        for target_short_name in mapping:
+            if target_short_name not in self.variables_lookup:
+                msg = f"Target variable {target_short_name} does not exist in the metadata document you are copying into!"
+                raise ValueError(msg)
 
-        source_variable = all_optional_model.Variable.model_validate(source_variable)
+        source_document = read_source_document(metadata_document_path)
+        for source_short_name in mapping.values():
+            if source_short_name not in source_document:
+                msg = f"{source_short_name} does not exist!"
+                raise ValueError(msg)
 
-        self.variables_lookup[target_short_name] = source_variable
-        self._update_variable(target_short_name, source_variable)
+        self._update_variables(
+            {
+                target_short_name: source_document.variable(
+                    source_short_name,
+                    # Rename to ensure that we have the correct short_name after copy
+                    short_name=target_short_name,
+                    # Always override the data type to ensure it matches the physical dataset.
+                    data_type=self.variables_lookup[target_short_name].data_type,
+                )
+                for target_short_name, source_short_name in mapping.items()
+            }
+        )
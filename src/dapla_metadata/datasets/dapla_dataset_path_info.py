@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import datetime as dt
+import functools
 import logging
 import re
 from abc import ABC
@@ -11,14 +13,15 @@ from typing import TYPE_CHECKING
 from typing import Final
 from typing import Literal
 
-import arrow
+import numpy as np
+import pyarrow as pa
 from datadoc_model.all_optional.model import DataSetState
 from upath import UPath
 
 from dapla_metadata.datasets.utility.constants import GS_PREFIX
 
 if TYPE_CHECKING:
-    import datetime
+    from collections.abc import Iterable
     from datetime import date
 
     from upath.types import ReadablePathLike
@@ -33,7 +36,6 @@ class DateFormat(ABC):
 
     name: str
     regex_pattern: str
-    arrow_pattern: str
     timeframe: Literal["year", "month", "day", "week"]
 
     @abstractmethod
@@ -57,6 +59,19 @@ class DateFormat(ABC):
         """
 
 
+_MIN_ISO_WEEK_YEAR: Final[int] = 1000
+
+
+def _month_span(year: int, month: int) -> tuple[date, date]:
+    """Return the first and last date of a month.
+
+    Raises if the month following the given one can not be represented, the
+    same way the previous `arrow` based implementation did.
+    """
+    next_month = dt.date(year + month // 12, month % 12 + 1, 1)
+    return dt.date(year, month, 1), next_month - dt.timedelta(days=1)
+
+
 @dataclass
 class IsoDateFormat(DateFormat):
     """A subclass of Dateformat with relevant patterns for ISO dates."""
@@ -71,7 +86,7 @@ class IsoDateFormat(DateFormat):
             >>> ISO_YEAR.get_floor("2021")
             datetime.date(2021, 1, 1)
         """
-        return arrow.get(period_string, self.arrow_pattern).floor(self.timeframe).date()
+        return self._span(period_string)[0]
 
     def get_ceil(self, period_string: str) -> date | None:
         """Return last date of timeframe period defined in ISO date format.
@@ -83,31 +98,54 @@ class IsoDateFormat(DateFormat):
             >>> ISO_YEAR_MONTH.get_ceil("2021-05")
             datetime.date(2021, 5, 31)
         """
-        return arrow.get(period_string, self.arrow_pattern).ceil(self.timeframe).date()
+        return self._span(period_string)[1]
+
+    def _span(self, period_string: str) -> tuple[date, date]:
+        """Return the first and last date of the period.
+
+        Raises:
+            ValueError: If the period is not a valid date.
+            OverflowError: If the period ends at the last representable date.
+        """
+        year = int(period_string[:4])
+        match self.timeframe:
+            case "year":
+                first = dt.date(year, 1, 1)
+                end = dt.date(year + 1, 1, 1)
+            case "month":
+                return _month_span(year, int(period_string[5:7]))
+            case "day":
+                first = dt.date(year, int(period_string[5:7]), int(period_string[8:10]))
+                end = first + dt.timedelta(days=1)
+            case "week":
+                if year < _MIN_ISO_WEEK_YEAR:
+                    # Weeks have historically been parsed with strptime, which
+                    # requires a four-digit year without leading zeros
+                    msg = f"Unsupported year for ISO week: {period_string}"
+                    raise ValueError(msg)
+                first = dt.date.fromisocalendar(year, int(period_string[-2:]), 1)
+                end = first + dt.timedelta(weeks=1)
+        return first, end - dt.timedelta(days=1)
 
 
 ISO_YEAR = IsoDateFormat(
     name="ISO_YEAR",
     regex_pattern=r"^\d{4}$",
-    arrow_pattern="YYYY",
     timeframe="year",
 )
 ISO_YEAR_MONTH = IsoDateFormat(
     name="ISO_YEAR_MONTH",
     regex_pattern=r"^\d{4}\-\d{2}$",
-    arrow_pattern="YYYY-MM",
     timeframe="month",
 )
 ISO_YEAR_MONTH_DAY = IsoDateFormat(
     name="ISO_YEAR_MONTH_DAY",
     regex_pattern=r"^\d{4}\-\d{2}\-\d{2}$",
-    arrow_pattern="YYYY-MM-DD",
     timeframe="day",
 )
 ISO_YEAR_WEEK = IsoDateFormat(
     name="ISO_YEAR_WEEK",
     regex_pattern=r"^\d{4}\-{0,1}W\d{2}$",
-    arrow_pattern="W",
     timeframe="week",
 )
 
@@ -147,13 +185,11 @@ class SsbDateFormat(DateFormat):
             datetime.date(2003, 7, 1)
         """
         try:
-            year = period_string[:4]
             month = self.ssb_dates[period_string[-2:]]["start"]
-            period = year + month
-            return arrow.get(period, self.arrow_pattern).floor(self.timeframe).date()
         except KeyError:
             logger.exception("Error while converting to SSB date format")
             return None
+        return _month_span(int(period_string[:4]), int(month))[0]
 
     def get_ceil(self, period_string: str) -> date | None:
         """Return last date of the timeframe period defined in SSB date format.
@@ -179,18 +215,15 @@ class SsbDateFormat(DateFormat):
             datetime.date(2024, 6, 30)
         """
         try:
-            year = period_string[:4]
             month = self.ssb_dates[period_string[-2:]]["end"]
-            period = year + month
-            return arrow.get(period, self.arrow_pattern).ceil(self.timeframe).date()
         except KeyError:
             return None
+        return _month_span(int(period_string[:4]), int(month))[1]
 
 
 SSB_BIMESTER = SsbDateFormat(
     name="SSB_BIMESTER",
     regex_pattern=r"^\d{4}-?[B]\d{1}$",
-    arrow_pattern="YYYYMM",
     timeframe="month",
     ssb_dates={
         "B1": {
@@ -223,7 +256,6 @@ SSB_BIMESTER = SsbDateFormat(
 SSB_QUARTERLY = SsbDateFormat(
     name="SSB_QUARTERLY",
     regex_pattern=r"^\d{4}-?[Q]\d{1}$",
-    arrow_pattern="YYYYMM",
     timeframe="month",
     ssb_dates={
         "Q1": {
@@ -248,7 +280,6 @@ SSB_QUARTERLY = SsbDateFormat(
 SSB_TRIANNUAL = SsbDateFormat(
     name="SSB_TRIANNUAL",
     regex_pattern=r"^\d{4}-?[T]\d{1}$",
-    arrow_pattern="YYYYMM",
     timeframe="month",
     ssb_dates={
         "T1": {
@@ -268,7 +299,6 @@ SSB_TRIANNUAL = SsbDateFormat(
 SSB_HALF_YEAR = SsbDateFormat(
     name="SSB_HALF_YEAR",
     regex_pattern=r"^\d{4}-?[H]\d{1}$",
-    arrow_pattern="YYYYMM",
     timeframe="month",
     ssb_dates={
         "H1": {
@@ -294,6 +324,29 @@ SUPPORTED_DATE_FORMATS: list[IsoDateFormat | SsbDateFormat] = [
 ]
 
 
+_DATE_FORMATS_BY_NAME = {f.name: f for f in SUPPORTED_DATE_FORMATS}
+
+
+def _unanchored(regex: str) -> str:
+    return regex.removeprefix("^").removesuffix("$")
+
+
+# One combined pattern for all supported date formats, with a named group per
+# format. The formats are tried in the order of SUPPORTED_DATE_FORMATS.
+_PERIOD_PATTERN = re.compile(
+    "|".join(
+        f"(?P<{f.name}>{_unanchored(f.regex_pattern)})" for f in SUPPORTED_DATE_FORMATS
+    )
+)
+
+# Matches a section of a dataset name which contains a period, e.g. 'p2022-01'
+_PERIOD_SECTION_PATTERN = re.compile(
+    "p(?:"
+    + "|".join(_unanchored(f.regex_pattern) for f in SUPPORTED_DATE_FORMATS)
+    + ")"
+)
+
+
 def categorize_period_string(period: str) -> IsoDateFormat | SsbDateFormat:
     """Categorize a period string into one of the supported date formats.
 
@@ -322,9 +375,8 @@ def categorize_period_string(period: str) -> IsoDateFormat | SsbDateFormat:
         ...
         NotImplementedError: Period format unknown format is not supported
     """
-    for date_format in SUPPORTED_DATE_FORMATS:
-        if re.match(date_format.regex_pattern, period):
-            return date_format
+    if (match := _PERIOD_PATTERN.fullmatch(period)) and match.lastgroup:
+        return _DATE_FORMATS_BY_NAME[match.lastgroup]
 
     msg = f"Period format {period} is not supported"
     raise NotImplementedError(
@@ -332,6 +384,75 @@ def categorize_period_string(period: str) -> IsoDateFormat | SsbDateFormat:
     )
 
 
+@functools.lru_cache(maxsize=4096)
+def _period_floor(period: str) -> date | None:
+    """Cached first date of the period."""
+    return categorize_period_string(period).get_floor(period)
+
+
+@functools.lru_cache(maxsize=4096)
+def _period_ceil(period: str) -> date | None:
+    """Cached last date of the period."""
+    return categorize_period_string(period).get_ceil(period)
+
+
+def periods_to_datetime64(
+    periods: Iterable[str | None] | np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Convert many period strings to their first and last dates.
+
+    Each distinct period is only converted once, which makes this suitable for
+    large arrays with few distinct periods.
+
+    Args:
+        periods: Period strings in any of the supported date formats.
+
+    Returns:
+        Two arrays with dtype `datetime64[D]`, holding the first and the last
+        date of each period. Missing, unsupported or invalid periods give `NaT`.
+
+    Examples:
+        >>> floors, ceils = periods_to_datetime64(['2021', '2022-W01', '2024H1', None])
+        >>> floors.tolist()
+        [datetime.date(2021, 1, 1), datetime.date(2022, 1, 3), datetime.date(2024, 1, 1), None]
+        >>> ceils.tolist()
+        [datetime.date(2021, 12, 31), datetime.date(2022, 1, 9), datetime.date(2024, 6, 30), None]
+    """
+    codes: dict[str | None, int] = {}
+    inverse = np.fromiter(
+        (codes.setdefault(period, len(codes)) for period in periods),
+        dtype=np.intp,
+    )
+    bounds = [_safe_period_bounds(period) for period in codes]
+    floors = np.array([floor for floor, _ in bounds], dtype="datetime64[D]")
+    ceils = np.array([ceil for _, ceil in bounds], dtype="datetime64[D]")
+    return floors[inverse], ceils[inverse]
+
+
+def _safe_period_bounds(period: str | None) -> tuple[date | None, date | None]:
+    if not isinstance(period, str):
+        return None, None
+    try:
+        return _period_floor(period), _period_ceil(period)
+    except (NotImplementedError, ValueError, OverflowError):
+        return None, None
+
+
+PARSE_MANY_SCHEMA = pa.schema(
+    [
+        ("dataset_path", pa.string()),
+        ("bucket_name", pa.string()),
+        ("statistic_short_name", pa.string()),
+        ("dataset_state", pa.string()),
+        ("dataset_short_name", pa.string()),
+        ("dataset_version", pa.string()),
+        ("period_strings", pa.list_(pa.string())),
+        ("contains_data_from", pa.date32()),
+        ("contains_data_until", pa.date32()),
+    ]
+)
+
+
 class DaplaDatasetPathInfo:
     """Extract info from a path following SSB's dataset naming convention."""
 
@@ -345,6 +466,131 @@ class DaplaDatasetPathInfo:
         # Since UPath as a trailing slash after the bucket name we remove that so that we are able to find the bucket name in the path parts later
         self.dataset_path_parts = [p.strip("/") for p in self.dataset_path.parent.parts]
 
+    @staticmethod
+    def cached(dataset_path: ReadablePathLike) -> DaplaDatasetPathInfo:
+        """Return a shared, cached instance for the given path.
+
+        Parsing the same path repeatedly, for example when checking consistency
+        between datasets, only does the work once.
+
+        Args:
+            dataset_path: The path to the dataset.
+
+        Returns:
+            An instance which must be treated as read-only.
+
+        Examples:
+            >>> info = DaplaDatasetPathInfo.cached('klargjorte_data/person_data_v1.parquet')
+            >>> info is DaplaDatasetPathInfo.cached('klargjorte_data/person_data_v1.parquet')
+            True
+        """
+        return _cached_path_info(str(dataset_path))
+
+    @classmethod
+    def parse_many(
+        cls,
+        dataset_paths: Iterable[ReadablePathLike | None] | pa.Array | pa.ChunkedArray,
+    ) -> pa.Table:
+        """Parse many dataset paths into a columnar table.
+
+        Fields which depend on the directory are computed once per directory and
+        fields which depend on the file name are computed once per file name, so
+        large listings of a bucket are cheap to parse.
+
+        Args:
+            dataset_paths: Path strings, or a pyarrow array of path strings.
+
+        Returns:
+            A table with one row per path and the columns of `PARSE_MANY_SCHEMA`.
+            Null paths give null values. If the period in a file name is not a
+            valid date, the fields derived from the file name are null.
+
+        Examples:
+            >>> table = DaplaDatasetPathInfo.parse_many(
+            ...     ['gs://bucket/befolkning/inndata/person_data_p2021_v2.parquet']
+            ... )
+            >>> table.column('statistic_short_name').to_pylist()
+            ['befolkning']
+            >>> table.column('contains_data_until').to_pylist()
+            [datetime.date(2021, 12, 31)]
+        """
+        if isinstance(dataset_paths, pa.Array | pa.ChunkedArray):
+            dataset_paths = dataset_paths.to_pylist()
+
+        directory_fields: dict[str, tuple] = {}
+        name_fields: dict[str, tuple] = {}
+        rows: list[tuple] = []
+        for dataset_path in dataset_paths:
+            if dataset_path is None:
+                rows.append((None,) * len(PARSE_MANY_SCHEMA))
+                continue
+            dataset_string = str(dataset_path)
+            parent, _, name = dataset_string.rstrip("/").rpartition("/")
+            if (directory := directory_fields.get(parent)) is None:
+                try:
+                    info = cls(dataset_string)
+                except ValueError:
+                    logger.warning("Could not parse %s", dataset_string, exc_info=True)
+                    rows.append(
+                        (dataset_string,) + (None,) * (len(PARSE_MANY_SCHEMA) - 1)
+                    )
+                    continue
+                directory = info._directory_fields()
+                if info._directory_fields_depend_on_name(name):
+                    rows.append((dataset_string, *directory, *info._name_fields()))
+                    continue
+                directory_fields[parent] = directory
+            if (file_name := name_fields.get(name)) is None:
+                file_name = name_fields[name] = cls(name)._name_fields()  # noqa: SLF001
+            rows.append((dataset_string, *directory, *file_name))
+
+        return pa.Table.from_pylist(
+            [dict(zip(PARSE_MANY_SCHEMA.names, row, strict=True)) for row in rows],
+            schema=PARSE_MANY_SCHEMA,
+        )
+
+    def _directory_fields(self) -> tuple[str | None, str | None, str | None]:
+        """The fields for `parse_many` which are derived from the directory."""
+        return (
+            self.bucket_name,
+            self.statistic_short_name,
+            self.dataset_state.value if self.dataset_state else None,
+        )
+
+    def _directory_fields_depend_on_name(self, name: str) -> bool:
+        """Whether the directory fields can not be reused for other file names.
+
+        This is the case when the file name is read as the bucket name or as
+        the dataset state, or when the path consists of only a bucket.
+        """
+        return bool(
+            (self.bucket_name and self.bucket_name not in self.dataset_path_parts)
+            or (
+                self.dataset_state
+                and name
+                in self._extract_norwegian_dataset_state_path_part(self.dataset_state)
+            )
+            or self.dataset_path.stem != UPath(name).stem
+        )
+
+    def _name_fields(
+        self,
+    ) -> tuple[str | None, str | None, list[str] | None, date | None, date | None]:
+        """The fields for `parse_many` which are derived from the file name."""
+        try:
+            return (
+                self.dataset_short_name,
+                self.dataset_version,
+                self.period_strings,
+                self.contains_data_from,
+                self.contains_data_until,
+            )
+        except (ValueError, OverflowError):
+            logger.warning(
+                "Could not parse the period in %s", self.dataset_string, exc_info=True
+            )
+            return (None, None, None, None, None)
+
     @staticmethod
     def _get_period_string_indices(dataset_name_sections: list[str]) -> list[int]:
         """Get all the indices at which period strings are found in list.
@@ -370,31 +616,10 @@ class DaplaDatasetPathInfo:
             >>> DaplaDatasetPathInfo._get_period_string_indices(['varehandel','v1'])
             []
         """
-
-        def insert_p(regex: str) -> str:
-            r"""Insert a 'p' as the second character.
-
-            Args:
-                regex: A string representing the regular expression pattern to be
-                    modified.
-
-            Returns:
-                The modified regular expression pattern with 'p' inserted as the
-                second character.
-
-            Examples:
-                >>> insert_p(r"^\d{4}[H]\d{1}$")
-                '^p\d{4}[H]\d{1}$'
-            """
-            return regex[:1] + "p" + regex[1:]
-
         return [
             i
             for i, x in enumerate(dataset_name_sections)
-            if any(
-                re.match(insert_p(date_format.regex_pattern), x)
-                for date_format in SUPPORTED_DATE_FORMATS
-            )
+            if _PERIOD_SECTION_PATTERN.fullmatch(x)
         ]
 
     @staticmethod
@@ -475,7 +700,7 @@ class DaplaDatasetPathInfo:
             return {state_name.replace(" ", "-"), state_name.replace(" ", "_")}
         return set()
 
-    @property
+    @functools.cached_property
     def bucket_name(
         self,
     ) -> str | None:
@@ -517,7 +742,7 @@ class DaplaDatasetPathInfo:
             bucket_and_rest,
         ).parts[0]
 
-    @property
+    @functools.cached_property
     def dataset_short_name(
         self,
     ) -> str | None:
@@ -565,8 +790,8 @@ class DaplaDatasetPathInfo:
 
         return "_".join(short_name_sections)
 
-    @property
-    def contains_data_from(self) -> datetime.date | None:
+    @functools.cached_property
+    def contains_data_from(self) -> dt.date | None:
         """The earliest date from which data in the dataset is relevant for.
 
         Returns:
@@ -577,11 +802,10 @@ class DaplaDatasetPathInfo:
             len(self.period_strings) > 1 and period_string > self.period_strings[1]
         ):
             return None
-        date_format = categorize_period_string(period_string)
-        return date_format.get_floor(period_string)
+        return _period_floor(period_string)
 
-    @property
-    def contains_data_until(self) -> datetime.date | None:
+    @functools.cached_property
+    def contains_data_until(self) -> dt.date | None:
         """The latest date until which data in the dataset is relevant for.
 
         Returns:
@@ -596,10 +820,9 @@ class DaplaDatasetPathInfo:
             and second_period_string < first_period_string
         ):
             return None
-        date_format = categorize_period_string(period_string)
-        return date_format.get_ceil(period_string)
+        return _period_ceil(period_string)
 
-    @property
+    @functools.cached_property
     def dataset_state(
         self,
     ) -> DataSetState | None:
@@ -637,7 +860,7 @@ class DaplaDatasetPathInfo:
                 return state
         return None
 
-    @property
+    @functools.cached_property
     def dataset_version(
         self,
     ) -> str | None:
@@ -699,7 +922,7 @@ class DaplaDatasetPathInfo:
             else left_parts
         )
 
-    @property
+    @functools.cached_property
     def statistic_short_name(
         self,
     ) -> str | None:
@@ -801,3 +1024,8 @@ class DaplaDatasetPathInfo:
             and self.contains_data_until
             and self.dataset_version,
         )
+
+
+@functools.lru_cache(maxsize=65536)
+def _cached_path_info(dataset_string: str) -> DaplaDatasetPathInfo:
+    return DaplaDatasetPathInfo(dataset_string)
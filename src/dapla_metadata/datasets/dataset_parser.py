@@ -19,6 +19,7 @@ from datadoc_model.all_optional.model import Variable
 from pyarrow import parquet as pq
 from upath import UPath
 
+from dapla_metadata import metrics
 from dapla_metadata.datasets.utility.enums import SupportedLanguages
 
 if TYPE_CHECKING:
@@ -119,6 +120,15 @@ def pretty_print_supported_types() -> str:
     return "\n".join(f"{t[1].value}: {t[0]}" for t in TYPE_CORRESPONDENCE)
 
 
+DATASET_READS = metrics.counter(
+    "dapla_metadata_dataset_reads_total", "Reads of dataset files, by format."
+)
+DATASET_READ_SECONDS = metrics.histogram(
+    "dapla_metadata_dataset_read_seconds",
+    "Seconds spent reading dataset files, by format.",
+)
+
+
 class DatasetParser(ABC):
     """Abstract Base Class for all Dataset parsers.
 
@@ -202,6 +212,7 @@ class DatasetParserParquet(DatasetParser):
             dataset: Path to the dataset to parse.
         """
         super().__init__(dataset)
+        self._concrete_data_types: dict[str, str] | None = None
 
     def get_fields(self) -> list[Variable]:
         """Extract the fields from this dataset."""
@@ -214,14 +225,23 @@ class DatasetParserParquet(DatasetParser):
         ]
 
     def get_concrete_data_types(self) -> dict[str, str]:
-        """Extract the variable names and concrete data types for this dataset."""
-        with self.dataset.open(mode="rb") as f:
-            schema: pa.Schema = pq.read_schema(f)
-        return {
-            data_field.name.strip(): str(data_field.type)
-            for data_field in schema
-            if data_field.name not in self._EXCLUDED_VARIABLE_NAMES
-        }
+        """Extract the variable names and concrete data types for this dataset.
+
+        The schema is only read once per parser.
+        """
+        if self._concrete_data_types is None:
+            DATASET_READS.inc(format="parquet")
+            with (
+                DATASET_READ_SECONDS.time(format="parquet"),
+                self.dataset.open(mode="rb") as f,
+            ):
+                schema: pa.Schema = pq.read_schema(f)
+            self._concrete_data_types = {
+                data_field.name.strip(): str(data_field.type)
+                for data_field in schema
+                if data_field.name not in self._EXCLUDED_VARIABLE_NAMES
+            }
+        return dict(self._concrete_data_types)
 
 
 class DatasetParserSas7Bdat(DatasetParser):
@@ -238,7 +258,11 @@ class DatasetParserSas7Bdat(DatasetParser):
     def get_fields(self) -> list[Variable]:
         """Extract the fields from this dataset."""
         fields = []
-        with self.dataset.open(mode="rb") as f:
+        DATASET_READS.inc(format="sas7bdat")
+        with (
+            DATASET_READ_SECONDS.time(format="sas7bdat"),
+            self.dataset.open(mode="rb") as f,
+        ):
             # Use an iterator to avoid reading in the entire dataset
             sas_reader = pd.read_sas(f, format="sas7bdat", iterator=True)
 
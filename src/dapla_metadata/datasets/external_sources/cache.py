@@ -0,0 +1,132 @@
+"""A thread safe cache for data fetched from external sources."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+from dapla_metadata.datasets.external_sources.external_sources import (
+    record_cache_lookup,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class TtlLruCache[K: Hashable, V]:
+    """A process-wide cache with time to live and least recently used eviction.
+
+    Concurrent requests for a key which is not cached share one call to the
+    loader, the other callers wait for its result. Exceptions raised by the
+    loader are passed on to all waiting callers and are not cached.
+
+    Examples:
+        >>> cache = TtlLruCache(maxsize=2, ttl=60)
+        >>> cache.get_or_load("a", lambda: 1)
+        1
+        >>> cache.get_or_load("a", lambda: 2)
+        1
+        >>> "a" in cache
+        True
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+        name: str | None = None,
+    ) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            maxsize: The maximum number of entries to keep.
+            ttl: Seconds an entry is kept after it was loaded.
+            clock: Returns the current time in seconds.
+            name: If given, hits and misses are counted in the external source
+                statistics under this name.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self.name = name
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self._in_flight: dict[K, Future[V]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """The number of entries, including expired entries not yet evicted."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Whether an entry for the key is cached and has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)  # type: ignore [arg-type]
+            return entry is not None and entry[0] > self._clock()
+
+    def get_or_load(self, key: K, loader: Callable[[], V]) -> V:
+        """Return the cached value for the key, loading it if necessary.
+
+        Args:
+            key: The key of the value.
+            loader: Called to get the value when it is not cached.
+
+        Returns:
+            The cached or loaded value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > self._clock():
+                    self._entries.move_to_end(key)
+                    self._record_lookup(hit=True)
+                    return value
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            is_loader = future is None
+            if future is None:
+                future = self._in_flight[key] = Future()
+        self._record_lookup(hit=not is_loader)
+
+        if not is_loader:
+            logger.debug("Waiting for in-flight load of %s", key)
+            return future.result()
+
+        try:
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def _record_lookup(self, *, hit: bool) -> None:
+        if self.name is not None:
+            record_cache_lookup(self.name, hit=hit)
+
+    def invalidate(self, key: K) -> None:
+        """Remove the entry for the key, if any."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
@@ -1,13 +1,172 @@
+import functools
 import logging
+import threading
+import time
 from abc import ABC
 from abc import abstractmethod
+from collections.abc import Hashable
+from concurrent.futures import CancelledError
+from concurrent.futures import Future
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import replace
+from typing import ClassVar
 from typing import TypeVar
 
+import requests
+
+from dapla_metadata import metrics
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+SHARED_EXECUTOR_MAX_WORKERS = 16
+
+# Errors which are likely to go away if the fetch is retried.
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+)
+
+
+@functools.cache
+def shared_executor() -> ThreadPoolExecutor:
+    """The executor used by external sources when none is given.
+
+    It is created the first time it is needed, and shared by all external
+    sources in the process so the number of threads stays bounded.
+    """
+    return ThreadPoolExecutor(
+        max_workers=SHARED_EXECUTOR_MAX_WORKERS,
+        thread_name_prefix="external-source",
+    )
+
+
+@dataclass(frozen=True)
+class FetchPolicy:
+    """How an external source is fetched.
+
+    Attributes:
+        timeout: Seconds to wait for the result before giving up, None to wait
+            indefinitely. Retries are not started after the timeout.
+        retries: The number of times a failed fetch is retried.
+        backoff: Seconds to wait before the first retry. The wait is doubled for
+            each retry.
+        max_backoff: The longest wait between two retries.
+        retry_on: The exceptions which cause a retry. Other exceptions fail the
+            fetch immediately.
+    """
+
+    timeout: float | None = 30
+    retries: int = 2
+    backoff: float = 0.2
+    max_backoff: float = 5
+    retry_on: tuple[type[BaseException], ...] = TRANSIENT_ERRORS
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retrying after the given failed attempt.
+
+        Examples:
+            >>> [FetchPolicy(backoff=1, max_backoff=5).delay(a) for a in range(4)]
+            [1, 2, 4, 5]
+        """
+        return min(self.backoff * 2**attempt, self.max_backoff)
+
+
+@dataclass
+class ExternalSourceStats:
+    """Counters and timing for one kind of external source.
+
+    Attributes:
+        fetches: Fetches started.
+        hits: Requests served without a new fetch, by sharing an identical
+            fetch in flight or a cached result.
+        misses: Requests which needed a new fetch.
+        retries: Attempts retried after a failure.
+        failures: Fetches which failed after all retries.
+        timeouts: Waits for a result which timed out.
+        cancellations: Fetches cancelled before finishing.
+        total_seconds: Total time spent fetching.
+        max_seconds: The time spent on the slowest fetch.
+    """
+
+    fetches: int = 0
+    hits: int = 0
+    misses: int = 0
+    retries: int = 0
+    failures: int = 0
+    timeouts: int = 0
+    cancellations: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    @property
+    def mean_seconds(self) -> float:
+        """The mean time spent on a fetch."""
+        return self.total_seconds / self.fetches if self.fetches else 0.0
+
+
+_stats: dict[str, ExternalSourceStats] = {}
+_stats_lock = threading.Lock()
+
+EXTERNAL_SOURCE_EVENTS = metrics.counter(
+    "dapla_metadata_external_source_events_total",
+    "Fetches, hits, misses, retries, failures, timeouts and cancellations of external sources.",
+)
+EXTERNAL_SOURCE_FETCH_SECONDS = metrics.histogram(
+    "dapla_metadata_external_source_fetch_seconds",
+    "Seconds spent fetching external sources, including retries.",
+)
+
+
+def _update_stats(source_name: str, **increments: float) -> None:
+    with _stats_lock:
+        stats = _stats.setdefault(source_name, ExternalSourceStats())
+        for name, increment in increments.items():
+            setattr(stats, name, getattr(stats, name) + increment)
+        if "total_seconds" in increments:
+            stats.max_seconds = max(stats.max_seconds, increments["total_seconds"])
+    for name, increment in increments.items():
+        if name == "total_seconds":
+            EXTERNAL_SOURCE_FETCH_SECONDS.observe(increment, source=source_name)
+        else:
+            EXTERNAL_SOURCE_EVENTS.inc(increment, source=source_name, event=name)
+
+
+def record_cache_lookup(source_name: str, *, hit: bool) -> None:
+    """Count a lookup in a cache belonging to an external source."""
+    if hit:
+        _update_stats(source_name, hits=1)
+    else:
+        _update_stats(source_name, misses=1)
+
+
+def get_external_source_stats() -> dict[str, ExternalSourceStats]:
+    """Get a copy of the counters for each kind of external source."""
+    with _stats_lock:
+        return {name: replace(stats) for name, stats in _stats.items()}
+
+
+def reset_external_source_stats() -> None:
+    """Set all counters for external sources to zero."""
+    with _stats_lock:
+        _stats.clear()
+
+
+@dataclass
+class _InFlightFetch:
+    future: Future
+    cancelled: threading.Event = field(default_factory=threading.Event)
+    subscribers: int = 1
+
+
+_in_flight: dict[tuple[str, Hashable], _InFlightFetch] = {}
+_in_flight_lock = threading.Lock()
+
 
 class GetExternalSource[T](ABC):
     """Abstract base class for retrieving data from external sources asynchronously.
@@ -16,9 +175,17 @@ class GetExternalSource[T](ABC):
     operation, check its status, and retrieve the result once the operation
     completes. Subclasses must implement the `_fetch_data_from_external_source`
     method to define how data is fetched from the specific external source.
+
+    Failed fetches are retried according to the `fetch_policy` of the class.
+    Subclasses which return a key from `_dedup_key` share one fetch between all
+    instances created with the same key while that fetch is in flight. The
+    counters and timing of each class are available from
+    `get_external_source_stats`.
     """
 
-    def __init__(self, executor: ThreadPoolExecutor) -> None:
+    fetch_policy: ClassVar[FetchPolicy] = FetchPolicy()
+
+    def __init__(self, executor: ThreadPoolExecutor | None = None) -> None:
         """Initialize the GetExternalSource with an executor to manage asynchronous tasks.
 
         This constructor initializes a future object that will hold the result of the
@@ -26,21 +193,161 @@ class GetExternalSource[T](ABC):
 
         Args:
             executor: An instance of ThreadPoolExecutor to manage the asynchronous
-                execution of data fetching.
+                execution of data fetching. Defaults to the shared executor.
         """
-        self.future = executor.submit(
-            self._fetch_data_from_external_source,
-        )
+        self._executor = executor or shared_executor()
+        self._cancelled = False
+        key = self._dedup_key()
+        if key is None:
+            self._in_flight_key = None
+            self._fetch = _InFlightFetch(Future())
+            self.future = self._submit(self._fetch)
+            return
+
+        self._in_flight_key = (self.source_name(), key)
+        with _in_flight_lock:
+            fetch = _in_flight.get(self._in_flight_key)
+            if fetch is not None and not fetch.cancelled.is_set():
+                fetch.subscribers += 1
+                self._fetch = fetch
+                self.future = fetch.future
+                _update_stats(self.source_name(), hits=1)
+                logger.debug("Sharing in-flight fetch of %s", self._in_flight_key)
+                return
+            self._fetch = _in_flight[self._in_flight_key] = _InFlightFetch(Future())
+        self.future = self._submit(self._fetch)
+
+    @classmethod
+    def source_name(cls) -> str:
+        """The name the counters of this kind of source are published under."""
+        return cls.__name__
+
+    def _dedup_key(self) -> Hashable | None:
+        """Identify fetches which give the same result.
+
+        Returns:
+            A key shared by instances which fetch the same data, or None to never
+            share fetches.
+        """
+        return None
+
+    def _submit(self, fetch: _InFlightFetch) -> Future:
+        _update_stats(self.source_name(), misses=1)
+        if self._in_flight_key is not None:
+            key = self._in_flight_key
+            fetch.future.add_done_callback(lambda _: self._forget_in_flight(key, fetch))
+        try:
+            self._executor.submit(self._run, fetch)
+        except RuntimeError as e:
+            fetch.future.set_exception(e)
+            raise
+        return fetch.future
+
+    def _run(self, fetch: _InFlightFetch) -> None:
+        if not fetch.future.set_running_or_notify_cancel():
+            return
+        try:
+            fetch.future.set_result(self._fetch_with_retries(fetch.cancelled))
+        except BaseException as e:
+            fetch.future.set_exception(e)
+            raise
+
+    @staticmethod
+    def _forget_in_flight(key: tuple[str, Hashable], fetch: _InFlightFetch) -> None:
+        with _in_flight_lock:
+            if _in_flight.get(key) is fetch:
+                del _in_flight[key]
 
-    def wait_for_external_result(self) -> None:
+    def _fetch_with_retries(self, cancelled: threading.Event) -> T | None:
+        """Fetch the data, retrying failures with exponential backoff.
+
+        Returns:
+            The data, or None if the fetch failed or was cancelled.
+        """
+        policy = self.fetch_policy
+        start = time.perf_counter()
+        deadline = None if policy.timeout is None else start + policy.timeout
+        _update_stats(self.source_name(), fetches=1)
+        try:
+            for attempt in range(policy.retries + 1):
+                if cancelled.is_set():
+                    _update_stats(self.source_name(), cancellations=1)
+                    return None
+                try:
+                    return self._fetch_data_from_external_source()
+                except policy.retry_on as e:
+                    delay = policy.delay(attempt)
+                    if attempt == policy.retries or (
+                        deadline is not None and time.perf_counter() + delay > deadline
+                    ):
+                        raise
+                    logger.warning(
+                        "Retrying %s in %.1f seconds after error: %s",
+                        self.source_name(),
+                        delay,
+                        e,
+                    )
+                    _update_stats(self.source_name(), retries=1)
+                    cancelled.wait(delay)
+        except Exception:
+            logger.exception("Exception while fetching %s", self.source_name())
+            _update_stats(self.source_name(), failures=1)
+        finally:
+            _update_stats(
+                self.source_name(),
+                total_seconds=time.perf_counter() - start,
+            )
+        return None
+
+    def cancel(self) -> bool:
+        """Stop waiting for the external data.
+
+        The fetch is stopped before its next attempt, unless other instances
+        share it. The result of a cancelled fetch is None.
+
+        Returns:
+            True if this instance is no longer waiting for the fetch.
+        """
+        if self._cancelled:
+            return True
+        self._cancelled = True
+        with _in_flight_lock:
+            self._fetch.subscribers -= 1
+            if self._fetch.subscribers > 0:
+                return True
+            self._fetch.cancelled.set()
+            if self._in_flight_key is not None:
+                self._forget_in_flight(self._in_flight_key, self._fetch)
+        if self.future.cancel():
+            _update_stats(self.source_name(), cancellations=1)
+        return True
+
+    def _result(self, timeout: float | None) -> T | None:
+        if self._cancelled:
+            return None
+        try:
+            return self.future.result(
+                timeout=self.fetch_policy.timeout if timeout is None else timeout
+            )
+        except TimeoutError:
+            logger.warning("Timed out waiting for %s", self.source_name())
+            _update_stats(self.source_name(), timeouts=1)
+        except CancelledError:
+            logger.debug("The fetch of %s was cancelled", self.source_name())
+        return None
+
+    def wait_for_external_result(self, timeout: float | None = None) -> None:
         """Wait for the thread responsible for loading the external request to finish.
 
         If there is no future to wait for, it logs a warning and returns immediately.
+
+        Args:
+            timeout: Seconds to wait. Defaults to the timeout of the fetch policy.
         """
         if not self.future:
             logger.warning("No future to wait for.")
             return
-        self.future.result()
+        self._result(timeout)
 
     def check_if_external_data_is_loaded(self) -> bool:
         """Check if the thread getting the external data has finished running.
@@ -52,19 +359,21 @@ class GetExternalSource[T](ABC):
             return self.future.done()
         return False
 
-    def retrieve_external_data(self) -> T | None:
+    def retrieve_external_data(self, timeout: float | None = None) -> T | None:
         """Retrieve the result of the data fetching operation.
 
-        This method checks if the asynchronous data fetching operation has
-        completed. If the operation is finished, it returns the result.
-        Otherwise, it returns None.
+        This method waits for the asynchronous data fetching operation to
+        complete and returns the result.
+
+        Args:
+            timeout: Seconds to wait. Defaults to the timeout of the fetch policy.
 
         Returns:
-            The result of the data fetching operation if it is complete or None
-            if the operation has not yet finished.
+            The result of the data fetching operation, or None if it failed, was
+            cancelled or did not finish in time.
         """
         if self.future:
-            return self.future.result()
+            return self._result(timeout)
         return None
 
     @abstractmethod
@@ -73,7 +382,7 @@ class GetExternalSource[T](ABC):
 
         Abstract method to be implemented in the subclass.
         This method should define the logic for retrieving data from the specific
-        external source.
+        external source. Exceptions are retried according to the fetch policy.
 
         Returns:
             The data retrieved from the external source.
@@ -0,0 +1,295 @@
+"""Store snapshots of Klass classifications locally.
+
+A snapshot holds all languages and levels of selected classifications in one
+Parquet file, together with metadata about when it was created. CodeList can
+read from a snapshot instead of the Klass API through `KlassSnapshotSource`.
+
+The snapshot can be created and refreshed from the command line::
+
+    python -m dapla_metadata.datasets.klass_snapshot export klass.parquet 6 131
+    python -m dapla_metadata.datasets.klass_snapshot refresh klass.parquet --max-age-days 7
+    python -m dapla_metadata.datasets.klass_snapshot info klass.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import cast
+
+import pandas as pd
+import pyarrow as pa
+from pyarrow import parquet as pq
+from upath import UPath
+
+from dapla_metadata.datasets.code_list import CodeListSource
+from dapla_metadata.datasets.code_list import KlassApiSource
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Sequence
+
+    from upath.types import ReadablePathLike
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_METADATA_KEY = b"dapla_metadata.klass_snapshot"
+CLASSIFICATION_ID_COLUMN = "classification_id"
+LANGUAGE_COLUMN = "language"
+
+
+@dataclass(frozen=True)
+class KlassSnapshotInfo:
+    """Freshness metadata for a snapshot.
+
+    Attributes:
+        created_at: When the snapshot was exported from Klass.
+        classification_ids: The classifications in the snapshot.
+        valid_date: The date the codes are valid for, None meaning the date
+            the snapshot was created.
+    """
+
+    created_at: dt.datetime
+    classification_ids: list[int]
+    valid_date: dt.date | None = None
+
+    @property
+    def age(self) -> dt.timedelta:
+        """The time since the snapshot was created."""
+        return dt.datetime.now(dt.UTC) - self.created_at
+
+    def is_stale(self, max_age: dt.timedelta) -> bool:
+        """Whether the snapshot is older than the given age."""
+        return self.age > max_age
+
+    def to_json(self) -> str:
+        """Serialize to JSON, for storing in the Parquet metadata."""
+        return json.dumps(
+            {
+                "created_at": self.created_at.isoformat(),
+                "classification_ids": self.classification_ids,
+                "valid_date": self.valid_date.isoformat() if self.valid_date else None,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, data: str | bytes) -> KlassSnapshotInfo:
+        """Deserialize from JSON."""
+        info = json.loads(data)
+        return cls(
+            created_at=dt.datetime.fromisoformat(info["created_at"]),
+            classification_ids=info["classification_ids"],
+            valid_date=(
+                dt.date.fromisoformat(info["valid_date"])
+                if info["valid_date"]
+                else None
+            ),
+        )
+
+
+def _tagged_codes(
+    codes: pd.DataFrame,
+    classification_id: int,
+    language: SupportedLanguages,
+) -> pd.DataFrame:
+    """Convert the codes to strings and add the classification and language."""
+    codes = codes.astype("string")
+    codes[CLASSIFICATION_ID_COLUMN] = classification_id
+    codes[LANGUAGE_COLUMN] = str(language)
+    return codes
+
+
+class KlassSnapshotStore:
+    """Exports classifications from Klass to a local Parquet file."""
+
+    def __init__(self, path: ReadablePathLike) -> None:
+        """Initialize the store for the given file.
+
+        Args:
+            path: The Parquet file holding the snapshot.
+        """
+        self.path = UPath(path)
+
+    def export(
+        self,
+        classification_ids: Iterable[int],
+        valid_date: dt.date | None = None,
+        source: CodeListSource | None = None,
+    ) -> KlassSnapshotInfo:
+        """Export all languages and levels of the classifications.
+
+        Args:
+            classification_ids: The classifications to export.
+            valid_date: The date the codes should be valid for. Defaults to the
+                current date.
+            source: Where to get the codes from. Defaults to the Klass API.
+
+        Returns:
+            The metadata of the new snapshot.
+        """
+        source = source or KlassApiSource()
+        ids = sorted(set(classification_ids))
+        keys = [(i, language) for i in ids for language in SupportedLanguages]
+        with ThreadPoolExecutor(max_workers=len(SupportedLanguages) * 2) as executor:
+            frames: list[pd.DataFrame] = list(
+                executor.map(
+                    lambda key: _tagged_codes(
+                        source.get_codes(key[0], key[1], None, valid_date), *key
+                    ),
+                    keys,
+                )
+            )
+
+        table = pa.Table.from_pandas(
+            pd.concat(frames, ignore_index=True), preserve_index=False
+        )
+        info = KlassSnapshotInfo(dt.datetime.now(dt.UTC), ids, valid_date)
+        table = table.replace_schema_metadata({SNAPSHOT_METADATA_KEY: info.to_json()})
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open(mode="wb") as f:
+            pq.write_table(table, f)
+        logger.info("Exported %s classifications to %s", len(ids), self.path)
+        return info
+
+    def info(self) -> KlassSnapshotInfo:
+        """Read the metadata of the snapshot, without reading the codes."""
+        with self.path.open(mode="rb") as f:
+            metadata = pq.read_schema(f).metadata or {}
+        return KlassSnapshotInfo.from_json(metadata[SNAPSHOT_METADATA_KEY])
+
+    def refresh(
+        self,
+        max_age: dt.timedelta | None = None,
+        source: CodeListSource | None = None,
+    ) -> KlassSnapshotInfo:
+        """Export the classifications in the snapshot again.
+
+        Args:
+            max_age: Only refresh if the snapshot is older than this. Defaults
+                to always refreshing.
+            source: Where to get the codes from. Defaults to the Klass API.
+
+        Returns:
+            The metadata of the current snapshot.
+        """
+        info = self.info()
+        if max_age is not None and not info.is_stale(max_age):
+            logger.info("Snapshot %s is fresh, created %s", self.path, info.created_at)
+            return info
+        return self.export(info.classification_ids, info.valid_date, source)
+
+    def source(self) -> KlassSnapshotSource:
+        """Return a CodeList source reading from this snapshot."""
+        return KlassSnapshotSource(self.path)
+
+
+class KlassSnapshotSource(CodeListSource):
+    """Gets codes from a local snapshot instead of the Klass API.
+
+    The snapshot is read from disk the first time codes are requested.
+    """
+
+    def __init__(self, path: ReadablePathLike) -> None:
+        """Initialize the source for the given snapshot file.
+
+        Args:
+            path: The Parquet file holding the snapshot.
+        """
+        self.store = KlassSnapshotStore(path)
+        self._frames: dict[tuple[int, str], pd.DataFrame] | None = None
+        self._info: KlassSnapshotInfo | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def info(self) -> KlassSnapshotInfo:
+        """The freshness metadata of the snapshot."""
+        self._load()
+        return self._info  # type: ignore [return-value]
+
+    def _load(self) -> dict[tuple[int, str], pd.DataFrame]:
+        with self._lock:
+            if self._frames is None:
+                with self.store.path.open(mode="rb") as f:
+                    table = pq.read_table(f)
+                self._info = KlassSnapshotInfo.from_json(
+                    (table.schema.metadata or {})[SNAPSHOT_METADATA_KEY]
+                )
+                frame = table.to_pandas()
+                self._frames = {
+                    cast("tuple[int, str]", key): group.drop(
+                        columns=[CLASSIFICATION_ID_COLUMN, LANGUAGE_COLUMN]
+                    ).reset_index(drop=True)
+                    for key, group in frame.groupby(
+                        [CLASSIFICATION_ID_COLUMN, LANGUAGE_COLUMN], sort=False
+                    )
+                }
+            return self._frames
+
+    def get_codes(
+        self,
+        classification_id: int | None,
+        language: SupportedLanguages,
+        level: int | None = None,
+        date: dt.date | None = None,
+    ) -> pd.DataFrame:
+        """Get the codes of a classification from the snapshot.
+
+        Raises:
+            LookupError: If the classification is not in the snapshot, or the
+                snapshot is for another date than the one requested.
+        """
+        frames = self._load()
+        if date is not None and date != self.info.valid_date:
+            msg = f"The snapshot {self.store.path} is not valid for {date}"
+            raise LookupError(msg)
+        try:
+            codes = frames[(int(classification_id or 0), str(language))]
+        except KeyError:
+            msg = f"Classification {classification_id} is not in the snapshot {self.store.path}"
+            raise LookupError(msg) from None
+        if level is not None and "level" in codes:
+            codes = codes[codes["level"] == str(level)].reset_index(drop=True)
+        return codes
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Export, refresh or describe a Klass snapshot from the command line."""
+    parser = argparse.ArgumentParser(
+        prog="python -m dapla_metadata.datasets.klass_snapshot",
+        description="Store Klass classifications in a local snapshot.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Export classifications.")
+    export.add_argument("path")
+    export.add_argument("classification_ids", nargs="+", type=int)
+    export.add_argument("--date", type=dt.date.fromisoformat, default=None)
+    refresh = commands.add_parser("refresh", help="Export the snapshot again.")
+    refresh.add_argument("path")
+    refresh.add_argument("--max-age-days", type=float, default=None)
+    info = commands.add_parser("info", help="Show the freshness of a snapshot.")
+    info.add_argument("path")
+    args = parser.parse_args(argv)
+
+    store = KlassSnapshotStore(args.path)
+    if args.command == "export":
+        snapshot_info = store.export(args.classification_ids, args.date)
+    elif args.command == "refresh":
+        snapshot_info = store.refresh(
+            dt.timedelta(days=args.max_age_days)
+            if args.max_age_days is not None
+            else None
+        )
+    else:
+        snapshot_info = store.info()
+    print(snapshot_info.to_json())  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""Find the variables which reference a variable definition or classification.
+
+The index maps the URN of each variable definition and classification to the
+variables which reference it, across all the documents in a catalog. It is
+kept in memory for constant time lookups, and is updated together with the
+catalog so only changed documents are read again.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+from dapla_metadata.datasets.catalog import CATALOG_READ_WORKERS
+from dapla_metadata.datasets.catalog import normalize_urn
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from upath.types import ReadablePathLike
+
+    from dapla_metadata.datasets.catalog import CatalogBuildResult
+    from dapla_metadata.datasets.catalog import MetadataCatalog
+
+# The variable fields with references, by the catalog column with their URN
+REFERENCE_FIELDS = {
+    "definition_urn": "definition_uri",
+    "classification_urn": "classification_uri",
+}
+
+_REFERENCES_QUERY = """
+SELECT document_path, position, short_name, definition_urn, classification_urn
+FROM variables
+WHERE (definition_urn IS NOT NULL OR classification_urn IS NOT NULL)
+"""
+
+
+@dataclass(frozen=True)
+class Reference:
+    """A variable which references a variable definition or classification.
+
+    Attributes:
+        document_path: The metadata document of the dataset with the variable.
+        position: The position of the variable in the document.
+        short_name: The short name of the variable.
+        field_name: The variable field with the reference, `definition_uri`
+            or `classification_uri`.
+    """
+
+    document_path: str
+    position: int
+    short_name: str | None
+    field_name: str
+
+
+@dataclass
+class ImpactReport:
+    """The datasets which are affected by a change to what a URN refers to.
+
+    Attributes:
+        urn: The URN of the variable definition or classification.
+        references: The referencing variables, ordered by document.
+        datasets: The catalog rows of the datasets with referencing variables,
+            ordered by document.
+    """
+
+    urn: str
+    references: list[Reference] = field(default_factory=list)
+    datasets: list[dict[str, Any]] = field(default_factory=list)
+
+    def by_owner(self) -> dict[str | None, list[str]]:
+        """The documents with referencing variables, by the team which owns the dataset."""
+        owners: dict[str | None, list[str]] = {}
+        for dataset in self.datasets:
+            owners.setdefault(dataset["owner"], []).append(dataset["document_path"])
+        return owners
+
+    def variables(self, document_path: str) -> list[str | None]:
+        """The short names of the referencing variables in the document."""
+        return [
+            r.short_name for r in self.references if r.document_path == document_path
+        ]
+
+
+class ReferenceIndex:
+    """The variables which reference each variable definition and classification.
+
+    URLs of Vardef and Klass are converted to URNs, both when indexing and in
+    lookups, so the same resource is found however it is referred to.
+
+    Examples:
+        >>> with MetadataCatalog("catalog.sqlite") as catalog:  # doctest: +SKIP
+        ...     index = ReferenceIndex(catalog)
+        ...     index.update("gs://ssb-befolkning-data-produkt-prod")
+        ...     index.impact_report("urn:ssb:classification:klass:91").by_owner()
+    """
+
+    def __init__(self, catalog: MetadataCatalog) -> None:
+        """Index the references in the documents already in the catalog.
+
+        Args:
+            catalog: The catalog to index and keep up to date.
+        """
+        self.catalog = catalog
+        self._references: dict[str, dict[Reference, None]] = {}
+        self._by_document: dict[str, list[tuple[str, Reference]]] = {}
+        self._add(self.catalog.connection.execute(_REFERENCES_QUERY))
+
+    def __len__(self) -> int:
+        """The number of referenced URNs."""
+        return len(self._references)
+
+    def __contains__(self, urn: object) -> bool:
+        """Whether any variable references the URN or URL."""
+        return isinstance(urn, str) and normalize_urn(urn) in self._references
+
+    def update(
+        self,
+        prefix: ReadablePathLike,
+        max_workers: int = CATALOG_READ_WORKERS,
+    ) -> CatalogBuildResult:
+        """Update the catalog with the documents under the prefix, and reindex the changed ones.
+
+        Args:
+            prefix: A bucket or a directory in a bucket, or a local directory.
+            max_workers: The number of documents read at the same time.
+
+        Returns:
+            What the catalog build indexed, skipped and removed.
+        """
+        result = self.catalog.build(prefix, max_workers=max_workers)
+        self.reindex([*result.indexed, *result.removed, *result.failed])
+        return result
+
+    def reindex(self, document_paths: Iterable[str]) -> None:
+        """Replace the references of the documents with those now in the catalog."""
+        for document_path in document_paths:
+            self._remove(document_path)
+            self._add(
+                self.catalog.connection.execute(
+                    f"{_REFERENCES_QUERY} AND document_path = ?", (document_path,)
+                )
+            )
+
+    def references(self, urn: str) -> list[Reference]:
+        """The variables which reference the URN.
+
+        Args:
+            urn: The URN, or any known URL of the same resource.
+        """
+        return list(self._references.get(normalize_urn(urn) or "", ()))
+
+    def impact_report(self, urn: str) -> ImpactReport:
+        """The datasets and variables affected by changing what the URN refers to.
+
+        Args:
+            urn: The URN, or any known URL of the same resource.
+        """
+        references = sorted(
+            self.references(urn),
+            key=lambda r: (r.document_path, r.position, r.field_name),
+        )
+        datasets = [
+            dataset
+            for document_path in dict.fromkeys(r.document_path for r in references)
+            for dataset in self.catalog.find_datasets(document_path=document_path)
+        ]
+        return ImpactReport(
+            urn=normalize_urn(urn) or urn,
+            references=references,
+            datasets=datasets,
+        )
+
+    def _add(
+        self, rows: Iterable[tuple[str, int, str | None, str | None, str | None]]
+    ) -> None:
+        for document_path, position, short_name, *urns in rows:
+            for column, urn in zip(REFERENCE_FIELDS, urns, strict=True):
+                if urn is None:
+                    continue
+                reference = Reference(
+                    document_path, position, short_name, REFERENCE_FIELDS[column]
+                )
+                self._references.setdefault(urn, {})[reference] = None
+                self._by_document.setdefault(document_path, []).append((urn, reference))
+
+    def _remove(self, document_path: str) -> None:
+        for urn, reference in self._by_document.pop(document_path, ()):
+            references = self._references.get(urn)
+            if references is None:
+                continue
+            references.pop(reference, None)
+            if not references:
+                del self._references[urn]
@@ -14,6 +14,7 @@ from dapla_metadata.datasets.external_sources.external_sources import GetExterna
 from dapla_metadata.datasets.utility.enums import SupportedLanguages
 
 if TYPE_CHECKING:
+    from collections.abc import Hashable
     from concurrent.futures import ThreadPoolExecutor
 
 logger = logging.getLogger(__name__)
@@ -72,7 +73,7 @@ class StatisticSubjectMapping(GetExternalSource):
 
     def __init__(
         self,
-        executor: ThreadPoolExecutor,
+        executor: ThreadPoolExecutor | None,
         source_url: str | None,
     ) -> None:
         """Retrieve the statistical structure document from the given URL.
@@ -80,7 +81,8 @@ class StatisticSubjectMapping(GetExternalSource):
         Initializes the mapping based on values in the statistical structure document sourced at `source_url`.
 
         Args:
-            executor: The ThreadPoolExecutor which will run the job of fetching the statistical structure document.
+            executor: The ThreadPoolExecutor which will run the job of fetching the statistical structure document,
+                or None to use the shared executor.
             source_url: The URL from which to fetch the statistical structure document.
         """
         self.source_url = source_url
@@ -112,28 +114,29 @@ class StatisticSubjectMapping(GetExternalSource):
             titles[title["sprak"]] = title.text
         return titles
 
+    def _dedup_key(self) -> Hashable | None:
+        """Share fetches of the same statistical structure document."""
+        return self.source_url
+
     def _fetch_data_from_external_source(self) -> ResultSet | None:
         """Fetch statistical structure document from source_url.
 
-        Returns a BeautifulSoup ResultSet.
+        Returns a BeautifulSoup ResultSet. Request exceptions are raised to
+        GetExternalSource, which retries transient errors.
         """
         if not self.source_url:
             logger.debug("No statistic subject url supplied")
             return None
 
-        try:
-            response = requests.get(
-                str(self.source_url),
-                headers={"User-Agent": get_user_agent()},
-                timeout=30,
-            )
-            response.encoding = "utf-8"
-            logger.debug("Got response %s from %s", response, self.source_url)
-            soup = BeautifulSoup(response.text, features="xml")
-            return soup.find_all("hovedemne")
-        except requests.exceptions.RequestException:
-            logger.exception("Exception while fetching statistical structure")
-            return None
+        response = requests.get(
+            str(self.source_url),
+            headers={"User-Agent": get_user_agent()},
+            timeout=30,
+        )
+        response.encoding = "utf-8"
+        logger.debug("Got response %s from %s", response, self.source_url)
+        soup = BeautifulSoup(response.text, features="xml")
+        return soup.find_all("hovedemne")
 
     def _parse_statistic_subject_structure_xml(
         self,
@@ -0,0 +1,211 @@
+"""Time the stages of reading and writing metadata.
+
+Each Datadoc records how long its stages take in a `Tracer`, available as
+`Datadoc.tracer`. To follow the stages of all Datadoc instances, for example
+in production notebooks, add a sink which receives every finished span:
+
+    >>> from dapla_metadata.datasets.tracing import add_span_sink
+    >>> from dapla_metadata.datasets.tracing import logging_sink
+    >>> remove = add_span_sink(logging_sink)
+    >>> remove()
+
+When no sinks are added, spans only update the timings of their tracer.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Span:
+    """A finished stage.
+
+    Attributes:
+        name: The name of the stage.
+        start: When the stage started, as given by `time.perf_counter`.
+        duration: Seconds the stage took.
+        parent: The name of the stage this stage was part of, if any.
+        attributes: Details about the stage, such as the path of a file.
+        error: The name of the exception which ended the stage, if any.
+    """
+
+    name: str
+    start: float
+    duration: float
+    parent: str | None = None
+    attributes: dict[str, Any] = field(default_factory=dict)
+    error: str | None = None
+
+
+type SpanSink = Callable[[Span], None]
+
+_sinks: tuple[SpanSink, ...] = ()
+_sinks_lock = threading.Lock()
+
+# The running stages of all tracers as (tracer id, stage name), innermost last
+_span_stack: ContextVar[tuple[tuple[int, str], ...]] = ContextVar(
+    "dapla_metadata_span_stack", default=()
+)
+_tracer_ids = itertools.count()
+
+
+def add_span_sink(sink: SpanSink) -> Callable[[], None]:
+    """Send every finished span to the sink.
+
+    Args:
+        sink: Called with each span when it finishes. Exceptions raised by the
+            sink are logged and otherwise ignored.
+
+    Returns:
+        A function which removes the sink.
+    """
+    global _sinks  # noqa: PLW0603
+    with _sinks_lock:
+        _sinks = (*_sinks, sink)
+
+    def remove() -> None:
+        global _sinks  # noqa: PLW0603
+        with _sinks_lock:
+            _sinks = tuple(s for s in _sinks if s is not sink)
+
+    return remove
+
+
+def logging_sink(span: Span) -> None:
+    """Log the span with the logger of this module at debug level."""
+    logger.debug(
+        "Span %s took %.3f seconds%s",
+        span.name,
+        span.duration,
+        f" and failed with {span.error}" if span.error else "",
+        extra={
+            "span": {
+                "name": span.name,
+                "duration": span.duration,
+                "attributes": span.attributes,
+            }
+        },
+    )
+
+
+class OpenTelemetrySink:
+    """Export spans to OpenTelemetry.
+
+    Requires the `opentelemetry-api` package, which is not a dependency of
+    this package.
+    """
+
+    def __init__(self, tracer_name: str = "dapla_metadata") -> None:
+        """Get an OpenTelemetry tracer to export spans with.
+
+        Args:
+            tracer_name: The name of the OpenTelemetry tracer.
+
+        Raises:
+            ImportError: If OpenTelemetry is not installed.
+        """
+        try:
+            from opentelemetry import trace  # noqa: PLC0415
+        except ImportError as e:
+            msg = "Install opentelemetry-api to export spans to OpenTelemetry"
+            raise ImportError(msg) from e
+        self._tracer = trace.get_tracer(tracer_name)
+        self._offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def __call__(self, span: Span) -> None:
+        """Export the span, with the time it actually started and ended."""
+        start_ns = self._offset_ns + int(span.start * 1e9)
+        otel_span = self._tracer.start_span(
+            span.name,
+            start_time=start_ns,
+            attributes={k: str(v) for k, v in span.attributes.items() if v is not None},
+        )
+        if span.error:
+            otel_span.set_attribute("error.type", span.error)
+        otel_span.end(end_time=start_ns + int(span.duration * 1e9))
+
+
+class Tracer:
+    """Records the time spent in each stage.
+
+    Time spent in stages with the same name is added up. Stages may run in
+    several threads and asyncio tasks at once. A stage is only part of the
+    stages running in the same context, so stages in a thread started with
+    `asyncio.to_thread` are part of the stage which started the thread, while
+    stages in a thread of a `ThreadPoolExecutor` are not.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the tracer without any recorded stages."""
+        self.timings: dict[str, float] = {}
+        self._id = next(_tracer_ids)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[None]:
+        """Time the stage run inside the `with` block.
+
+        Args:
+            name: The name of the stage.
+            attributes: Details passed on to the span sinks.
+        """
+        stack = _span_stack.get()
+        parent = next(
+            (stage for tracer, stage in reversed(stack) if tracer == self._id), None
+        )
+        token = _span_stack.set((*stack, (self._id, name)))
+        error = None
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            duration = time.perf_counter() - start
+            _span_stack.reset(token)
+            with self._lock:
+                self.timings[name] = self.timings.get(name, 0.0) + duration
+            if _sinks:
+                _emit(Span(name, start, duration, parent, attributes, error))
+
+    def summary(self) -> str:
+        """Describe the time spent in each stage, slowest first.
+
+        Nested stages are included in the time of the stages they are part of.
+        """
+        with self._lock:
+            timings = dict(self.timings)
+        if not timings:
+            return "No stages recorded"
+        width = max(len(name) for name in timings)
+        return "\n".join(
+            f"{name:<{width}}  {seconds * 1000:10.1f} ms"
+            for name, seconds in sorted(
+                timings.items(), key=lambda item: item[1], reverse=True
+            )
+        )
+
+
+def _emit(span: Span) -> None:
+    for sink in _sinks:
+        try:
+            sink(span)
+        except Exception:
+            logger.exception("Span sink %s failed", sink)
@@ -0,0 +1,56 @@
+"""Read and write files without blocking the event loop.
+
+Filesystems which are asynchronous underneath, such as `gcsfs`, are called
+through their coroutines on the event loop the filesystem already runs on.
+Other filesystems are called in a thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+from typing import Any
+
+if TYPE_CHECKING:
+    from upath import UPath
+
+
+async def _call(path: UPath, method: str, *args: Any) -> Any:
+    fs = path.fs
+    if not getattr(fs, "async_impl", False):
+        return await asyncio.to_thread(getattr(fs, method), path.path, *args)
+    coroutine = getattr(fs, f"_{method}")(path.path, *args)
+    if fs.asynchronous:
+        # The filesystem was created for the running event loop
+        return await coroutine
+    return await asyncio.wrap_future(
+        asyncio.run_coroutine_threadsafe(coroutine, fs.loop)
+    )
+
+
+async def read_bytes(path: UPath) -> bytes:
+    """Read the content of the file.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    return await _call(path, "cat_file")
+
+
+async def read_text(path: UPath, encoding: str = "utf-8") -> str:
+    """Read the content of the file as text.
+
+    Raises:
+        FileNotFoundError: If the file does not exist.
+    """
+    return (await read_bytes(path)).decode(encoding)
+
+
+async def write_bytes(path: UPath, content: bytes) -> None:
+    """Write the content to the file, replacing it if it exists."""
+    await _call(path, "pipe_file", content)
+
+
+async def write_text(path: UPath, content: str, encoding: str = "utf-8") -> None:
+    """Write the text to the file, replacing it if it exists."""
+    await write_bytes(path, content.encode(encoding))
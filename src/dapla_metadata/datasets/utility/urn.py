@@ -1,17 +1,21 @@
 """Validate, parse and render URNs."""
 
+import functools
 import logging
 import re
 from collections.abc import Iterable
+from collections.abc import Sequence
 from dataclasses import dataclass
+from dataclasses import field
 from enum import Enum
 from enum import StrEnum
 from enum import auto
 from typing import Literal
 
+import pyarrow as pa
 from pydantic import AnyUrl
 
-from dapla_metadata._shared.config import get_dapla_environment
+from dapla_metadata._shared.config import get_config
 from dapla_metadata._shared.enums import DaplaEnvironment
 from dapla_metadata.datasets.utility.utils import VariableListType
 
@@ -69,13 +73,19 @@ class UrnConverter:
     id_pattern: str
     url_bases: list[tuple[ReferenceUrlTypes, str]]
 
-    def _extract_id(self, url: str, pattern: re.Pattern[str]) -> str | None:
-        if match := pattern.match(url):
-            return match.group(1)
-        return None
+    @functools.cached_property
+    def _url_pattern(self) -> re.Pattern[str]:
+        """Matches all the URL bases and captures the identifier.
 
-    def _build_pattern(self, url_base: str) -> re.Pattern[str]:
-        return re.compile(f"^{url_base}/{self.id_pattern}")
+        The URL bases are tried in order, so the result is the same as matching
+        each of them separately.
+        """
+        url_bases = "|".join(f"(?:{url_base})" for _, url_base in self.url_bases)
+        return re.compile(f"^(?:{url_bases})/{self.id_pattern}")
+
+    @functools.cached_property
+    def _id_pattern(self) -> re.Pattern[str]:
+        return re.compile(f"^{self.id_pattern}$")
 
     def get_urn(self, identifier: str) -> str:
         """Build a URN for the given identifier."""
@@ -100,15 +110,13 @@ class UrnConverter:
             str | None: The concrete URL. None if we cannot satisfy the supplied requirements.
         """
         candidates = [base[-1] for base in self.url_bases if base[0] == url_type]
+        is_test_environment = get_config().dapla_environment == DaplaEnvironment.TEST
 
         def matches_visibility(url: str, visibility: UrlVisibility):
             return (".intern." in url) is (visibility == "internal")
 
         def matches_environment(url: str):
-            current_environment = get_dapla_environment()
-            if current_environment == DaplaEnvironment.TEST:
-                return ".test." in url
-            return ".test." not in url
+            return (".test." in url) is is_test_environment
 
         if url := next(
             (
@@ -143,13 +151,12 @@ class UrnConverter:
         if not isinstance(value, str):
             # Mypy thinks it's impossible to reach this branch, but there are no guarantees in Python.
             return False  # type: ignore [unreachable]
-        pattern = re.compile(f"^{self.id_pattern}$")
-        return bool(pattern.match(value))
+        return bool(self._id_pattern.match(value))
 
     def _extract_id_from_url(self, url: str | AnyUrl) -> str | None:
-        patterns = (self._build_pattern(url[-1]) for url in self.url_bases)
-        matches = (self._extract_id(str(url), p) for p in patterns)
-        return next((m for m in matches if m), None)
+        if match := self._url_pattern.match(str(url)):
+            return match.group(1)
+        return None
 
     def convert_url_to_urn(self, url: str | AnyUrl) -> AnyUrl | None:
         """Convert a URL to a generalized URN for that same resource.
@@ -205,8 +212,110 @@ klass_urn_converter = UrnConverter(
 )
 
 
+@dataclass
+class UrnConversionResult:
+    """The result of converting many values to URNs.
+
+    Attributes:
+        urns: The URN for each value, or None where the value is empty or could
+            not be converted.
+        error_indices: The indices of the values which could not be converted.
+    """
+
+    urns: list[AnyUrl | None] = field(default_factory=list)
+    error_indices: list[int] = field(default_factory=list)
+
+
+class CombinedUrnConverter:
+    """Converts URLs to URNs for several converters with a single match.
+
+    The URN bases and URL bases of all the converters are combined into one
+    precompiled pattern, so each value is only matched once regardless of how
+    many converters there are.
+
+    Examples:
+        >>> combined = CombinedUrnConverter([vardef_urn_converter, klass_urn_converter])
+        >>> str(combined.convert_url_to_urn("https://www.ssb.no/klass/klassifikasjoner/91"))
+        'urn:ssb:classification:klass:91'
+        >>> combined.convert_many(["https://www.vg.no", None]).error_indices
+        [0]
+    """
+
+    def __init__(self, converters: Iterable[UrnConverter]) -> None:
+        """Compile the combined pattern for the given converters."""
+        self.converters = list(converters)
+        alternatives = []
+        for index, converter in enumerate(self.converters):
+            url_bases = "|".join(
+                f"(?:{url_base})" for _, url_base in converter.url_bases
+            )
+            alternatives.append(f"(?P<urn{index}>{re.escape(converter.urn_base)})")
+            alternatives.append(
+                f"(?P<url{index}>(?:{url_bases})/{converter.id_pattern})"
+            )
+        self._pattern = re.compile(f"^(?:{'|'.join(alternatives)})")
+
+    def convert_url_to_urn(self, url: str | AnyUrl) -> AnyUrl | None:
+        """Convert a URL to a URN with the first converter which supports it.
+
+        Args:
+            url (str | AnyUrl): The URL to convert.
+
+        Returns:
+            AnyUrl | None: The URN or None if it can't be converted.
+        """
+        match = self._pattern.match(str(url))
+        if not match or match.lastgroup is None:
+            return None
+        kind, index = match.lastgroup[:3], int(match.lastgroup[3:])
+        if kind == "urn":
+            # In this case the value is already in the expected format and nothing needs to be done.
+            return AnyUrl(url)
+        # The identifier is the first group in the converter's id pattern
+        identifier = match.group(self._pattern.groupindex[match.lastgroup] + 1)
+        return AnyUrl(self.converters[index].get_urn(identifier))
+
+    def convert_many(
+        self,
+        values: Sequence[str | AnyUrl | None] | pa.Array | pa.ChunkedArray,
+    ) -> UrnConversionResult:
+        """Convert a column of URLs to URNs.
+
+        Each distinct value is only converted once.
+
+        Args:
+            values: The values to convert, as a list or a pyarrow array.
+
+        Returns:
+            UrnConversionResult: The URNs and the indices of the values which
+                could not be converted. Empty values are not errors.
+        """
+        if isinstance(values, pa.Array | pa.ChunkedArray):
+            values = values.to_pylist()
+        result = UrnConversionResult()
+        converted: dict[str, AnyUrl | None] = {}
+        for index, value in enumerate(values):
+            if not value:
+                result.urns.append(None)
+                continue
+            key = str(value)
+            if key not in converted:
+                converted[key] = self.convert_url_to_urn(value)
+            if (urn := converted[key]) is None:
+                result.error_indices.append(index)
+            result.urns.append(urn)
+        return result
+
+
+# Precompiled converters for the fields converted when reading a document
+vardef_combined_urn_converter = CombinedUrnConverter([vardef_urn_converter])
+klass_combined_urn_converter = CombinedUrnConverter([klass_urn_converter])
+
+
 def convert_uris_to_urns(
-    variables: VariableListType, field_name: str, converters: Iterable[UrnConverter]
+    variables: VariableListType,
+    field_name: str,
+    converters: Iterable[UrnConverter] | CombinedUrnConverter,
 ) -> None:
     """Where URIs are recognized URLs, convert them to URNs.
 
@@ -216,20 +325,24 @@ def convert_uris_to_urns(
     Args:
         variables (VariableListType): The list of variables.
         field_name (str): The name of the field which has URLs to convert to URNs
-        converters (Iterable[UrnConverter]): One or more converters which implement
-            conversion of URLs into one specific URN format. These will typically be
-            specific to an individual metadata reference system.
+        converters (Iterable[UrnConverter] | CombinedUrnConverter): One or more
+            converters which implement conversion of URLs into one specific URN
+            format. These will typically be specific to an individual metadata
+            reference system. Pass a `CombinedUrnConverter` in repeated calls,
+            so its pattern is only compiled once.
     """
-    for v in variables:
-        field = getattr(v, field_name, None)
-        if field:
-            if urn := next((c.convert_url_to_urn(field) for c in converters), None):
-                setattr(v, field_name, urn)
-            else:
-                logger.error(
-                    URN_ERROR_MESSAGE_TEMPLATE.format(
-                        field_name=field_name,
-                        short_name=v.short_name,
-                        value=field,
-                    )
-                )
+    if not isinstance(converters, CombinedUrnConverter):
+        converters = CombinedUrnConverter(converters)
+    values = [getattr(v, field_name, None) for v in variables]
+    result = converters.convert_many(values)
+    for v, urn in zip(variables, result.urns, strict=True):
+        if urn is not None:
+            setattr(v, field_name, urn)
+    for index in result.error_indices:
+        logger.error(
+            URN_ERROR_MESSAGE_TEMPLATE.format(
+                field_name=field_name,
+                short_name=variables[index].short_name,
+                value=values[index],
+            )
+        )
@@ -18,6 +18,7 @@ from dapla_metadata.dapla import user_info
 from dapla_metadata.datasets.compatibility.model_backwards_compatibility import (
     upgrade_metadata,
 )
+from dapla_metadata.datasets.external_sources.cache import TtlLruCache
 from dapla_metadata.datasets.utility.constants import DAEAD_ENCRYPTION_KEY_REFERENCE
 from dapla_metadata.datasets.utility.constants import ENCRYPTION_PARAMETER_KEY_ID
 from dapla_metadata.datasets.utility.constants import ENCRYPTION_PARAMETER_SNAPSHOT_DATE
@@ -46,6 +47,9 @@ from dapla_metadata.datasets.utility.constants import PARQUET_DATASET_FILE_EXTEN
 from dapla_metadata.datasets.utility.enums import EncryptionAlgorithm
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from collections.abc import Mapping
+
     from upath.types import ReadablePathLike
 
 logger = logging.getLogger(__name__)
@@ -514,30 +518,10 @@ def _ensure_encryption_parameters(
     return result
 
 
-def set_default_values_pseudonymization(
-    variable: VariableType,
+def _set_pseudonymization_defaults(
     pseudonymization: PseudonymizationType,
+    current_date: str,
 ) -> None:
-    """Populate pseudonymization fields with defaults based on the encryption algorithm.
-
-    Updates the encryption key reference and encryption parameters if they are not set,
-    handling both PAPIS and DAED algorithms. Leaves unknown algorithms unchanged.
-    """
-    # Use the model corresponding to that already in use internally
-    if isinstance(variable, required_model.Variable) and isinstance(
-        pseudonymization, all_optional_model.Pseudonymization
-    ):
-        pseudonymization = required_model.Pseudonymization.model_validate(
-            pseudonymization.model_dump()
-        )
-    elif isinstance(variable, all_optional_model.Variable) and isinstance(
-        pseudonymization, required_model.Pseudonymization
-    ):
-        pseudonymization = all_optional_model.Pseudonymization.model_validate(
-            pseudonymization.model_dump()
-        )
-    if variable.pseudonymization is None:
-        variable.pseudonymization = pseudonymization
     match pseudonymization.encryption_algorithm:
         case EncryptionAlgorithm.PAPIS_ENCRYPTION_ALGORITHM.value:
             if not pseudonymization.encryption_key_reference:
@@ -549,7 +533,7 @@ def set_default_values_pseudonymization(
                 ENCRYPTION_PARAMETER_STRATEGY: ENCRYPTION_PARAMETER_STRATEGY_SKIP,
             }
             if pseudonymization.stable_identifier_type == PAPIS_STABLE_IDENTIFIER_TYPE:
-                base_params[ENCRYPTION_PARAMETER_SNAPSHOT_DATE] = get_current_date()
+                base_params[ENCRYPTION_PARAMETER_SNAPSHOT_DATE] = current_date
             pseudonymization.encryption_algorithm_parameters = (
                 _ensure_encryption_parameters(
                     pseudonymization.encryption_algorithm_parameters,
@@ -573,6 +557,82 @@ def set_default_values_pseudonymization(
             pass
 
 
+def _pseudonymization_for(
+    variable: VariableType,
+    pseudonymization: PseudonymizationType,
+) -> PseudonymizationType:
+    """Use the model corresponding to that already in use internally."""
+    if isinstance(variable, required_model.Variable) and isinstance(
+        pseudonymization, all_optional_model.Pseudonymization
+    ):
+        return required_model.Pseudonymization.model_validate(
+            pseudonymization.model_dump()
+        )
+    if isinstance(variable, all_optional_model.Variable) and isinstance(
+        pseudonymization, required_model.Pseudonymization
+    ):
+        return all_optional_model.Pseudonymization.model_validate(
+            pseudonymization.model_dump()
+        )
+    return pseudonymization
+
+
+def set_default_values_pseudonymization(
+    variable: VariableType,
+    pseudonymization: PseudonymizationType,
+) -> None:
+    """Populate pseudonymization fields with defaults based on the encryption algorithm.
+
+    Updates the encryption key reference and encryption parameters if they are not set,
+    handling both PAPIS and DAED algorithms. Leaves unknown algorithms unchanged.
+    """
+    pseudonymization = _pseudonymization_for(variable, pseudonymization)
+    if variable.pseudonymization is None:
+        variable.pseudonymization = pseudonymization
+    _set_pseudonymization_defaults(pseudonymization, get_current_date())
+
+
+def set_default_values_pseudonymizations(
+    variables: Iterable[VariableType],
+    pseudonymization: PseudonymizationType,
+) -> list[VariableType]:
+    """Give the variables which have no pseudonymization a copy of the given one.
+
+    The defaults are populated as in `set_default_values_pseudonymization`,
+    but they are computed once for all the variables.
+
+    Args:
+        variables: The variables to pseudonymize.
+        pseudonymization: The pseudonymization to copy. It is not changed.
+
+    Returns:
+        The variables which were given a pseudonymization.
+    """
+    current_date = get_current_date()
+    templates: dict[type, PseudonymizationType] = {}
+    pseudonymized: list[VariableType] = []
+    for variable in variables:
+        if variable.pseudonymization is not None:
+            continue
+        template = templates.get(type(variable))
+        if template is None:
+            template = _pseudonymization_for(variable, pseudonymization)
+            template = templates[type(variable)] = template.model_copy(deep=True)
+            _set_pseudonymization_defaults(template, current_date)
+        variable.pseudonymization = template.model_copy(deep=True)  # type: ignore [assignment]
+        pseudonymized.append(variable)
+    return pseudonymized
+
+
+def _read_upgraded_metadata_document(metadata_path: UPath) -> dict[str, Any]:
+    try:
+        content = metadata_path.read_text(encoding="utf-8")
+    except FileNotFoundError:
+        msg = f"Metadata document does not exist! Provided path: {metadata_path}"
+        raise ValueError(msg) from None
+    return upgrade_metadata(json.loads(content))
+
+
 def read_variables_from_metadata_document(
     metadata_document: ReadablePathLike,
 ) -> list[all_optional_model.Variable]:
@@ -586,15 +646,7 @@ def read_variables_from_metadata_document(
     Returns:
         List of variables from the metadata document.
     """
-    metadata_path = UPath(metadata_document)
-    if not metadata_path.exists():
-        msg = f"Metadata document does not exist! Provided path: {metadata_path}"
-        raise ValueError(msg)
-
-    with metadata_path.open("r", encoding="utf-8") as f:
-        metadata_dict = json.load(f)
-
-    upgraded_metadata = upgrade_metadata(metadata_dict)
+    upgraded_metadata = _read_upgraded_metadata_document(UPath(metadata_document))
 
     metadata_document_variables: list[all_optional_model.Variable] = [
         all_optional_model.Variable.model_validate(v)
@@ -604,6 +656,103 @@ def read_variables_from_metadata_document(
     return metadata_document_variables
 
 
+class SourceDocument:
+    """The variables of a metadata document which variables are copied from.
+
+    The document is upgraded once, but each variable is only validated when
+    it is requested.
+    """
+
+    def __init__(self, variables: list[dict[str, Any]]) -> None:
+        """Initialize from the variables of an upgraded metadata document.
+
+        Args:
+            variables: The variables as they are serialized in the document.
+        """
+        self._variables = {v["short_name"]: v for v in variables if v.get("short_name")}
+
+    def __contains__(self, short_name: object) -> bool:
+        """Whether the document has a variable with the short name."""
+        return short_name in self._variables
+
+    @property
+    def short_names(self) -> list[str]:
+        """The short names of the variables in the document."""
+        return list(self._variables)
+
+    def variable(
+        self, short_name: str, /, **overrides: Any
+    ) -> all_optional_model.Variable:
+        """Validate a new variable from the document.
+
+        Args:
+            short_name: The short name of the variable in the document.
+            overrides: Fields which are set instead of those in the document.
+
+        Raises:
+            KeyError: If the document has no variable with the short name.
+        """
+        return all_optional_model.Variable.model_validate(
+            {**self._variables[short_name], **overrides}
+        )
+
+
+# Object metadata which changes whenever an object is rewritten, by
+# preference. GCS has the generation, other filesystems an etag or a time.
+GENERATION_KEYS = ("generation", "etag", "ETag", "mtime", "LastModified", "created")
+
+
+def object_generation(info: Mapping[str, Any]) -> str:
+    """A value which changes whenever the object is rewritten.
+
+    Args:
+        info: The details of the object, as listed by the filesystem.
+    """
+    for key in GENERATION_KEYS:
+        if info.get(key) is not None:
+            return str(info[key])
+    return str(info.get("size"))
+
+
+SOURCE_DOCUMENT_CACHE_MAXSIZE = 32
+SOURCE_DOCUMENT_CACHE_TTL_SECONDS = 10 * 60
+
+# Shared by all Datadoc instances in the process, keyed by the path and the
+# generation of the document, so a document changed by anyone is read again.
+source_document_cache: TtlLruCache[tuple[str, str], SourceDocument] = TtlLruCache(
+    maxsize=SOURCE_DOCUMENT_CACHE_MAXSIZE,
+    ttl=SOURCE_DOCUMENT_CACHE_TTL_SECONDS,
+)
+
+
+def read_source_document(metadata_document: ReadablePathLike) -> SourceDocument:
+    """Read a metadata document to copy variables from, through the cache.
+
+    The generation of the document is looked up on each call, and the
+    document is only read and upgraded again when it has changed.
+
+    Args:
+        metadata_document: Path to the metadata document.
+
+    Raises:
+        ValueError: If the metadata document does not exist.
+    """
+    metadata_path = UPath(metadata_document)
+    try:
+        info = metadata_path.fs.info(metadata_path.path)
+    except FileNotFoundError:
+        msg = f"Metadata document does not exist! Provided path: {metadata_path}"
+        raise ValueError(msg) from None
+
+    def load() -> SourceDocument:
+        upgraded_metadata = _read_upgraded_metadata_document(metadata_path)
+        return SourceDocument(upgraded_metadata["datadoc"]["variables"] or [])
+
+    return source_document_cache.get_or_load(
+        (str(metadata_path), f"{object_generation(info)}/{info.get('size')}"), load
+    )
+
+
 def build_metadata_document_path(
     dataset_path: ReadablePathLike,
 ) -> UPath:
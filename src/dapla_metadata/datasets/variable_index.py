@@ -0,0 +1,311 @@
+"""Find variables in a metadata document without scanning all of them."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from typing import TYPE_CHECKING
+from typing import Any
+
+import datadoc_model.all_optional.model as all_optional_model
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Hashable
+    from collections.abc import Iterable
+    from collections.abc import Iterator
+
+    from dapla_metadata.datasets.utility.utils import VariableType
+
+# Selects variables by a glob or regular expression matching the whole short
+# name, or by a predicate
+type VariableSelector = str | re.Pattern[str] | Callable[[VariableType], bool]
+
+# The fields which variables can be looked up by without a scan. All but
+# `pseudonymized` are fields of the variable, which is True when the variable
+# has a pseudonymization.
+INDEXED_FIELDS = (
+    "data_type",
+    "variable_role",
+    "definition_uri",
+    "classification_uri",
+    "pseudonymized",
+)
+
+
+# The attributes of a variable which its index entries are made from
+_INDEXED_ATTRIBUTES = (
+    "short_name",
+    "data_type",
+    "variable_role",
+    "definition_uri",
+    "classification_uri",
+    "pseudonymization",
+)
+
+
+def _indexed_values(variable: VariableType) -> tuple[object, ...]:
+    # Read from the instance dict, which is much faster than through pydantic
+    values = variable.__dict__
+    return tuple(values.get(attribute) for attribute in _INDEXED_ATTRIBUTES)
+
+
+def _index_keys(variable: VariableType) -> dict[str, Hashable]:
+    return {
+        "data_type": variable.data_type,
+        "variable_role": variable.variable_role,
+        "definition_uri": _as_key(variable.definition_uri),
+        "classification_uri": _as_key(variable.classification_uri),
+        "pseudonymized": variable.pseudonymization is not None,
+    }
+
+
+def _as_key(value: object) -> Hashable:
+    # URLs are compared by their text, whether given as strings or AnyUrl
+    return None if value is None else str(value)
+
+
+def is_missing(value: Any) -> bool:
+    """Whether a field value is missing, including multilanguage values without any text.
+
+    Examples:
+        >>> is_missing(None)
+        True
+        >>> is_missing([{"languageCode": "nb", "languageText": ""}])
+        True
+        >>> is_missing("kg")
+        False
+    """
+    if value is None:
+        return True
+    items = getattr(value, "root", value)
+    if isinstance(items, list):
+        return not any(
+            (item.get("languageText") if isinstance(item, dict) else item.languageText)
+            for item in items
+        )
+    return False
+
+
+class VariableIndex:
+    """Variables by short name, with secondary indexes on commonly queried fields.
+
+    Lookups first pick up changes made directly to the variables, such as
+    `variable.data_type = "FLOAT"`. The indexed values of each variable are
+    compared by identity with those it was indexed with, which is much
+    cheaper than indexing it again, and only changed variables are reindexed.
+
+    Examples:
+        >>> from datadoc_model.all_optional.model import Variable
+        >>> index = VariableIndex([
+        ...     Variable(short_name="a", data_type="STRING"),
+        ...     Variable(short_name="b", data_type="INTEGER"),
+        ... ])
+        >>> [v.short_name for v in index.find(data_type="INTEGER")]
+        ['b']
+    """
+
+    def __init__(self, variables: Iterable[VariableType] = ()) -> None:
+        """Index the variables. Variables without a short name are skipped.
+
+        Args:
+            variables: The variables, in document order.
+        """
+        self.by_short_name: dict[str, VariableType] = {}
+        self._positions: dict[str, int] = {}
+        self._keys: dict[str, dict[str, Hashable]] = {}
+        self._values: dict[str, tuple[object, ...]] = {}
+        self._secondary: dict[str, dict[Hashable, dict[str, None]]] = {
+            field: {} for field in INDEXED_FIELDS
+        }
+        for position, variable in enumerate(variables):
+            if variable.short_name:
+                self.by_short_name[variable.short_name] = variable
+                self._positions[variable.short_name] = position
+                self._add_keys(variable.short_name, variable)
+
+    def __len__(self) -> int:
+        """The number of indexed variables."""
+        return len(self.by_short_name)
+
+    def __contains__(self, short_name: object) -> bool:
+        """Whether a variable with the short name is indexed."""
+        return short_name in self.by_short_name
+
+    def __iter__(self) -> Iterator[str]:
+        """The short names of the indexed variables, in document order."""
+        return iter(self.by_short_name)
+
+    def position(self, short_name: str) -> int:
+        """The position of the variable in the document.
+
+        Raises:
+            KeyError: If no variable with the short name is indexed.
+        """
+        return self._positions[short_name]
+
+    def replace(self, short_name: str, variable: VariableType) -> None:
+        """Replace the variable with the short name, keeping its position.
+
+        Raises:
+            KeyError: If no variable with the short name is indexed.
+        """
+        self._remove_keys(short_name)
+        self.by_short_name[short_name] = variable
+        self._add_keys(short_name, variable)
+
+    def reindex(self, short_name: str) -> None:
+        """Update the secondary indexes after the variable has been changed.
+
+        Lookups do this for all changed variables, so this is only needed to
+        update the index right away.
+
+        Raises:
+            KeyError: If no variable with the short name is indexed.
+        """
+        self.replace(short_name, self.by_short_name[short_name])
+
+    def refresh(self) -> None:
+        """Update the index with changes made directly to the variables.
+
+        Variables which were given another short name keep their position,
+        and variables whose short name was removed are no longer indexed.
+        """
+        changed = [
+            short_name
+            for short_name, variable in self.by_short_name.items()
+            if any(
+                a is not b
+                for a, b in zip(
+                    _indexed_values(variable), self._values[short_name], strict=True
+                )
+            )
+        ]
+        if not changed:
+            return
+        for short_name in changed:
+            self._remove_keys(short_name)
+        renamed = {
+            short_name: self.by_short_name[short_name].short_name
+            for short_name in changed
+            if self.by_short_name[short_name].short_name != short_name
+        }
+        if renamed:
+            variables = [
+                (
+                    renamed.get(short_name, short_name),
+                    variable,
+                    self._positions[short_name],
+                )
+                for short_name, variable in self.by_short_name.items()
+            ]
+            # Changed in place, so views of the variables by short name stay valid
+            self.by_short_name.clear()
+            self._positions.clear()
+            for name, variable, position in variables:
+                if name:
+                    self.by_short_name[name] = variable
+                    self._positions[name] = position
+        for short_name in changed:
+            new_short_name = renamed.get(short_name, short_name)
+            if new_short_name:
+                self._add_keys(new_short_name, self.by_short_name[new_short_name])
+
+    def lookup(self, field: str, value: object) -> list[str]:
+        """The short names of the variables where the indexed field has the value.
+
+        Args:
+            field: One of `INDEXED_FIELDS`.
+            value: The value to look up. URLs are compared by their text.
+
+        Raises:
+            ValueError: If the field is not indexed.
+        """
+        if field not in self._secondary:
+            msg = f"'{field}' is not indexed, must be one of {INDEXED_FIELDS}"
+            raise ValueError(msg)
+        self.refresh()
+        if field in ("definition_uri", "classification_uri"):
+            value = _as_key(value)
+        return list(self._secondary[field].get(value, ()))  # type: ignore [arg-type]
+
+    def find(
+        self,
+        missing: str | Iterable[str] | None = None,
+        **criteria: object,
+    ) -> list[VariableType]:
+        """Find the variables which match all the criteria, in document order.
+
+        Args:
+            missing: Only variables where these fields are missing a value.
+                Any field of the variable can be given, but it is checked
+                for each candidate.
+            criteria: Values of `INDEXED_FIELDS` which the variables must
+                have.
+
+        Raises:
+            ValueError: If a criterion is not an indexed field, or a missing
+                field is not a field of variables.
+        """
+        fields = [missing] if isinstance(missing, str) else list(missing or ())
+        for field in fields:
+            if field not in all_optional_model.Variable.model_fields:
+                msg = f"'{field}' is not a field of variables"
+                raise ValueError(msg)
+        self.refresh()
+        candidates: set[str] | None = None
+        for field, value in criteria.items():
+            matches = self.lookup(field, value)
+            candidates = (
+                set(matches) if candidates is None else candidates.intersection(matches)
+            )
+        short_names = (
+            list(self.by_short_name)
+            if candidates is None
+            else sorted(candidates, key=self._positions.__getitem__)
+        )
+        variables = [self.by_short_name[s] for s in short_names]
+        if fields:
+            variables = [
+                v
+                for v in variables
+                if all(is_missing(getattr(v, field)) for field in fields)
+            ]
+        return variables
+
+    def select(self, selector: VariableSelector) -> list[str]:
+        """The short names of the variables the selector selects, in document order.
+
+        Args:
+            selector: A glob such as `fnr_*`, a compiled regular expression
+                which must match the whole short name, or a predicate which
+                is called with each variable.
+
+        Examples:
+            >>> from datadoc_model.all_optional.model import Variable
+            >>> index = VariableIndex([Variable(short_name=s) for s in ["fnr_mor", "fnr", "alder"]])
+            >>> index.select("fnr_*")
+            ['fnr_mor']
+            >>> index.select(re.compile(r"fnr(_.*)?"))
+            ['fnr_mor', 'fnr']
+        """
+        self.refresh()
+        if isinstance(selector, str):
+            return [s for s in self.by_short_name if fnmatch.fnmatchcase(s, selector)]
+        if isinstance(selector, re.Pattern):
+            return [s for s in self.by_short_name if selector.fullmatch(s)]
+        return [s for s, v in self.by_short_name.items() if selector(v)]
+
+    def _add_keys(self, short_name: str, variable: VariableType) -> None:
+        keys = self._keys[short_name] = _index_keys(variable)
+        self._values[short_name] = _indexed_values(variable)
+        for field, key in keys.items():
+            self._secondary[field].setdefault(key, {})[short_name] = None
+
+    def _remove_keys(self, short_name: str) -> None:
+        del self._values[short_name]
+        for field, key in self._keys.pop(short_name).items():
+            bucket = self._secondary[field][key]
+            del bucket[short_name]
+            if not bucket:
+                del self._secondary[field][key]
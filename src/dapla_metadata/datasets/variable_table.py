@@ -0,0 +1,252 @@
+"""Convert variable metadata to and from Arrow tables, for editing many variables at once.
+
+Each variable is a row. Multilanguage fields are split into one column per
+language, named like `name_nb`, and the pseudonymization is a struct. The
+tables can be converted to and from pandas or polars dataframes.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+from dataclasses import dataclass
+from dataclasses import field
+from enum import Enum
+from typing import TYPE_CHECKING
+from typing import Any
+
+import pyarrow as pa
+
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from dapla_metadata.datasets.utility.utils import VariableType
+
+LANGUAGES = tuple(language.value for language in SupportedLanguages)
+
+MULTILANGUAGE_FIELDS = (
+    "name",
+    "population_description",
+    "comment",
+    "invalid_value_description",
+)
+
+# Nested fields which are rarely edited in bulk are kept as JSON text
+JSON_FIELDS = ("special_value", "custom_type")
+
+PSEUDONYMIZATION_TYPE = pa.struct(
+    [
+        ("pseudonymization_time", pa.timestamp("us", tz="UTC")),
+        ("stable_identifier_type", pa.string()),
+        ("stable_identifier_version", pa.string()),
+        ("encryption_algorithm", pa.string()),
+        ("encryption_key_reference", pa.string()),
+        # JSON text, since the parameters differ between algorithms
+        ("encryption_algorithm_parameters", pa.string()),
+    ]
+)
+
+# The type of each variable field, in the order of the model
+_FIELD_TYPES: dict[str, pa.DataType] = {
+    "short_name": pa.string(),
+    "data_element_path": pa.string(),
+    "name": pa.string(),
+    "data_type": pa.string(),
+    "variable_role": pa.string(),
+    "definition_uri": pa.string(),
+    "is_personal_data": pa.bool_(),
+    "pseudonymization": PSEUDONYMIZATION_TYPE,
+    "unit_type": pa.string(),
+    "data_source": pa.string(),
+    "population_description": pa.string(),
+    "comment": pa.string(),
+    "temporality_type": pa.string(),
+    "measurement_unit": pa.string(),
+    "multiplication_factor": pa.int64(),
+    "format": pa.string(),
+    "classification_uri": pa.string(),
+    "special_value": pa.string(),
+    "invalid_value_description": pa.string(),
+    "custom_type": pa.string(),
+    "id": pa.string(),
+    "contains_data_from": pa.date32(),
+    "contains_data_until": pa.date32(),
+}
+
+
+def field_columns(field_name: str) -> list[str]:
+    """The columns of a variable field in a table of variables."""
+    if field_name in MULTILANGUAGE_FIELDS:
+        return [f"{field_name}_{language}" for language in LANGUAGES]
+    return [field_name]
+
+
+VARIABLES_SCHEMA = pa.schema(
+    [
+        (column, field_type)
+        for field_name, field_type in _FIELD_TYPES.items()
+        for column in field_columns(field_name)
+    ]
+)
+
+# The variable field of each column
+COLUMN_FIELDS = {
+    column: field_name
+    for field_name in _FIELD_TYPES
+    for column in field_columns(field_name)
+}
+
+
+@dataclass
+class VariableChanges:
+    """The changes made to variables by a bulk edit.
+
+    Attributes:
+        changed: The names of the changed fields, for each changed variable.
+        unchanged: The short names of the variables which were already as
+            requested.
+    """
+
+    changed: dict[str, list[str]] = field(default_factory=dict)
+    unchanged: list[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        """Whether any variable was changed."""
+        return bool(self.changed)
+
+
+def _language_texts(value: Any) -> dict[str, str | None]:
+    texts: dict[str, str | None] = dict.fromkeys(LANGUAGES)
+    for item in (value.root if value is not None else None) or []:
+        if item.languageCode in texts:
+            texts[item.languageCode] = item.languageText
+    return texts
+
+
+def _scalar(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if value is None or isinstance(value, bool | int | str | dt.date):
+        return value
+    # URLs and UUIDs
+    return str(value)
+
+
+def _pseudonymization_row(value: Any) -> dict[str, Any] | None:
+    if value is None:
+        return None
+    parameters = value.encryption_algorithm_parameters
+    return {
+        "pseudonymization_time": value.pseudonymization_time,
+        "stable_identifier_type": value.stable_identifier_type,
+        "stable_identifier_version": value.stable_identifier_version,
+        "encryption_algorithm": value.encryption_algorithm,
+        "encryption_key_reference": value.encryption_key_reference,
+        "encryption_algorithm_parameters": (
+            None if parameters is None else json.dumps(parameters)
+        ),
+    }
+
+
+def variable_row(variable: VariableType) -> dict[str, Any]:
+    """Flatten a variable into a row with the columns of `VARIABLES_SCHEMA`."""
+    row: dict[str, Any] = {}
+    for field_name in _FIELD_TYPES:
+        value = getattr(variable, field_name, None)
+        if field_name in MULTILANGUAGE_FIELDS:
+            for language, text in _language_texts(value).items():
+                row[f"{field_name}_{language}"] = text
+        elif field_name == "pseudonymization":
+            row[field_name] = _pseudonymization_row(value)
+        elif field_name in JSON_FIELDS:
+            row[field_name] = (
+                None
+                if value is None
+                else json.dumps(
+                    [v.model_dump(mode="json") for v in value]
+                    if isinstance(value, list)
+                    else value.model_dump(mode="json")
+                )
+            )
+        else:
+            row[field_name] = _scalar(value)
+    return row
+
+
+def variables_to_arrow(variables: Iterable[VariableType]) -> pa.Table:
+    """Flatten variables into a table with one row per variable.
+
+    Args:
+        variables: The variables, in the order of the rows.
+
+    Returns:
+        A table with the columns of `VARIABLES_SCHEMA`.
+    """
+    return pa.Table.from_pylist(
+        [variable_row(v) for v in variables], schema=VARIABLES_SCHEMA
+    )
+
+
+def row_to_fields(row: dict[str, Any]) -> dict[str, Any]:
+    """Convert the columns of a row back to the fields of a variable.
+
+    Args:
+        row: Values for some or all of the columns of `VARIABLES_SCHEMA`.
+            Multilanguage fields must have all their language columns.
+
+    Returns:
+        The fields of the row, in the form the variable model validates.
+    """
+    fields: dict[str, Any] = {}
+    for column, value in row.items():
+        field_name = COLUMN_FIELDS[column]
+        if field_name in MULTILANGUAGE_FIELDS:
+            if field_name not in fields:
+                items = [
+                    {"languageCode": language, "languageText": text}
+                    for language in LANGUAGES
+                    if (text := row[f"{field_name}_{language}"]) is not None
+                ]
+                fields[field_name] = items or None
+        elif field_name == "pseudonymization" and value is not None:
+            parameters = value["encryption_algorithm_parameters"]
+            fields[field_name] = {
+                **value,
+                "encryption_algorithm_parameters": (
+                    None if parameters is None else json.loads(parameters)
+                ),
+            }
+        elif field_name in JSON_FIELDS and value is not None:
+            fields[field_name] = json.loads(value)
+        else:
+            fields[field_name] = value
+    return fields
+
+
+def conform_table(table: pa.Table) -> pa.Table:
+    """Check the columns of a table of variables and cast them to the schema.
+
+    Tables converted from dataframes may have other, compatible types, such
+    as large strings.
+
+    Returns:
+        The table with its columns in the order of `VARIABLES_SCHEMA`.
+
+    Raises:
+        ValueError: If the table has columns which are not in `VARIABLES_SCHEMA`,
+            or a column can't be cast to its type.
+    """
+    unknown = [c for c in table.column_names if c not in COLUMN_FIELDS]
+    if unknown:
+        msg = f"Unknown variable columns: {unknown}"
+        raise ValueError(msg)
+    columns = [c for c in VARIABLES_SCHEMA.names if c in table.column_names]
+    try:
+        return table.select(columns).cast(
+            pa.schema([VARIABLES_SCHEMA.field(c) for c in columns])
+        )
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+        msg = f"The variable columns don't match the types in VARIABLES_SCHEMA: {e}"
+        raise ValueError(msg) from e
@@ -0,0 +1,297 @@
+"""Count and time calls to external systems.
+
+The package records how many reads, HTTP calls and fetches it makes, and how
+long they take, in a process-wide registry:
+
+    >>> from dapla_metadata import metrics
+    >>> metrics.reset()
+    >>> metrics.counter("example_total", "Example.").inc(source="a")
+    >>> metrics.snapshot()["example_total"][(("source", "a"),)]
+    1.0
+
+Use `snapshot` to inspect the values, `reset` to start from zero, for example
+at the start of a session, and `to_prometheus_text` to export them in the
+Prometheus text format.
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from collections.abc import Sequence
+
+type Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+def _labels(labels: dict[str, object]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    """A value which only increases, such as a number of calls."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str) -> None:
+        """Initialize the counter at zero.
+
+        Args:
+            name: The name of the metric.
+            description: What the metric counts.
+        """
+        self.name = name
+        self.description = description
+        self._values: dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels: object) -> None:
+        """Increase the counter for the given labels."""
+        key = _labels(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def values(self) -> dict[Labels, float]:
+        """The current value for each combination of labels."""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self) -> None:
+        """Set the counter to zero."""
+        with self._lock:
+            self._values.clear()
+
+
+class HistogramValue:
+    """The observations of a histogram for one combination of labels.
+
+    Attributes:
+        bucket_counts: The number of observations less than or equal to each
+            bucket bound, not cumulative.
+        count: The number of observations.
+        sum: The sum of the observations.
+    """
+
+    def __init__(self, num_buckets: int) -> None:
+        """Initialize without observations."""
+        self.bucket_counts = [0] * (num_buckets + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def copy(self) -> HistogramValue:
+        """Copy the observations."""
+        value = HistogramValue(len(self.bucket_counts) - 1)
+        value.bucket_counts = list(self.bucket_counts)
+        value.count = self.count
+        value.sum = self.sum
+        return value
+
+
+class Histogram:
+    """The distribution of observed values, such as latencies in seconds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        """Initialize the histogram without observations.
+
+        Args:
+            name: The name of the metric.
+            description: What the metric observes.
+            buckets: The upper bounds of the buckets, in increasing order.
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._values: dict[Labels, HistogramValue] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record an observation for the given labels."""
+        key = _labels(labels)
+        bucket = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            histogram_value = self._values.get(key)
+            if histogram_value is None:
+                histogram_value = self._values[key] = HistogramValue(len(self.buckets))
+            histogram_value.bucket_counts[bucket] += 1
+            histogram_value.count += 1
+            histogram_value.sum += value
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the seconds spent in the `with` block, also if it fails."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def values(self) -> dict[Labels, HistogramValue]:
+        """The observations for each combination of labels."""
+        with self._lock:
+            return {k: v.copy() for k, v in self._values.items()}
+
+    def reset(self) -> None:
+        """Remove all observations."""
+        with self._lock:
+            self._values.clear()
+
+
+class MetricsRegistry:
+    """Holds the metrics of the process by name."""
+
+    def __init__(self) -> None:
+        """Initialize the registry without metrics."""
+        self._metrics: dict[str, Counter | Histogram] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        """Get the counter with the name, creating it if necessary.
+
+        Raises:
+            TypeError: If a metric of another kind has the name.
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Counter(name, description)
+        return self._check_kind(metric, Counter)
+
+    def histogram(
+        self,
+        name: str,
+        description: str = "",
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get the histogram with the name, creating it if necessary.
+
+        Raises:
+            TypeError: If a metric of another kind has the name.
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, description, buckets)
+        return self._check_kind(metric, Histogram)
+
+    @staticmethod
+    def _check_kind[M: (Counter, Histogram)](
+        metric: Counter | Histogram, cls: type[M]
+    ) -> M:
+        if not isinstance(metric, cls):
+            msg = f"The metric {metric.name} is a {metric.kind}, not a {cls.kind}"
+            raise TypeError(msg)
+        return metric
+
+    def snapshot(self) -> dict[str, dict[Labels, float] | dict[Labels, HistogramValue]]:
+        """Copy the current values of all metrics, by name and labels."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {metric.name: metric.values() for metric in metrics}
+
+    def reset(self) -> None:
+        """Set all metrics to zero, keeping their definitions."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            metric.reset()
+
+    def to_prometheus_text(self) -> str:
+        """Format all metrics in the Prometheus text exposition format."""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines: list[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            if isinstance(metric, Counter):
+                lines.extend(
+                    f"{metric.name}{_format_labels(labels)} {value}"
+                    for labels, value in sorted(metric.values().items())
+                )
+                continue
+            for labels, value in sorted(
+                metric.values().items(), key=lambda item: item[0]
+            ):
+                cumulative = 0
+                for bound, count in zip(
+                    (*metric.buckets, "+Inf"), value.bucket_counts, strict=True
+                ):
+                    cumulative += count
+                    bucket_labels = (*labels, ("le", str(bound)))
+                    lines.append(
+                        f"{metric.name}_bucket{_format_labels(bucket_labels)} {cumulative}"
+                    )
+                lines.append(f"{metric.name}_sum{_format_labels(labels)} {value.sum}")
+                lines.append(
+                    f"{metric.name}_count{_format_labels(labels)} {value.count}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+REGISTRY = MetricsRegistry()
+
+
+def counter(name: str, description: str = "") -> Counter:
+    """Get a counter from the process-wide registry."""
+    return REGISTRY.counter(name, description)
+
+
+def histogram(
+    name: str,
+    description: str = "",
+    buckets: Sequence[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    """Get a histogram from the process-wide registry."""
+    return REGISTRY.histogram(name, description, buckets)
+
+
+def snapshot() -> dict[str, dict[Labels, float] | dict[Labels, HistogramValue]]:
+    """Copy the current values of all metrics in the process-wide registry."""
+    return REGISTRY.snapshot()
+
+
+def reset() -> None:
+    """Set all metrics in the process-wide registry to zero."""
+    REGISTRY.reset()
+
+
+def to_prometheus_text() -> str:
+    """Format the process-wide metrics in the Prometheus text exposition format."""
+    return REGISTRY.to_prometheus_text()
@@ -1,4 +1,6 @@
 """Expose information specific to validating ssb standards."""
 
 from .standard_validators import check_naming_standard
+from .standard_validators import generate_streaming_validation_report
 from .standard_validators import generate_validation_report
+from .standard_validators import iter_naming_standard
@@ -1,8 +1,16 @@
 import asyncio
+import json
 import logging
 import re
+from array import array
+from collections import Counter
 from collections.abc import AsyncGenerator
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
 
+import pyarrow as pa
+from pyarrow import parquet as pq
 from upath import UPath
 from upath.types import ReadablePathLike
 
@@ -19,9 +27,13 @@ from dapla_metadata.standards.utils.constants import MISSING_PERIOD
 from dapla_metadata.standards.utils.constants import MISSING_SHORT_NAME
 from dapla_metadata.standards.utils.constants import NAME_STANDARD_SUCCESS
 from dapla_metadata.standards.utils.constants import NAME_STANDARD_VIOLATION
+from dapla_metadata.standards.utils.constants import PARTITIONED_DATASET
 from dapla_metadata.standards.utils.constants import PATH_IGNORED
 from dapla_metadata.standards.utils.constants import SHORT_NAME_OTHER_THAN_DASHES
 from dapla_metadata.standards.utils.constants import SSB_NAMING_STANDARD_REPORT
+from dapla_metadata.standards.utils.constants import (
+    SSB_NAMING_STANDARD_REPORT_DIRECTORIES,
+)
 from dapla_metadata.standards.utils.constants import SSB_NAMING_STANDARD_REPORT_FILES
 from dapla_metadata.standards.utils.constants import (
     SSB_NAMING_STANDARD_REPORT_RESULT_AVERAGE,
@@ -56,10 +68,19 @@ class ValidationResult:
         self,
         success: bool,
         file_path: str,
+        partition_count: int | None = None,
     ) -> None:
-        """Initialize the validatation result."""
+        """Initialize the validatation result.
+
+        Args:
+            success: Whether the path follows the naming standard.
+            file_path: The validated path.
+            partition_count: The number of partitions, when the path is the root
+                of a partitioned dataset.
+        """
         self.success = success
         self.file_path = file_path
+        self.partition_count = partition_count
         self.messages: list[str] = []
         self.violations: list[str] = []
 
@@ -77,13 +98,14 @@ class ValidationResult:
 
     def __repr__(self) -> str:
         """Representation for debugging."""
-        return f"ValidationResult(success={self.success}, file_path={self.file_path}, messages={self.messages}, violations={self.violations})"
+        return f"ValidationResult(success={self.success}, file_path={self.file_path}, partition_count={self.partition_count}, messages={self.messages}, violations={self.violations})"
 
     def to_dict(self) -> dict:
         """Return result as a dictionary."""
         return {
             "success": self.success,
             "file_path": self.file_path,
+            "partition_count": self.partition_count,
             "messages": self.messages,
             "violations": self.violations,
         }
@@ -141,6 +163,278 @@ class NamingStandardReport:
         return SSB_NAMING_STANDARD_REPORT_RESULT_NO_SCORE
 
 
+@dataclass(slots=True)
+class DirectorySummary:
+    """Aggregated validation counts for one directory prefix."""
+
+    num_files_validated: int = 0
+    num_success: int = 0
+    num_failures: int = 0
+    violation_counts: Counter[str] = field(default_factory=Counter)
+
+    def success_rate(self) -> float | None:
+        """Calculate the success rate for the directory as a percentage."""
+        if self.num_files_validated == 0:
+            return None
+        return self.num_success / self.num_files_validated * 100
+
+    def to_dict(self) -> dict:
+        """Return the summary as a dictionary."""
+        return {
+            "num_files_validated": self.num_files_validated,
+            "num_success": self.num_success,
+            "num_failures": self.num_failures,
+            "violation_counts": dict(self.violation_counts),
+        }
+
+
+class StreamingNamingStandardReport(NamingStandardReport):
+    """Report object which aggregates name standard validation results incrementally.
+
+    In contrast to `NamingStandardReport`, the `ValidationResult` objects are not
+    kept. Each result is reduced to a row in a compact columnar store where
+    messages, violations and directory prefixes are interned to integer codes.
+    Counters are maintained per violation type and per directory prefix so that
+    large audits can be summarised and drilled down without holding every result
+    object in memory. `validation_results` is therefore always empty, use
+    `iter_results` to reconstruct the stored results.
+
+    Attributes:
+        root: The path validation was started from. Directory prefixes are
+            calculated relative to this.
+        directory_depth: The number of directory levels below `root` which make up
+            a directory prefix.
+        violation_counts: The number of files with each violation.
+        directories: Aggregated counts per directory prefix.
+    """
+
+    def __init__(
+        self,
+        root: ReadablePathLike | None = None,
+        directory_depth: int = 1,
+    ) -> None:
+        """Initialize an empty report.
+
+        Args:
+            root: The path validation was started from. If not supplied, the full
+                parent directory of each file is used as its prefix.
+            directory_depth: The number of directory levels below `root` to
+                aggregate on.
+        """
+        super().__init__(validation_results=[])
+        self.root = str(UPath(root)).rstrip("/") if root else None
+        self.directory_depth = directory_depth
+        self.violation_counts: Counter[str] = Counter()
+        self.directories: dict[str, DirectorySummary] = {}
+
+        self._texts: list[str] = []
+        self._text_codes: dict[str, int] = {}
+        self._directory_names: list[str] = []
+        self._directory_codes: dict[str, int] = {}
+
+        self._file_paths: list[str] = []
+        self._success = array("B")
+        self._directory_ids = array("I")
+        # -1 is used to represent a missing partition count
+        self._partition_counts = array("q")
+        self._message_codes = array("I")
+        self._message_offsets = array("Q", [0])
+        self._violation_codes = array("I")
+        self._violation_offsets = array("Q", [0])
+
+    def _intern_text(self, text: str) -> int:
+        if (code := self._text_codes.get(text)) is None:
+            code = len(self._texts)
+            self._texts.append(text)
+            self._text_codes[text] = code
+        return code
+
+    def _intern_directory(self, directory: str) -> int:
+        if (code := self._directory_codes.get(directory)) is None:
+            code = len(self._directory_names)
+            self._directory_names.append(directory)
+            self._directory_codes[directory] = code
+            self.directories[directory] = DirectorySummary()
+        return code
+
+    def directory_prefix(self, file_path: str) -> str:
+        """Get the directory prefix a file is aggregated under.
+
+        Examples:
+            >>> StreamingNamingStandardReport("gs://bucket").directory_prefix("gs://bucket/stat/inndata/a_p2021_v1.parquet")
+            'stat'
+
+            >>> StreamingNamingStandardReport("gs://bucket", 2).directory_prefix("gs://bucket/stat/inndata/a_p2021_v1.parquet")
+            'stat/inndata'
+
+            >>> StreamingNamingStandardReport("gs://bucket").directory_prefix("gs://bucket/a_p2021_v1.parquet")
+            '.'
+        """
+        if self.root is None:
+            return file_path.rpartition("/")[0] or "."
+        relative = file_path.removeprefix(self.root).strip("/")
+        directories = relative.split("/")[:-1]
+        return "/".join(directories[: self.directory_depth]) or "."
+
+    def add(self, result: ValidationResult) -> None:
+        """Add a validation result to the report.
+
+        Args:
+            result: The result to aggregate. No reference to it is kept.
+        """
+        directory = self.directory_prefix(result.file_path)
+        directory_id = self._intern_directory(directory)
+        summary = self.directories[directory]
+
+        self.num_files_validated += 1
+        summary.num_files_validated += 1
+        if result.success:
+            self.num_success += 1
+            summary.num_success += 1
+        else:
+            self.num_failures += 1
+            summary.num_failures += 1
+        self.violation_counts.update(result.violations)
+        summary.violation_counts.update(result.violations)
+
+        self._file_paths.append(result.file_path)
+        self._success.append(result.success)
+        self._directory_ids.append(directory_id)
+        self._partition_counts.append(
+            -1 if result.partition_count is None else result.partition_count
+        )
+        self._message_codes.extend(self._intern_text(m) for m in result.messages)
+        self._message_offsets.append(len(self._message_codes))
+        self._violation_codes.extend(self._intern_text(v) for v in result.violations)
+        self._violation_offsets.append(len(self._violation_codes))
+
+    def extend(
+        self, results: Iterator[ValidationResult] | list[ValidationResult]
+    ) -> None:
+        """Add several validation results to the report."""
+        for result in results:
+            self.add(result)
+
+    def _texts_for_row(self, codes: array, offsets: array, row: int) -> list[str]:
+        return [self._texts[c] for c in codes[offsets[row] : offsets[row + 1]]]
+
+    def iter_rows(self) -> Iterator[dict]:
+        """Iterate over the stored results as dictionaries.
+
+        Each dictionary has the same keys as `ValidationResult.to_dict` with the
+        addition of the directory prefix.
+        """
+        for row, file_path in enumerate(self._file_paths):
+            yield {
+                "success": bool(self._success[row]),
+                "file_path": file_path,
+                "directory": self._directory_names[self._directory_ids[row]],
+                "partition_count": (
+                    None
+                    if self._partition_counts[row] < 0
+                    else self._partition_counts[row]
+                ),
+                "messages": self._texts_for_row(
+                    self._message_codes, self._message_offsets, row
+                ),
+                "violations": self._texts_for_row(
+                    self._violation_codes, self._violation_offsets, row
+                ),
+            }
+
+    def iter_results(self) -> Iterator[ValidationResult]:
+        """Iterate over the stored results, reconstructed as `ValidationResult` objects."""
+        for row in self.iter_rows():
+            result = ValidationResult(
+                success=row["success"],
+                file_path=row["file_path"],
+                partition_count=row["partition_count"],
+            )
+            result.messages = row["messages"]
+            result.violations = row["violations"]
+            yield result
+
+    def to_arrow(self) -> pa.Table:
+        """Return the stored results as an Arrow table.
+
+        Directory prefixes, messages and violations are dictionary encoded.
+        """
+        texts = pa.array(self._texts, type=pa.string())
+        return pa.table(
+            {
+                "file_path": pa.array(self._file_paths, type=pa.string()),
+                "directory": pa.DictionaryArray.from_arrays(
+                    pa.array(self._directory_ids, type=pa.uint32()),
+                    pa.array(self._directory_names, type=pa.string()),
+                ),
+                "success": pa.array([bool(s) for s in self._success], type=pa.bool_()),
+                "partition_count": pa.array(
+                    self._partition_counts,
+                    type=pa.int64(),
+                    mask=pa.array([c < 0 for c in self._partition_counts], pa.bool_()),
+                ),
+                "messages": pa.ListArray.from_arrays(
+                    pa.array(self._message_offsets, type=pa.int32()),
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(self._message_codes, type=pa.uint32()), texts
+                    ),
+                ),
+                "violations": pa.ListArray.from_arrays(
+                    pa.array(self._violation_offsets, type=pa.int32()),
+                    pa.DictionaryArray.from_arrays(
+                        pa.array(self._violation_codes, type=pa.uint32()), texts
+                    ),
+                ),
+            },
+        )
+
+    def to_parquet(self, path: ReadablePathLike) -> None:
+        """Write the stored results to a Parquet file.
+
+        Args:
+            path: The local or cloud path to write to.
+        """
+        with UPath(path).open(mode="wb") as f:
+            pq.write_table(self.to_arrow(), f)
+
+    def to_jsonl(self, path: ReadablePathLike) -> None:
+        """Write the stored results to a JSON Lines file, one result per line.
+
+        Args:
+            path: The local or cloud path to write to.
+        """
+        with UPath(path).open(mode="w", encoding="utf-8") as f:
+            for row in self.iter_rows():
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def summary(self) -> dict:
+        """Return the aggregated counts for the report and each directory prefix."""
+        return {
+            "num_files_validated": self.num_files_validated,
+            "num_success": self.num_success,
+            "num_failures": self.num_failures,
+            "violation_counts": dict(self.violation_counts),
+            "directories": {
+                name: summary.to_dict() for name, summary in self.directories.items()
+            },
+        }
+
+    def generate_directory_report(self) -> str:
+        """Format the per directory results as a string."""
+        lines = [
+            f"{SSB_NAMING_STANDARD_REPORT_DIRECTORIES}",
+            "=============================",
+        ]
+        for name in sorted(self.directories):
+            summary = self.directories[name]
+            rate = summary.success_rate()
+            lines.append(
+                f"{name}: {summary.num_success}/{summary.num_files_validated}"
+                + (f" ({rate:.2f}%)" if rate is not None else "")
+            )
+        return "\n".join(lines) + "\n"
+
+
 def _has_invalid_symbols(path: ReadablePathLike) -> bool:
     """Return True if string contains illegal symbols.
 
@@ -160,8 +454,8 @@ def _has_invalid_symbols(path: ReadablePathLike) -> bool:
         >>> _has_invalid_symbols("ssb-dapla-example-data-produkt-prod/ledstill/inndata/skjema_p2018_p202_v1/aar=2018/data.parquet")
         False
     """
-    # TODO @mmwinther: The = symbol is allowed to avoid failures on subdirectories of partioned parquet datasets.
-    # DPMETA-824
+    # The = symbol is allowed so that paths pointing directly into a partitioned parquet dataset may be validated.
+    # When walking a directory, partitioned datasets are validated as one unit and their partitions are not descended into.
     return bool(re.search(r"[^a-zA-Z0-9\./:_\-=]", str(path).strip()))
 
 
@@ -227,9 +521,14 @@ async def _validate_file(
             FILE_DOES_NOT_EXIST,
         )
 
+    await _add_violations(result, file)
+    return result
+
+
+async def _add_violations(result: ValidationResult, path: UPath) -> None:
     result.violations = await asyncio.get_running_loop().run_in_executor(
         None,
-        lambda: _check_violations(file),
+        lambda: _check_violations(path),
     )
 
     if result.violations:
@@ -240,6 +539,28 @@ async def _validate_file(
         result.add_message(
             NAME_STANDARD_SUCCESS,
         )
+
+
+async def _validate_partitioned_dataset(
+    dataset: UPath,
+    partition_count: int,
+) -> ValidationResult:
+    """Check a partitioned dataset for naming standard violations.
+
+    The dataset directory is validated once as a whole, the partitions within
+    it are not validated individually.
+
+    Returns:
+        A ValidationResult object containing messages and violations
+    """
+    logger.info("Validating partitioned dataset: %s", dataset)
+    result = ValidationResult(
+        success=True,
+        file_path=str(dataset),
+        partition_count=partition_count,
+    )
+    await _add_violations(result, dataset)
+    result.add_message(PARTITIONED_DATASET)
     return result
 
 
@@ -255,10 +576,50 @@ async def _ignored_file_type_result(file: UPath) -> ValidationResult:
     return r
 
 
+def _is_partition_name(name: str) -> bool:
+    """Return True if the name is a hive style partition directory name.
+
+    Examples:
+        >>> _is_partition_name("aar=2018")
+        True
+
+        >>> _is_partition_name("person_data_p2021_v1")
+        False
+
+        >>> _is_partition_name("=2018")
+        False
+    """
+    key, separator, _ = name.partition("=")
+    return bool(key and separator)
+
+
+def _is_hidden_name(name: str) -> bool:
+    """Return True if the name is skipped by readers of partitioned datasets.
+
+    Files such as `_SUCCESS` and `.crc` files are written next to the
+    partitions, and are ignored when reading the dataset.
+
+    Examples:
+        >>> _is_hidden_name("_SUCCESS")
+        True
+
+        >>> _is_hidden_name("aar=2018")
+        False
+    """
+    return name.startswith(("_", "."))
+
+
 async def validate_directory(
     path: ReadablePathLike,
 ) -> AsyncGenerator[AsyncGenerator | asyncio.Task]:
-    """Validate a file or recursively validate all files in a directory."""
+    """Validate a file or recursively validate all files in a directory.
+
+    Directories where all children are hive style partitions (e.g. `aar=2018`),
+    apart from hidden files such as `_SUCCESS`, are treated as the root of a
+    partitioned dataset. The dataset is validated once and the partitions are
+    not descended into. Directories with other children are validated as
+    usual.
+    """
     path = UPath(path)
     if set(path.parts).intersection(IGNORED_FOLDERS):
         logger.info("File path ignored: %s", path)
@@ -266,10 +627,20 @@ async def validate_directory(
     elif path.suffix:
         yield asyncio.create_task(_validate_file(path, check_file_exists=True))
     else:
-        for obj in await asyncio.get_running_loop().run_in_executor(
+        children = await asyncio.get_running_loop().run_in_executor(
             None,
-            lambda: path.glob("*"),
-        ):
+            lambda: list(path.glob("*")),
+        )
+        partitions = [obj for obj in children if not _is_hidden_name(obj.name)]
+        partition_count = len(partitions)
+        if partitions and all(_is_partition_name(obj.name) for obj in partitions):
+            logger.debug("Found partitioned dataset: %s", path)
+            yield asyncio.create_task(
+                _validate_partitioned_dataset(path, partition_count),
+                name=path.name,
+            )
+            return
+        for obj in children:
             if obj.suffix:
                 yield asyncio.create_task(_validate_file(obj), name=obj.name)
             else:
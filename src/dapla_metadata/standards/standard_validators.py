@@ -5,6 +5,7 @@ import time
 from collections.abc import AsyncGenerator
 
 from dapla_metadata.standards.name_validator import NamingStandardReport
+from dapla_metadata.standards.name_validator import StreamingNamingStandardReport
 from dapla_metadata.standards.name_validator import ValidationResult
 from dapla_metadata.standards.name_validator import validate_directory
 
@@ -39,8 +40,24 @@ async def check_naming_standard(
         >>> (await check_naming_standard("/buckets/produkt/datadoc/utdata/person-data_p2021_v2.parquet"))[0].success
         True
     """
-    results = []
+    return [result async for result in iter_naming_standard(file_path)]
 
+
+async def iter_naming_standard(
+    file_path: str | os.PathLike[str],
+) -> AsyncGenerator[ValidationResult]:
+    """Validate a path against the SSB naming standard, yielding results as they complete.
+
+    This is the streaming counterpart of `check_naming_standard`. Results are
+    yielded as soon as each file has been validated, so that callers may
+    aggregate them without holding them all in memory.
+
+    Args:
+        file_path: The path to a bucket, directory, or specific file to validate.
+
+    Yields:
+        The validation result for each file.
+    """
     # Begin validation.
     # For each file this returns a task which we can wait on to complete.
     # For each directory this returns another AsyncGenerator which must be unpacked below
@@ -64,10 +81,9 @@ async def check_naming_standard(
                 if item.done():
                     logger.info("Validated %s", item.get_name())
                     tasks.remove(item)
-                    results.append(item.result())
+                    yield item.result()
 
         logger.debug("Tasks: %s %s", len(tasks), tasks)
-        logger.debug("Results: %s", len(results))
 
         if len(tasks) == 0:
             logger.info("Completed validation")
@@ -76,8 +92,6 @@ async def check_naming_standard(
         # Allow time for other processing to be performed
         await asyncio.sleep(0.001)
 
-    return results
-
 
 async def flatten_generator(gen: AsyncGenerator) -> AsyncGenerator[asyncio.Task, None]:
     """Recursively flatten nested async generators."""
@@ -108,3 +122,31 @@ def generate_validation_report(
     report = NamingStandardReport(validation_results=validation_results)
     print(report.generate_report())  # noqa: T201
     return report
+
+
+async def generate_streaming_validation_report(
+    file_path: str | os.PathLike[str],
+    directory_depth: int = 1,
+) -> StreamingNamingStandardReport:
+    """Validate a path and print a report, aggregating results as they are produced.
+
+    Suitable for large audits, since the individual `ValidationResult` objects are
+    not kept in memory. Results are aggregated per directory prefix, which allows
+    drilling down to e.g. each team folder in a bucket.
+
+    Args:
+        file_path: The path to a bucket, directory, or specific file to validate.
+        directory_depth: The number of directory levels below `file_path` to
+            aggregate results on.
+
+    Returns:
+        StreamingNamingStandardReport: The aggregated report. It may be exported
+        with `to_jsonl` or `to_parquet`.
+    """
+    report = StreamingNamingStandardReport(
+        root=file_path, directory_depth=directory_depth
+    )
+    async for result in iter_naming_standard(file_path):
+        report.add(result)
+    print(report.generate_report())  # noqa: T201
+    return report
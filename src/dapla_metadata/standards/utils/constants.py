@@ -21,6 +21,8 @@ SHORT_NAME_OTHER_THAN_DASHES = "Datasett kortnavn inneholder ulovlige tegn ref:
 PATH_IGNORED = "Ignorert, mappen er ikke underlagt krav til navnestandard."
 FILE_IGNORED = f"Ignorert, kun datasett med {', '.join(SUPPORTED_DATASET_FILE_SUFFIXES.keys())} filendelser valideres foreløpig."
 
+PARTITIONED_DATASET = "Partisjonert datasett, validert som ett datasett."
+
 FILE_DOES_NOT_EXIST = "Filen eksisterer ikke. Validerer uansett."
 
 BUCKET_NAME_UNKNOWN = "Kan ikke validere bøttenavn"
@@ -39,6 +41,7 @@ SSB_NAMING_STANDARD_REPORT_RESULT_NO_SCORE = "👀 Ingen filer ble validert\n"
 SSB_NAMING_STANDARD_REPORT_FILES = "Antall filer validert"
 SSB_NAMING_STANDARD_REPORT_SUCCESS = "Antall filer som følger SSB navnestandard"
 SSB_NAMING_STANDARD_REPORT_VIOLATIONS = "Antall filer som bryter SSB navnestandard"
+SSB_NAMING_STANDARD_REPORT_DIRECTORIES = "Resultat per mappe"
 
 IGNORED_FOLDERS = [
     "temp",
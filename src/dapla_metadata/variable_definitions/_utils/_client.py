@@ -1,3 +1,6 @@
+from typing import Any
+
+from dapla_metadata import metrics
 from dapla_metadata._shared.utils import get_user_agent
 from dapla_metadata.variable_definitions._generated.vardef_client.api_client import (
     ApiClient,
@@ -5,11 +8,45 @@ from dapla_metadata.variable_definitions._generated.vardef_client.api_client imp
 from dapla_metadata.variable_definitions._generated.vardef_client.configuration import (
     Configuration,
 )
+from dapla_metadata.variable_definitions._generated.vardef_client.rest import (
+    RESTClientObject,
+)
+from dapla_metadata.variable_definitions._generated.vardef_client.rest import (
+    RESTResponse,
+)
 from dapla_metadata.variable_definitions._utils.config import (
     get_vardef_client_configuration,
 )
 from dapla_metadata.variable_definitions._utils.config import refresh_access_token
 
+VARDEF_REQUESTS = metrics.counter(
+    "dapla_metadata_vardef_requests_total",
+    "HTTP requests to the Vardef API, by method and status.",
+)
+VARDEF_REQUEST_SECONDS = metrics.histogram(
+    "dapla_metadata_vardef_request_seconds",
+    "Seconds spent on HTTP requests to the Vardef API, by method.",
+)
+TOKEN_REFRESHES = metrics.counter(
+    "dapla_metadata_token_refreshes_total",
+    "Access tokens fetched, by audience.",
+)
+
+
+class InstrumentedRESTClientObject(RESTClientObject):
+    """Records metrics for the HTTP requests made by the generated client."""
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> RESTResponse:
+        """Perform the request, counting and timing it."""
+        status: str | int = "error"
+        with VARDEF_REQUEST_SECONDS.time(method=method.upper()):
+            try:
+                response = super().request(method, url, *args, **kwargs)
+                status = response.status
+                return response
+            finally:
+                VARDEF_REQUESTS.inc(method=method.upper(), status=status)
+
 
 class VardefClient:
     """Configure an ApiClient object and make it availabe to client code."""
@@ -41,6 +78,8 @@ class VardefClient:
             if not cls._config:
                 cls._config = get_vardef_client_configuration()
             cls._client = ApiClient(cls._config)
+            cls._client.rest_client = InstrumentedRESTClientObject(cls._config)
             cls._client.user_agent = get_user_agent()
+        TOKEN_REFRESHES.inc(audience="vardef")
         cls._client.configuration.access_token = refresh_access_token()
         return cls._client
@@ -5,6 +5,14 @@ import jwt
 import pytest
 from faker import Faker  # type: ignore [import-not-found]
 
+from dapla_metadata._shared import config
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Take a new configuration snapshot in each test, after its environment is set up."""
+    monkeypatch.setattr(config, "_snapshot", None)
+
 
 @pytest.fixture
 def raw_jwt_payload(faker: Faker) -> dict[str, t.Any]:
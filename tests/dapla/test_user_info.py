@@ -1,11 +1,15 @@
+import jwt
 import pytest
 
+from dapla_metadata._shared import config
 from dapla_metadata._shared.config import DAPLA_GROUP_CONTEXT
 from dapla_metadata._shared.config import DAPLA_REGION
 from dapla_metadata._shared.config import OIDC_TOKEN
 from dapla_metadata._shared.enums import DaplaRegion
 from dapla_metadata.dapla import user_info
+from dapla_metadata.dapla.user_info import CachedUserInfoProvider
 from dapla_metadata.dapla.user_info import DaplaLabUserInfo
+from dapla_metadata.dapla.user_info import TestUserInfo
 from dapla_metadata.dapla.user_info import UnknownUserInfo
 from dapla_metadata.dapla.user_info import UserInfo
 
@@ -106,3 +110,51 @@ def test_get_owner_errors_dapla_lab(
         match="DAPLA_GROUP_CONTEXT environment variable not found",
     ):
         user_info.get_user_info_for_current_platform().current_team  # noqa: B018
+
+
+def test_dapla_lab_user_info_decodes_each_token_once(
+    fake_jwt: str,
+    raw_jwt_payload: dict[str, object],
+    monkeypatch: pytest.MonkeyPatch,
+    mocker,
+):
+    user_info._decode_jwt.cache_clear()  # noqa: SLF001
+    decode = mocker.spy(user_info.jwt, "decode")
+    monkeypatch.setenv(DAPLA_REGION, DaplaRegion.DAPLA_LAB)
+    monkeypatch.setenv(OIDC_TOKEN, fake_jwt)
+    for _ in range(3):
+        assert (
+            user_info.get_user_info_for_current_platform().short_email
+            == raw_jwt_payload["email"]
+        )
+    assert decode.call_count == 1
+
+    other_jwt = jwt.encode({"email": "other@ssb.no"}, "test secret", algorithm="HS256")
+    monkeypatch.setenv(OIDC_TOKEN, other_jwt)
+    config.reload_config()
+    assert user_info.get_user_info_for_current_platform().short_email == "other@ssb.no"
+    assert decode.call_count == 2
+
+
+def test_cached_user_info_provider_follows_region(monkeypatch: pytest.MonkeyPatch):
+    provider = CachedUserInfoProvider()
+    monkeypatch.setenv(DAPLA_REGION, DaplaRegion.DAPLA_LAB)
+    first = provider()
+    assert isinstance(first, DaplaLabUserInfo)
+    assert provider() is first
+    monkeypatch.delenv(DAPLA_REGION)
+    config.reload_config()
+    assert isinstance(provider(), UnknownUserInfo)
+
+
+def test_set_user_info_provider(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(DAPLA_REGION, DaplaRegion.DAPLA_LAB)
+    user_info.set_user_info_provider(TestUserInfo)
+    try:
+        assert (
+            user_info.get_user_info_for_current_platform().short_email
+            == TestUserInfo.PLACEHOLDER_EMAIL_ADDRESS
+        )
+    finally:
+        user_info.set_user_info_provider(None)
+    assert isinstance(user_info.get_user_info_for_current_platform(), DaplaLabUserInfo)
@@ -24,6 +24,7 @@ from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMa
 from dapla_metadata.datasets.utility.enums import SupportedLanguages
 from tests.datasets.constants import CODE_LIST_DIR
 from tests.datasets.constants import DATADOC_METADATA_MODULE
+from tests.datasets.constants import TEST_BUCKET_NAMING_STANDARD_COMPATIBLE_PATH
 from tests.datasets.constants import TEST_DATASETS_DIRECTORY
 from tests.datasets.constants import TEST_EXISTING_METADATA_DIRECTORY
 from tests.datasets.constants import TEST_EXISTING_METADATA_FILE_NAME
@@ -36,6 +37,7 @@ from tests.datasets.datasets import create_dataset_for_metadata_document
 from tests.datasets.test_statistic_subject_mapping import (
     STATISTICAL_SUBJECT_STRUCTURE_DIR,
 )
+from tests.utils.latency_filesystem import LatencyFileSystem
 
 if TYPE_CHECKING:
     from pytest_mock import MockerFixture
@@ -302,3 +304,44 @@ def copy_dataset_to_path(
     temporary_dataset.parent.mkdir(parents=True, exist_ok=True)
     shutil.copy(str(TEST_PARQUET_FILEPATH), str(temporary_dataset))
     return temporary_dataset
+
+
+@pytest.fixture
+def remote_fs(mocker: MockerFixture) -> LatencyFileSystem:
+    """Serve gs:// paths from a memory filesystem which records remote calls."""
+    fs = LatencyFileSystem()
+    fs_factory = UPath._fs_factory.__func__  # type: ignore [attr-defined]  # noqa: SLF001
+
+    def gs_fs_factory(cls, urlpath, protocol, storage_options):
+        if protocol == "gs":
+            return fs
+        return fs_factory(cls, urlpath, protocol, storage_options)
+
+    mocker.patch.object(UPath, "_fs_factory", classmethod(gs_fs_factory))
+    return fs
+
+
+@pytest.fixture
+def remote_dataset(remote_fs: LatencyFileSystem) -> UPath:
+    dataset = UPath(TEST_BUCKET_NAMING_STANDARD_COMPATIBLE_PATH)
+    dataset.write_bytes(TEST_PARQUET_FILEPATH.read_bytes())
+    remote_fs.reset_calls()
+    return dataset
+
+
+@pytest.fixture
+def remote_datadoc(
+    _mock_timestamp,
+    _mock_user_info,
+    remote_dataset: UPath,
+    remote_fs: LatencyFileSystem,
+    subject_mapping_fake_statistical_structure: StatisticSubjectMapping,
+) -> Datadoc:
+    """A dataset in a bucket with a metadata document next to it."""
+    datadoc = Datadoc(
+        remote_dataset,
+        statistic_subject_mapping=subject_mapping_fake_statistical_structure,
+    )
+    datadoc.write_metadata_document()
+    remote_fs.reset_calls()
+    return datadoc
@@ -0,0 +1,174 @@
+import json
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+from datadoc_model.all_optional import model
+from upath import UPath
+
+from dapla_metadata.datasets.audit import BUCKET
+from dapla_metadata.datasets.audit import DATASET_STATE
+from dapla_metadata.datasets.audit import TEAM
+from dapla_metadata.datasets.audit import CoverageAudit
+from dapla_metadata.datasets.audit import audit_coverage
+from dapla_metadata.datasets.catalog import read_datadoc
+from dapla_metadata.datasets.utility.constants import NUM_OBLIGATORY_DATASET_FIELDS
+from dapla_metadata.datasets.utility.constants import NUM_OBLIGATORY_VARIABLES_FIELDS
+from dapla_metadata.datasets.utility.utils import calculate_percentage
+from dapla_metadata.datasets.utility.utils import (
+    num_obligatory_dataset_fields_completed,
+)
+from dapla_metadata.datasets.utility.utils import (
+    num_obligatory_variables_fields_completed,
+)
+from tests.datasets.constants import TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH
+from tests.utils.latency_filesystem import LatencyFileSystem
+
+BUCKET_A = "gs://ssb-team-a-data-produkt-prod"
+BUCKET_B = "gs://ssb-team-b-data-produkt-prod"
+PERSON_DATASET = (
+    f"{BUCKET_A}/ifpn/klargjorte_data/person_testdata_p2021-12-31_p2021-12-31_v1"
+)
+UNDOCUMENTED_DATASET = f"{BUCKET_A}/ifpn/inndata/undocumented_p2020_v1.parquet"
+PARTITIONED_DATASET = f"{BUCKET_A}/ifpn/inndata/partitioned_p2020_v1"
+ORPHANED_DOCUMENT = f"{BUCKET_A}/ifpn/utdata/gone_p2020_v1__DOC.json"
+BROKEN_DATASET = f"{BUCKET_B}/stat/inndata/broken_p2020_v1"
+TEAM_B_DATASET = f"{BUCKET_B}/stat/inndata/sykefravaer_p2020_v1"
+
+
+def incomplete_document() -> dict:
+    document = json.loads(TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH.read_text())
+    document["datadoc"]["dataset"]["subject_field"] = None
+    document["datadoc"]["variables"][0]["unit_type"] = None
+    document["datadoc"]["variables"][1]["name"] = [
+        {"languageCode": "nb", "languageText": ""}
+    ]
+    return document
+
+
+@pytest.fixture
+def buckets(remote_fs: LatencyFileSystem) -> LatencyFileSystem:
+    UPath(f"{PERSON_DATASET}.parquet").write_bytes(b"")
+    UPath(f"{PERSON_DATASET}__DOC.json").write_text(json.dumps(incomplete_document()))
+    UPath(UNDOCUMENTED_DATASET).write_bytes(b"")
+    UPath(f"{PARTITIONED_DATASET}/aar=2020/part-0.parquet").write_bytes(b"")
+    UPath(f"{PARTITIONED_DATASET}/aar=2021/part-0.parquet").write_bytes(b"")
+    UPath(ORPHANED_DOCUMENT).write_text(json.dumps(incomplete_document()))
+    UPath(f"{BROKEN_DATASET}.parquet").write_bytes(b"")
+    UPath(f"{BROKEN_DATASET}__DOC.json").write_text("{")
+    team_b_document = json.loads(
+        TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH.read_text()
+    )
+    team_b_document["datadoc"]["dataset"]["owner"] = "team-b"
+    team_b_document["datadoc"]["dataset"]["dataset_state"] = "INPUT_DATA"
+    UPath(f"{TEAM_B_DATASET}.parquet").write_bytes(b"")
+    UPath(f"{TEAM_B_DATASET}__DOC.json").write_text(json.dumps(team_b_document))
+    remote_fs.reset_calls()
+    return remote_fs
+
+
+@pytest.fixture
+def audit(buckets: LatencyFileSystem) -> CoverageAudit:
+    # One listing per bucket and one read per paired document
+    with buckets.budget(2 + 3):
+        return audit_coverage(BUCKET_A, BUCKET_B)
+
+
+def expected_percentage_complete(document: dict) -> int:
+    datadoc = model.DatadocMetadata.model_validate(read_datadoc(json.dumps(document)))
+    assert datadoc.dataset
+    assert datadoc.variables
+    return calculate_percentage(
+        num_obligatory_dataset_fields_completed(datadoc.dataset)
+        + num_obligatory_variables_fields_completed(datadoc.variables),
+        NUM_OBLIGATORY_DATASET_FIELDS
+        + NUM_OBLIGATORY_VARIABLES_FIELDS * len(datadoc.variables),
+    )
+
+
+def test_audit_coverage_pairs_datasets_and_documents(audit: CoverageAudit):
+    rows = {r["dataset_path"]: r for r in audit.datasets.to_pylist()}
+    assert sorted(rows) == sorted(
+        [
+            f"{PERSON_DATASET}.parquet",
+            UNDOCUMENTED_DATASET,
+            PARTITIONED_DATASET,
+            f"{BROKEN_DATASET}.parquet",
+            f"{TEAM_B_DATASET}.parquet",
+        ]
+    )
+    assert rows[f"{PERSON_DATASET}.parquet"]["document_path"] == (
+        f"{PERSON_DATASET}__DOC.json"
+    )
+    assert not rows[PARTITIONED_DATASET]["has_document"]
+    assert rows[PARTITIONED_DATASET]["dataset_state"] == "INPUT_DATA"
+    assert rows[f"{BROKEN_DATASET}.parquet"]["error"].startswith("JSONDecodeError")
+    assert audit.orphaned_documents == [ORPHANED_DOCUMENT]
+    assert audit.undocumented().column("dataset_path").to_pylist() == [
+        PARTITIONED_DATASET,
+        UNDOCUMENTED_DATASET,
+    ]
+
+
+def test_audit_coverage_percentage_complete(audit: CoverageAudit):
+    [person] = audit.datasets.filter(
+        pc.equal(audit.datasets.column("owner"), pa.scalar("team-statistikk"))
+    ).to_pylist()
+    assert person["percentage_complete"] == expected_percentage_complete(
+        incomplete_document()
+    )
+    assert person["missing_subject_field"]
+    assert person["variables_missing_unit_type"] == 1
+    assert person["variables_missing_name"] == 1
+
+
+def test_coverage_by_bucket(audit: CoverageAudit):
+    coverage = audit.coverage(BUCKET).to_pylist()
+    assert [
+        (r["bucket_name"], r["num_datasets"], r["num_undocumented"]) for r in coverage
+    ] == [
+        ("ssb-team-a-data-produkt-prod", 3, 2),
+        ("ssb-team-b-data-produkt-prod", 2, 0),
+    ]
+    assert (
+        coverage[1]["min_percentage_complete"] == coverage[1]["max_percentage_complete"]
+    )
+
+
+def test_coverage_by_team_and_state(audit: CoverageAudit):
+    coverage = audit.coverage([*TEAM, *DATASET_STATE])
+    assert set(
+        zip(
+            coverage.column("owner").to_pylist(),
+            coverage.column("dataset_state").to_pylist(),
+            coverage.column("num_datasets").to_pylist(),
+            strict=True,
+        )
+    ) == {
+        (None, "INPUT_DATA", 3),
+        ("team-b", "INPUT_DATA", 1),
+        ("team-statistikk", "PROCESSED_DATA", 1),
+    }
+
+
+def test_missing_fields_by_team(audit: CoverageAudit):
+    missing = audit.missing_fields(TEAM).to_pylist()
+    assert {
+        "owner": "team-statistikk",
+        "level": "dataset",
+        "field": "subject_field",
+        "num_missing": 1,
+    } in missing
+    assert {
+        "owner": "team-statistikk",
+        "level": "variable",
+        "field": "unit_type",
+        "num_missing": 1,
+    } in missing
+    assert all(r["owner"] is not None for r in missing)
+
+
+def test_completeness_histogram(audit: CoverageAudit):
+    histogram = audit.completeness_histogram(BUCKET, bin_width=25).to_pylist()
+    assert sum(r["num_datasets"] for r in histogram) == len(["person", "team-b"])
+    assert all(r["bin_start"] in (0, 25, 50, 75) for r in histogram)
@@ -0,0 +1,174 @@
+import json
+
+import pytest
+from pytest_mock import MockerFixture
+from upath import UPath
+
+from dapla_metadata.datasets import catalog as catalog_module
+from dapla_metadata.datasets.catalog import MetadataCatalog
+from dapla_metadata.datasets.catalog import list_metadata_documents
+from dapla_metadata.datasets.catalog import parse_metadata_document
+from dapla_metadata.datasets.utility.urn import klass_urn_converter
+from tests.datasets.constants import TEST_COMPATIBILITY_DIRECTORY
+from tests.datasets.constants import TEST_EXISTING_METADATA_FILE_NAME
+from tests.datasets.constants import TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH
+from tests.utils.latency_filesystem import LatencyFileSystem
+
+BUCKET = "gs://ssb-my-team-data-produkt-prod"
+PERSON_DOCUMENT = f"{BUCKET}/ifpn/klargjorte_data/person_testdata_p2021-12-31_p2021-12-31_v1__DOC.json"
+OLD_DOCUMENT = f"{BUCKET}/ifpn/inndata/person_data_p2020_v1__DOC.json"
+BROKEN_DOCUMENT = f"{BUCKET}/other/inndata/broken_p2020_v1__DOC.json"
+
+
+def person_document() -> dict:
+    document = json.loads(TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH.read_text())
+    document["datadoc"]["variables"][2]["classification_uri"] = (
+        "https://www.ssb.no/klass/klassifikasjoner/91"
+    )
+    return document
+
+
+@pytest.fixture
+def bucket(remote_fs: LatencyFileSystem) -> LatencyFileSystem:
+    UPath(PERSON_DOCUMENT).write_text(json.dumps(person_document()))
+    old_document = json.loads(
+        (
+            TEST_COMPATIBILITY_DIRECTORY / "v2_2_0" / TEST_EXISTING_METADATA_FILE_NAME
+        ).read_text()
+    )
+    del old_document["datadoc"]["dataset"]["contains_data_from"]
+    del old_document["datadoc"]["dataset"]["contains_data_until"]
+    UPath(OLD_DOCUMENT).write_text(json.dumps(old_document))
+    UPath(BROKEN_DOCUMENT).write_text("{")
+    UPath(f"{BUCKET}/ifpn/inndata/person_data_p2020_v1.parquet").write_bytes(b"")
+    remote_fs.reset_calls()
+    return remote_fs
+
+
+@pytest.fixture
+def catalog():
+    with MetadataCatalog() as catalog:
+        yield catalog
+
+
+def test_list_metadata_documents(bucket: LatencyFileSystem):
+    with bucket.budget(1):
+        documents = list_metadata_documents(f"{BUCKET}/ifpn")
+    assert sorted(documents) == [OLD_DOCUMENT, PERSON_DOCUMENT]
+
+
+def test_parse_metadata_document():
+    entry = parse_metadata_document(PERSON_DOCUMENT, json.dumps(person_document()))
+    assert entry.dataset["dataset_path"] == PERSON_DOCUMENT.replace(
+        "__DOC.json", ".parquet"
+    )
+    assert entry.dataset["owner"] == "team-statistikk"
+    assert entry.dataset["num_variables"] == len(entry.variables)
+    assert entry.variables[2]["classification_urn"] == klass_urn_converter.get_urn("91")
+
+
+@pytest.mark.usefixtures("bucket")
+def test_build(catalog: MetadataCatalog):
+    result = catalog.build(BUCKET)
+
+    assert sorted(result.indexed) == [OLD_DOCUMENT, PERSON_DOCUMENT]
+    assert list(result.failed) == [BROKEN_DOCUMENT]
+    [person] = catalog.find_datasets(owner="team-statistikk")
+    assert person == {
+        "document_path": PERSON_DOCUMENT,
+        "dataset_path": PERSON_DOCUMENT.replace("__DOC.json", ".parquet"),
+        "bucket_name": "ssb-my-team-data-produkt-prod",
+        "statistic_short_name": "ifpn",
+        "short_name": "person_data",
+        "dataset_state": "PROCESSED_DATA",
+        "dataset_status": "DRAFT",
+        "version": "1",
+        "owner": "team-statistikk",
+        "contains_data_from": "2021-12-31",
+        "contains_data_until": "2021-12-31",
+        "percentage_complete": person["percentage_complete"],
+        "num_variables": person["num_variables"],
+    }
+    [classified] = catalog.find_variables(
+        classification_urn=klass_urn_converter.get_urn("91")
+    )
+    assert classified["document_path"] == PERSON_DOCUMENT
+    assert classified["position"] == 2
+
+
+@pytest.mark.usefixtures("bucket")
+def test_build_takes_period_from_path_when_missing(catalog: MetadataCatalog):
+    catalog.build(BUCKET)
+    [old] = catalog.find_datasets(document_path=OLD_DOCUMENT)
+    assert old["contains_data_from"] == "2020-01-01"
+    assert old["contains_data_until"] == "2020-12-31"
+
+
+def test_rebuild_reads_only_changed_documents(
+    bucket: LatencyFileSystem, catalog: MetadataCatalog
+):
+    catalog.build(BUCKET)
+    bucket.reset_calls()
+    with bucket.budget(1):
+        result = catalog.build(BUCKET)
+    assert result.indexed == []
+    assert result.unchanged == 3
+
+    document = person_document()
+    document["datadoc"]["dataset"]["owner"] = "team-ny"
+    UPath(PERSON_DOCUMENT).write_text(json.dumps(document))
+    UPath(OLD_DOCUMENT).unlink()
+    result = catalog.build(BUCKET)
+
+    assert result.indexed == [PERSON_DOCUMENT]
+    assert result.removed == [OLD_DOCUMENT]
+    assert [d["owner"] for d in catalog.find_datasets()] == ["team-ny"]
+    assert catalog.find_variables(document_path=OLD_DOCUMENT) == []
+
+
+@pytest.mark.usefixtures("bucket")
+def test_rebuild_retries_documents_which_could_not_be_read(
+    catalog: MetadataCatalog, mocker: MockerFixture
+):
+    read_catalog_entry = catalog_module.read_catalog_entry
+
+    def flaky_read(path: str) -> catalog_module.CatalogEntry:
+        if path == PERSON_DOCUMENT:
+            msg = "Service unavailable"
+            raise ConnectionError(msg)
+        return read_catalog_entry(path)
+
+    flaky = mocker.patch.object(catalog_module, "read_catalog_entry", flaky_read)
+    result = catalog.build(BUCKET)
+    assert set(result.failed) == {BROKEN_DOCUMENT, PERSON_DOCUMENT}
+    assert result.failed[PERSON_DOCUMENT] == "ConnectionError: Service unavailable"
+    assert catalog.find_datasets(document_path=PERSON_DOCUMENT) == []
+
+    mocker.stop(flaky)
+    result = catalog.build(BUCKET)
+    assert result.indexed == [PERSON_DOCUMENT]
+    assert result.failed == {}
+    assert result.unchanged == 2
+
+
+@pytest.mark.usefixtures("bucket")
+def test_build_prefix_keeps_other_documents(catalog: MetadataCatalog):
+    catalog.build(BUCKET)
+    result = catalog.build(f"{BUCKET}/ifpn/klargjorte_data")
+    assert result.removed == []
+    assert result.unchanged == 1
+    assert len(catalog.find_datasets()) == 2
+
+
+@pytest.mark.usefixtures("bucket")
+def test_catalog_is_kept_between_sessions(tmp_path):
+    database = tmp_path / "catalog.sqlite"
+    with MetadataCatalog(database) as catalog:
+        catalog.build(BUCKET)
+    with MetadataCatalog(database) as catalog:
+        assert catalog.build(BUCKET).unchanged == 3
+
+
+def test_find_unknown_column(catalog: MetadataCatalog):
+    with pytest.raises(ValueError, match="Unknown variables columns: \\['uri'\\]"):
+        catalog.find_variables(uri="urn:ssb:classification:klass:91")
@@ -1,9 +1,21 @@
+import datetime as dt
+
+import pandas as pd
 import pytest
 from klass import KlassClassification
 
+from dapla_metadata.datasets.code_list import CodeIndex
 from dapla_metadata.datasets.code_list import CodeList
+from dapla_metadata.datasets.code_list import code_list_cache
+from dapla_metadata.datasets.external_sources.external_sources import (
+    get_external_source_stats,
+)
+from dapla_metadata.datasets.external_sources.external_sources import (
+    reset_external_source_stats,
+)
 from dapla_metadata.datasets.utility.enums import SupportedLanguages
 from tests.datasets.constants import TEST_RESOURCES_DIRECTORY
+from tests.utils.code_lists import nace_like_dataframes
 
 CODE_LIST_DIR = "code_list"
 
@@ -65,3 +77,143 @@ def test_instantiate_classification(language: SupportedLanguages):
         KlassClassification("6", language.lower()),  # type: ignore [arg-type]
         KlassClassification,
     )
+
+
+@pytest.fixture
+def fake_klass(mocker):
+    """Replace KlassClassification with a fake which records its calls."""
+    calls: list[tuple[str, str, str | None, int | None]] = []
+
+    def fake_classification(classification_id: str, language: str):
+        def get_codes(from_date: str | None = None, select_level: int | None = None):
+            calls.append((classification_id, language, from_date, select_level))
+            return mocker.Mock(
+                data=pd.DataFrame(
+                    {"code": ["01", "02"], "name": [f"{language}-a", f"{language}-b"]}
+                )
+            )
+
+        return mocker.Mock(get_codes=get_codes)
+
+    mocker.patch(
+        "dapla_metadata.datasets.code_list.KlassClassification",
+        fake_classification,
+    )
+    code_list_cache.clear()
+    yield calls
+    code_list_cache.clear()
+
+
+def test_code_list_fetches_all_languages(fake_klass, thread_pool_executor):
+    code_list = CodeList(thread_pool_executor, 131, level=1)
+    code_list.wait_for_external_result()
+    assert sorted(language for _, language, _, _ in fake_klass) == ["en", "nb", "nn"]
+    assert {level for _, _, _, level in fake_klass} == {1}
+    assert code_list.classifications[0].get_title(SupportedLanguages.ENGLISH) == "en-a"
+    assert (
+        code_list.classifications[1].get_title(SupportedLanguages.NORSK_NYNORSK)
+        == "nn-b"
+    )
+
+
+def test_code_list_shares_cached_fetches(fake_klass, thread_pool_executor):
+    reset_external_source_stats()
+    for _ in range(3):
+        CodeList(thread_pool_executor, 131).wait_for_external_result()
+    assert len(fake_klass) == len(SupportedLanguages)
+    stats = get_external_source_stats()["KlassCodes"]
+    assert (stats.hits, stats.misses) == (
+        2 * len(SupportedLanguages),
+        len(SupportedLanguages),
+    )
+
+    CodeList(
+        thread_pool_executor, 131, date=dt.date(2020, 1, 1)
+    ).wait_for_external_result()
+    assert len(fake_klass) == 2 * len(SupportedLanguages)
+    assert {from_date for _, _, from_date, _ in fake_klass} == {None, "2020-01-01"}
+
+
+@pytest.fixture
+def nace_code_list(mocker, thread_pool_executor) -> CodeList:
+    mocker.patch(
+        "dapla_metadata.datasets.code_list.CodeList._fetch_data_from_external_source",
+        return_value=nace_like_dataframes(),
+    )
+    code_list = CodeList(thread_pool_executor, 6)
+    code_list.wait_for_external_result()
+    return code_list
+
+
+def test_code_list_lookup(nace_code_list: CodeList):
+    item = nace_code_list.get_item("01.11")
+    assert item is not None
+    assert item.level == "4"
+    assert item.get_title(SupportedLanguages.ENGLISH) == "en 01.11"
+    assert nace_code_list.get_item("does-not-exist") is None
+
+
+def test_code_list_hierarchy(nace_code_list: CodeList):
+    assert [i.code for i in nace_code_list.get_children("A")] == [
+        "01",
+        "02",
+        "03",
+        "04",
+    ]
+    assert [i.code for i in nace_code_list.get_children("01.11")] == [
+        "01.111",
+        "01.112",
+    ]
+    parent = nace_code_list.get_parent("01.111")
+    assert parent is not None
+    assert parent.code == "01.11"
+    assert nace_code_list.get_parent("A") is None
+
+
+def test_code_list_search_prefix(nace_code_list: CodeList):
+    assert [i.code for i in nace_code_list.search_prefix("01.1")] == [
+        "01.1",
+        "01.11",
+        "01.111",
+        "01.112",
+        "01.12",
+        "01.121",
+        "01.122",
+        "01.13",
+        "01.131",
+        "01.132",
+    ]
+    assert nace_code_list.search_prefix("ZZ") == []
+
+
+def test_code_list_titles_joined_on_code(thread_pool_executor, mocker):
+    dataframes = nace_like_dataframes(sections=1)
+    # Klass may return the languages in a different order
+    dataframes[SupportedLanguages.ENGLISH] = dataframes[
+        SupportedLanguages.ENGLISH
+    ].iloc[::-1]
+    mocker.patch(
+        "dapla_metadata.datasets.code_list.CodeList._fetch_data_from_external_source",
+        return_value=dataframes,
+    )
+    code_list = CodeList(thread_pool_executor, 6)
+    for item in code_list.classifications:
+        assert item.get_title(SupportedLanguages.ENGLISH) == f"en {item.code}"
+
+
+def row_by_row_titles(
+    dataframes: dict[SupportedLanguages, pd.DataFrame],
+) -> list[dict[SupportedLanguages, str]]:
+    """The row by row title extraction which the code index replaced."""
+    return [
+        {language: frame.loc[:, "name"][i] for language, frame in dataframes.items()}
+        for i in range(len(dataframes[SupportedLanguages.NORSK_BOKMÅL]))
+    ]
+
+
+def test_code_index_nace():
+    dataframes = nace_like_dataframes()
+    index = CodeIndex(dataframes)
+    for code in index.codes:
+        assert code in index
+    assert [item.titles for item in index.items()] == row_by_row_titles(dataframes)
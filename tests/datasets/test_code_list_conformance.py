@@ -0,0 +1,104 @@
+from collections.abc import Collection
+from collections.abc import Iterable
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+from datadoc_model.all_optional.model import Variable
+from pyarrow import parquet as pq
+
+from dapla_metadata.datasets.code_list_conformance import check_code_list_conformance
+from dapla_metadata.datasets.code_list_conformance import load_codes_from_klass
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+from dapla_metadata.datasets.utility.urn import klass_urn_converter
+
+KOMMUNE_ID = 131
+NACE_ID = 6
+
+CODES = {
+    KOMMUNE_ID: {"0301", "1103", "4601"},
+    NACE_ID: {"1", "2", "3"},
+}
+
+
+def fake_load_codes(classification_ids: Iterable[int]) -> dict[int, Collection[str]]:
+    return {i: CODES[i] for i in classification_ids if i in CODES}
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    path = tmp_path / "dataset.parquet"
+    table = pa.table(
+        {
+            "kommune": ["0301", "9999", None, "1103", "9999", "0000"] * 100,
+            "naering": [1, 2, 3, 4, None, 4] * 100,
+            "fritekst": ["a", "b", "c", "d", "e", "f"] * 100,
+        }
+    )
+    pq.write_table(table, path, row_group_size=64)
+    return path
+
+
+def variable(short_name: str, classification_id: int | None) -> Variable:
+    return Variable(
+        short_name=short_name,
+        classification_uri=(
+            klass_urn_converter.get_urn(str(classification_id))
+            if classification_id
+            else None
+        ),
+    )
+
+
+def test_check_code_list_conformance(dataset: Path):
+    results = check_code_list_conformance(
+        dataset,
+        [
+            variable("kommune", KOMMUNE_ID),
+            variable("naering", NACE_ID),
+            variable("fritekst", None),
+        ],
+        batch_size=50,
+        load_codes=fake_load_codes,
+    )
+
+    assert [r.short_name for r in results] == ["kommune", "naering"]
+    kommune, naering = results
+    assert kommune.num_values == 600
+    assert kommune.num_nulls == 100
+    assert kommune.num_invalid == 300
+    assert kommune.top_invalid == [("9999", 200), ("0000", 100)]
+    assert not kommune.conforms
+
+    assert naering.num_nulls == 100
+    assert naering.num_invalid == 200
+    assert naering.top_invalid == [("4", 200)]
+
+
+def test_check_code_list_conformance_errors(dataset: Path):
+    results = check_code_list_conformance(
+        dataset,
+        [
+            variable("missing_column", KOMMUNE_ID),
+            variable("kommune", 999),
+            Variable(
+                short_name="naering",
+                classification_uri="https://www.ssb.no/not-klass/6",
+            ),
+        ],
+        load_codes=fake_load_codes,
+    )
+    assert [r.error is not None for r in results] == [True, True, True]
+    assert [r.conforms for r in results] == [False, False, False]
+
+
+def test_load_codes_from_klass(mocker):
+    mocker.patch(
+        "dapla_metadata.datasets.code_list.CodeList._fetch_data_from_external_source",
+        return_value={
+            language: pd.DataFrame({"code": ["01", "02"], "name": ["a", "b"]})
+            for language in SupportedLanguages
+        },
+    )
+    assert load_codes_from_klass([KOMMUNE_ID, KOMMUNE_ID]) == {KOMMUNE_ID: {"01", "02"}}
@@ -6,6 +6,7 @@ import datadoc_model.all_optional.model as all_optional_model
 import pytest
 
 from dapla_metadata.datasets import Datadoc
+from dapla_metadata.datasets.utility import utils
 from tests.datasets.constants import TEST_COPY_VARIABLES_FILEPATH
 from tests.datasets.constants import TEST_EXISTING_METADATA_FILE_NAME
 
@@ -153,3 +154,77 @@ def test_copy_multiple_variables(
             assert item["name"] is not None
             assert item["name"][2]["languageCode"] == "nb"
             assert item["name"][2]["languageText"] == language_text
+
+
+@pytest.fixture
+def copy_variables_document(tmp_path: pathlib.Path) -> pathlib.Path:
+    document = tmp_path / "copy_variables.json"
+    shutil.copy(str(TEST_COPY_VARIABLES_FILEPATH), str(document))
+    return document
+
+
+def test_copy_variables(metadata: Datadoc, copy_variables_document: pathlib.Path):
+    metadata.copy_variables(
+        copy_variables_document,
+        {"pers_id": "test_kopiering", "sivilstand": "sivilstand"},
+    )
+
+    pers_id = metadata.variables_lookup["pers_id"]
+    assert pers_id.short_name == "pers_id"
+    assert pers_id.name
+    assert pers_id.name.root[2].languageText == "Test kopiering"  # type: ignore[index]
+    assert pers_id.data_type == all_optional_model.DataType.STRING
+    assert metadata.variables[0] is pers_id
+    assert metadata.variables[2] is metadata.variables_lookup["sivilstand"]
+
+
+def test_copy_variables_with_same_short_names(
+    metadata: Datadoc, copy_variables_document: pathlib.Path
+):
+    metadata.copy_variables(copy_variables_document, ["pers_id", "sivilstand"])
+    sivilstand = metadata.variables_lookup["sivilstand"]
+    assert sivilstand.name
+    assert sivilstand.name.root[2].languageText == "Ny Sivilstand"  # type: ignore[index]
+
+
+def test_copy_variables_reads_source_document_once(
+    metadata: Datadoc,
+    copy_variables_document: pathlib.Path,
+    mocker,
+):
+    upgrade = mocker.patch(
+        "dapla_metadata.datasets.utility.utils.upgrade_metadata",
+        wraps=utils.upgrade_metadata,
+    )
+    validate = mocker.spy(all_optional_model.Variable, "model_validate")
+    metadata.copy_variables(copy_variables_document, ["pers_id"])
+    metadata.copy_variable(copy_variables_document, "sivilstand")
+    assert upgrade.call_count == 1
+    assert validate.call_count == 2
+
+
+def test_copy_variables_missing_source_copies_nothing(
+    metadata: Datadoc, copy_variables_document: pathlib.Path
+):
+    before = list(metadata.variables)
+    with pytest.raises(ValueError, match="ikke_her does not exist!"):
+        metadata.copy_variables(
+            copy_variables_document, {"pers_id": "pers_id", "sivilstand": "ikke_her"}
+        )
+    assert metadata.variables == before
+
+
+def test_copy_variables_reads_changed_source_document(
+    metadata: Datadoc, copy_variables_document: pathlib.Path
+):
+    metadata.copy_variable(copy_variables_document, "sivilstand")
+    document = json.loads(copy_variables_document.read_text())
+    for variable in document["datadoc"]["variables"]:
+        if variable["short_name"] == "sivilstand":
+            variable["name"][2]["languageText"] = "Endret av andre"
+    copy_variables_document.write_text(json.dumps(document))
+
+    metadata.copy_variable(copy_variables_document, "sivilstand")
+    sivilstand = metadata.variables_lookup["sivilstand"]
+    assert sivilstand.name
+    assert sivilstand.name.root[2].languageText == "Endret av andre"  # type: ignore[index]
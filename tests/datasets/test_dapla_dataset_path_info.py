@@ -4,19 +4,31 @@ import datetime
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
+import arrow
+import numpy as np
+import pyarrow as pa
 import pytest
 from datadoc_model.all_optional.model import DataSetState
 
 from dapla_metadata.datasets.dapla_dataset_path_info import ISO_YEAR
 from dapla_metadata.datasets.dapla_dataset_path_info import ISO_YEAR_MONTH
 from dapla_metadata.datasets.dapla_dataset_path_info import ISO_YEAR_MONTH_DAY
+from dapla_metadata.datasets.dapla_dataset_path_info import ISO_YEAR_WEEK
 from dapla_metadata.datasets.dapla_dataset_path_info import SSB_BIMESTER
+from dapla_metadata.datasets.dapla_dataset_path_info import SSB_HALF_YEAR
+from dapla_metadata.datasets.dapla_dataset_path_info import SSB_QUARTERLY
+from dapla_metadata.datasets.dapla_dataset_path_info import SSB_TRIANNUAL
 from dapla_metadata.datasets.dapla_dataset_path_info import DaplaDatasetPathInfo
+from dapla_metadata.datasets.dapla_dataset_path_info import IsoDateFormat
+from dapla_metadata.datasets.dapla_dataset_path_info import SsbDateFormat
+from dapla_metadata.datasets.dapla_dataset_path_info import categorize_period_string
+from dapla_metadata.datasets.dapla_dataset_path_info import periods_to_datetime64
 from tests.datasets.constants import TEST_BUCKET_PARQUET_FILEPATH_WITH_SHORTNAME
 from tests.datasets.constants import TEST_PARQUET_FILEPATH
 
 if TYPE_CHECKING:
     import pathlib
+    from collections.abc import Iterator
 
 
 @dataclass
@@ -382,3 +394,179 @@ def test_extract_shortname_in_path_invalid_gs_url():
         _ = DaplaDatasetPathInfo(
             "gs:/ssb-staging-dapla-felles-data-delt/datadoc/person_data_v1.parquet"
         ).dataset_short_name
+
+
+PARSE_MANY_PATHS = [
+    *(test_case.path for test_case in TEST_CASES),
+    TEST_BUCKET_PARQUET_FILEPATH_WITH_SHORTNAME,
+    "gs://ssb-staging-dapla-felles-data-delt/datadoc/utdata/person_data_p2021_v2.parquet",
+    "gs://ssb-staging-dapla-felles-data-delt/datadoc/utdata/person_data_p2021_p2022_v2.parquet",
+    "gs://ssb-staging-dapla-felles-data-delt/datadoc/utdata/omsetning_p2020W15_v1.parquet",
+    "gs://statistikk/produkt/klargjorte-data/persondata_p1990-Q1_p2023-Q4_v1/aar=2019/data.parquet",
+    "gs://datadoc/person_data_v1.parquet",
+    "gs://utdata/person_data_p2021_p2022_v2.parquet",
+    "buckets/ssb-staging-dapla-felles-data-delt/person_data_p2021_v2.parquet",
+    "buckets/bucket_name/stat/inndata/person_data",
+    "buckets/klargjorte_data/person_data_p2021-12-31_p2021-12-31_v1.parquet",
+    "stat/inndata/inndata",
+    "varehandel_p2018H2_p2018H1_v1.parquet",
+    "sykkeltransport_p1973B2_p2020T8_v1.parquet",
+]
+
+
+def test_parse_many_matches_single_path_parsing():
+    table = DaplaDatasetPathInfo.parse_many(PARSE_MANY_PATHS)
+    assert table.num_rows == len(PARSE_MANY_PATHS)
+    for row, path in zip(table.to_pylist(), PARSE_MANY_PATHS, strict=True):
+        info = DaplaDatasetPathInfo(path)
+        assert row == {
+            "dataset_path": path,
+            "bucket_name": info.bucket_name,
+            "statistic_short_name": info.statistic_short_name,
+            "dataset_state": info.dataset_state.value if info.dataset_state else None,
+            "dataset_short_name": info.dataset_short_name,
+            "dataset_version": info.dataset_version,
+            "period_strings": info.period_strings,
+            "contains_data_from": info.contains_data_from,
+            "contains_data_until": info.contains_data_until,
+        }
+
+
+def test_parse_many_pyarrow_input():
+    paths = pa.chunked_array([PARSE_MANY_PATHS[:3], [None, *PARSE_MANY_PATHS[3:]]])
+    table = DaplaDatasetPathInfo.parse_many(paths)
+    assert table.column("dataset_path") == paths
+    assert table.slice(3, 1).to_pylist()[0]["statistic_short_name"] is None
+
+
+def test_parse_many_invalid_paths():
+    table = DaplaDatasetPathInfo.parse_many(
+        [
+            "gs:/ssb-staging-dapla-felles-data-delt/datadoc/person_data_v1.parquet",
+            "stat/inndata/person_data_p2021-13_v1.parquet",
+        ]
+    )
+    rows = table.to_pylist()
+    assert rows[0]["dataset_short_name"] is None
+    assert rows[1]["dataset_state"] == DataSetState.INPUT_DATA.value
+    assert rows[1]["contains_data_from"] is None
+
+
+def test_cached_path_info():
+    info = DaplaDatasetPathInfo.cached(TEST_BUCKET_PARQUET_FILEPATH_WITH_SHORTNAME)
+    assert info is DaplaDatasetPathInfo.cached(
+        TEST_BUCKET_PARQUET_FILEPATH_WITH_SHORTNAME
+    )
+    assert info.statistic_short_name == "befolkning"
+
+
+# The arrow patterns of the periods of each date format
+ARROW_PATTERNS = {
+    ISO_YEAR.name: "YYYY",
+    ISO_YEAR_MONTH.name: "YYYY-MM",
+    ISO_YEAR_MONTH_DAY.name: "YYYY-MM-DD",
+    ISO_YEAR_WEEK.name: "W",
+    SSB_BIMESTER.name: "YYYYMM",
+    SSB_QUARTERLY.name: "YYYYMM",
+    SSB_TRIANNUAL.name: "YYYYMM",
+    SSB_HALF_YEAR.name: "YYYYMM",
+}
+
+
+def arrow_floor(date_format: IsoDateFormat | SsbDateFormat, period: str):
+    """The arrow based implementation the calendar arithmetic replaced."""
+    if isinstance(date_format, SsbDateFormat):
+        month = date_format.ssb_dates.get(period[-2:])
+        if month is None:
+            return None
+        period = period[:4] + month["start"]
+    return (
+        arrow.get(period, ARROW_PATTERNS[date_format.name])
+        .floor(date_format.timeframe)
+        .date()
+    )
+
+
+def arrow_ceil(date_format: IsoDateFormat | SsbDateFormat, period: str):
+    """The arrow based implementation the calendar arithmetic replaced."""
+    if isinstance(date_format, SsbDateFormat):
+        month = date_format.ssb_dates.get(period[-2:])
+        if month is None:
+            return None
+        period = period[:4] + month["end"]
+    return (
+        arrow.get(period, ARROW_PATTERNS[date_format.name])
+        .ceil(date_format.timeframe)
+        .date()
+    )
+
+
+def outcome(function, *args):
+    try:
+        return function(*args)
+    except ValueError:
+        return ValueError
+    except OverflowError:
+        return OverflowError
+
+
+def period_space(year: int) -> Iterator[tuple[IsoDateFormat | SsbDateFormat, str]]:
+    """Period strings for the given year, covering all valid and edge values."""
+    y = f"{year:04d}"
+    yield ISO_YEAR, y
+    for month in range(100):
+        yield ISO_YEAR_MONTH, f"{y}-{month:02d}"
+    for month in range(14):
+        for day in range(33):
+            yield ISO_YEAR_MONTH_DAY, f"{y}-{month:02d}-{day:02d}"
+    for week in range(100):
+        yield ISO_YEAR_WEEK, f"{y}W{week:02d}"
+        yield ISO_YEAR_WEEK, f"{y}-W{week:02d}"
+    for date_format in (SSB_BIMESTER, SSB_QUARTERLY, SSB_TRIANNUAL, SSB_HALF_YEAR):
+        letter = next(iter(date_format.ssb_dates))[0]
+        for number in range(10):
+            yield date_format, f"{y}{letter}{number}"
+            yield date_format, f"{y}-{letter}{number}"
+
+
+@pytest.mark.parametrize(
+    "year",
+    [0, 1, 4, 100, 999, 1000, 1582, 1900, 1970, *range(1996, 2031), 2100, 9998, 9999],
+)
+def test_period_conversion_equivalent_to_arrow(year: int):
+    for date_format, period in period_space(year):
+        assert categorize_period_string(period) is date_format
+        assert outcome(date_format.get_floor, period) == outcome(
+            arrow_floor, date_format, period
+        ), period
+        assert outcome(date_format.get_ceil, period) == outcome(
+            arrow_ceil, date_format, period
+        ), period
+
+
+def test_periods_to_datetime64():
+    periods = np.array(
+        ["2022-W52", "2020W53", "2021-W53", "1999T3", "1999T4", None, "unknown"],
+        dtype=object,
+    )
+    floors, ceils = periods_to_datetime64(periods)
+    assert floors.dtype == ceils.dtype == np.dtype("datetime64[D]")
+    assert floors.tolist() == [
+        datetime.date(2022, 12, 26),
+        datetime.date(2020, 12, 28),
+        None,
+        datetime.date(1999, 9, 1),
+        None,
+        None,
+        None,
+    ]
+    assert ceils.tolist() == [
+        datetime.date(2023, 1, 1),
+        datetime.date(2021, 1, 3),
+        None,
+        datetime.date(1999, 12, 31),
+        None,
+        None,
+        None,
+    ]
+    assert periods_to_datetime64([])[0].size == 0
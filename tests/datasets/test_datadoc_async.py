@@ -0,0 +1,141 @@
+"""Tests for the asynchronous Datadoc API."""
+
+import asyncio
+import json
+import time
+from datetime import date
+
+import pytest
+from fsspec.asyn import AsyncFileSystem  # type: ignore [import-untyped]
+from upath import UPath
+
+from dapla_metadata.datasets.core import Datadoc
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from dapla_metadata.datasets.utility import async_fs
+from tests.utils.latency_filesystem import LatencyFileSystem
+
+pytest_plugins = ("pytest_asyncio",)
+
+
+class DictAsyncFileSystem(AsyncFileSystem):
+    """A minimal asynchronous filesystem which keeps files in a dict."""
+
+    cachable = False
+
+    def __init__(self, **kwargs) -> None:
+        """Initialize an empty filesystem."""
+        super().__init__(**kwargs)
+        self.files: dict[str, bytes] = {}
+
+    async def _cat_file(self, path, start=None, end=None, **kwargs) -> bytes:  # noqa: ARG002
+        try:
+            return self.files[path]
+        except KeyError:
+            raise FileNotFoundError(path) from None
+
+    async def _pipe_file(self, path, value, **kwargs) -> None:  # noqa: ARG002
+        self.files[path] = value
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_mock_timestamp", "_mock_user_info")
+async def test_aopen_matches_constructor(
+    existing_metadata_file: UPath,
+    subject_mapping_fake_statistical_structure: StatisticSubjectMapping,
+):
+    expected = Datadoc(
+        metadata_document_path=existing_metadata_file,
+        statistic_subject_mapping=subject_mapping_fake_statistical_structure,
+    )
+    datadoc = await Datadoc.aopen(
+        metadata_document_path=existing_metadata_file,
+        statistic_subject_mapping=subject_mapping_fake_statistical_structure,
+    )
+    assert datadoc.dataset == expected.dataset
+    assert datadoc.variables == expected.variables
+    assert datadoc.metadata_document == expected.metadata_document
+
+
+@pytest.mark.asyncio
+async def test_aopen_dataset_with_existing_document(remote_datadoc: Datadoc):
+    datadoc = await Datadoc.aopen(
+        remote_datadoc.dataset_path,
+        statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+    )
+    assert datadoc.dataset == remote_datadoc.dataset
+    assert datadoc.variables == remote_datadoc.variables
+
+
+@pytest.mark.asyncio
+async def test_aopen_missing_document(tmp_path: UPath):
+    with pytest.raises(ValueError, match="Metadata document does not exist"):
+        await Datadoc.aopen(metadata_document_path=tmp_path / "missing__DOC.json")
+
+
+@pytest.mark.asyncio
+async def test_asave(remote_datadoc: Datadoc):
+    remote_datadoc.dataset.contains_data_from = date(2021, 1, 1)
+    await remote_datadoc.asave()
+    assert remote_datadoc.metadata_document
+    saved = json.loads(remote_datadoc.metadata_document.read_text())
+    assert saved["datadoc"]["dataset"]["contains_data_from"] == "2021-01-01"
+
+
+@pytest.mark.asyncio
+async def test_asave_without_document():
+    with pytest.raises(ValueError, match="No metadata document to save"):
+        await Datadoc().asave()
+
+
+@pytest.mark.asyncio
+async def test_aopen_and_asave_budget(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    with remote_fs.budget(2):
+        datadoc = await Datadoc.aopen(
+            remote_datadoc.dataset_path,
+            statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+        )
+    with remote_fs.budget(1):
+        await datadoc.asave()
+
+
+@pytest.mark.asyncio
+async def test_aopen_does_not_block_event_loop(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    remote_fs.latency = 0.3
+    start = time.perf_counter()
+    datadocs = await asyncio.gather(
+        *(
+            Datadoc.aopen(
+                remote_datadoc.dataset_path,
+                statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+            )
+            for _ in range(3)
+        )
+    )
+    assert all(d.variables == remote_datadoc.variables for d in datadocs)
+    assert time.perf_counter() - start < 0.9
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("asynchronous", [True, False])
+async def test_async_fs_uses_coroutines_of_async_filesystem(asynchronous: bool):
+    fs = DictAsyncFileSystem(
+        asynchronous=asynchronous,
+        loop=asyncio.get_running_loop() if asynchronous else None,
+    )
+    path = UPath("memory://bucket/file.json")
+    path._fs_cached = fs  # noqa: SLF001
+    await async_fs.write_text(path, "innhold")
+    assert fs.files == {path.path: b"innhold"}
+    assert await async_fs.read_text(path) == "innhold"
+
+
+@pytest.mark.asyncio
+async def test_async_fs_missing_file(tmp_path: UPath):
+    with pytest.raises(FileNotFoundError):
+        await async_fs.read_bytes(UPath(tmp_path) / "missing")
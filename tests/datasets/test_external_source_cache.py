@@ -0,0 +1,63 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dapla_metadata.datasets.external_sources.cache import TtlLruCache
+
+
+def test_entries_expire():
+    now = [0.0]
+    cache: TtlLruCache[str, int] = TtlLruCache(ttl=10, clock=lambda: now[0])
+    assert cache.get_or_load("a", lambda: 1) == 1
+    now[0] = 9
+    assert cache.get_or_load("a", lambda: 2) == 1
+    now[0] = 10
+    assert "a" not in cache
+    assert cache.get_or_load("a", lambda: 3) == 3
+
+
+def test_least_recently_used_is_evicted():
+    cache: TtlLruCache[str, int] = TtlLruCache(maxsize=2)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("b", lambda: 2)
+    cache.get_or_load("a", lambda: 1)
+    cache.get_or_load("c", lambda: 3)
+    assert "a" in cache
+    assert "b" not in cache
+    assert len(cache) == 2
+
+
+def test_concurrent_loads_share_one_call():
+    cache: TtlLruCache[str, int] = TtlLruCache()
+    calls = []
+    started = threading.Event()
+
+    def loader() -> int:
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return 42
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        first = executor.submit(cache.get_or_load, "key", loader)
+        started.wait()
+        others = [executor.submit(cache.get_or_load, "key", loader) for _ in range(7)]
+        results = [first.result()] + [f.result() for f in others]
+
+    assert results == [42] * 8
+    assert len(calls) == 1
+
+
+def test_failures_are_not_cached():
+    cache: TtlLruCache[str, int] = TtlLruCache()
+
+    def failing() -> int:
+        msg = "unavailable"
+        raise ConnectionError(msg)
+
+    with pytest.raises(ConnectionError):
+        cache.get_or_load("key", failing)
+    assert "key" not in cache
+    assert cache.get_or_load("key", lambda: 1) == 1
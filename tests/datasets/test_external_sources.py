@@ -0,0 +1,117 @@
+import threading
+
+import pytest
+
+from dapla_metadata.datasets.external_sources.external_sources import FetchPolicy
+from dapla_metadata.datasets.external_sources.external_sources import GetExternalSource
+from dapla_metadata.datasets.external_sources.external_sources import (
+    get_external_source_stats,
+)
+from dapla_metadata.datasets.external_sources.external_sources import (
+    reset_external_source_stats,
+)
+
+
+class FakeSource(GetExternalSource[str]):
+    fetch_policy = FetchPolicy(timeout=5, retries=2, backoff=0.01)
+
+    def __init__(self, outcomes=None, key=None, release=None) -> None:
+        """Fetch the outcomes in order, raising the exceptions among them."""
+        self.outcomes = list(outcomes or ["data"])
+        self.attempts = 0
+        self.key = key
+        self.release = release
+        super().__init__()
+
+    def _dedup_key(self):
+        return self.key
+
+    def _fetch_data_from_external_source(self):
+        self.attempts += 1
+        if self.release is not None:
+            self.release.wait(5)
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+@pytest.fixture(autouse=True)
+def _reset_stats():
+    reset_external_source_stats()
+
+
+def test_retries_transient_errors():
+    source = FakeSource([ConnectionError(), TimeoutError(), "data"])
+    assert source.retrieve_external_data() == "data"
+    assert source.attempts == 3
+    stats = get_external_source_stats()["FakeSource"]
+    assert (stats.fetches, stats.retries, stats.failures) == (1, 2, 0)
+
+
+def test_gives_up_after_retries():
+    source = FakeSource([ConnectionError()] * 3)
+    assert source.retrieve_external_data() is None
+    assert source.attempts == 3
+    assert get_external_source_stats()["FakeSource"].failures == 1
+
+
+def test_does_not_retry_other_errors():
+    source = FakeSource([ValueError(), "data"])
+    assert source.retrieve_external_data() is None
+    assert source.attempts == 1
+
+
+def test_backoff_is_exponential_and_capped():
+    policy = FetchPolicy(backoff=0.5, max_backoff=3)
+    assert [policy.delay(a) for a in range(5)] == [0.5, 1, 2, 3, 3]
+
+
+def test_shares_identical_fetches_in_flight():
+    release = threading.Event()
+    first = FakeSource(key="same", release=release)
+    second = FakeSource(key="same", release=release)
+    other = FakeSource(key="other", release=release)
+    release.set()
+    assert first.retrieve_external_data() == "data"
+    assert second.retrieve_external_data() == "data"
+    assert other.retrieve_external_data() == "data"
+    assert (first.attempts, second.attempts, other.attempts) == (1, 0, 1)
+    stats = get_external_source_stats()["FakeSource"]
+    assert (stats.hits, stats.misses, stats.fetches) == (1, 2, 2)
+
+
+def test_does_not_share_finished_fetches():
+    first = FakeSource(key="same")
+    first.wait_for_external_result()
+    second = FakeSource(key="same")
+    assert second.retrieve_external_data() == "data"
+    assert second.attempts == 1
+
+
+def test_timeout():
+    release = threading.Event()
+    source = FakeSource(release=release)
+    assert source.retrieve_external_data(timeout=0.01) is None
+    assert get_external_source_stats()["FakeSource"].timeouts == 1
+    release.set()
+    assert source.retrieve_external_data() == "data"
+
+
+def test_cancel_stops_retries():
+    release = threading.Event()
+    source = FakeSource([ConnectionError()] * 3, release=release)
+    assert source.cancel()
+    release.set()
+    assert source.retrieve_external_data() is None
+    assert source.attempts <= 1
+
+
+def test_cancel_shared_fetch_keeps_it_for_others():
+    release = threading.Event()
+    first = FakeSource(key="same", release=release)
+    second = FakeSource(key="same", release=release)
+    first.cancel()
+    release.set()
+    assert first.retrieve_external_data() is None
+    assert second.retrieve_external_data() == "data"
@@ -0,0 +1,132 @@
+import datetime as dt
+import pathlib
+from collections.abc import Iterator
+from dataclasses import dataclass
+from dataclasses import field
+
+import pandas as pd
+import pytest
+
+from dapla_metadata.datasets import code_list as code_list_module
+from dapla_metadata.datasets.code_list import CodeList
+from dapla_metadata.datasets.code_list import CodeListSource
+from dapla_metadata.datasets.code_list import code_list_cache
+from dapla_metadata.datasets.code_list import set_default_code_list_source
+from dapla_metadata.datasets.klass_snapshot import KlassSnapshotInfo
+from dapla_metadata.datasets.klass_snapshot import KlassSnapshotSource
+from dapla_metadata.datasets.klass_snapshot import KlassSnapshotStore
+from dapla_metadata.datasets.klass_snapshot import main
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+
+@dataclass(eq=False)
+class FakeSource(CodeListSource):
+    calls: list[tuple[int | None, SupportedLanguages, int | None, dt.date | None]] = (
+        field(default_factory=list)
+    )
+
+    def get_codes(self, classification_id, language, level=None, date=None):
+        self.calls.append((classification_id, language, level, date))
+        return pd.DataFrame(
+            {
+                "code": ["A", "01", "02"],
+                "parentCode": [None, "A", "A"],
+                "level": [1, 2, 2],
+                "name": [f"{language}-{classification_id}-{c}" for c in "abc"],
+            }
+        )
+
+
+@pytest.fixture
+def snapshot_store(tmp_path: pathlib.Path) -> Iterator[KlassSnapshotStore]:
+    store = KlassSnapshotStore(tmp_path / "klass" / "snapshot.parquet")
+    store.export([131, 6], source=FakeSource())
+    code_list_cache.clear()
+    yield store
+    code_list_cache.clear()
+
+
+def test_export_fetches_all_languages(tmp_path: pathlib.Path):
+    source = FakeSource()
+    info = KlassSnapshotStore(tmp_path / "snapshot.parquet").export(
+        [6, 131, 6], dt.date(2024, 1, 1), source
+    )
+    assert info.classification_ids == [6, 131]
+    assert info.valid_date == dt.date(2024, 1, 1)
+    assert sorted(source.calls) == sorted(
+        (i, language, None, dt.date(2024, 1, 1))
+        for i in (6, 131)
+        for language in SupportedLanguages
+    )
+
+
+def test_code_list_from_snapshot(snapshot_store, thread_pool_executor):
+    code_list = CodeList(thread_pool_executor, 131, source=snapshot_store.source())
+    code_list.wait_for_external_result()
+    assert [item.code for item in code_list.classifications] == ["A", "01", "02"]
+    assert (
+        code_list.classifications[1].get_title(SupportedLanguages.ENGLISH) == "en-131-b"
+    )
+    assert [item.code for item in code_list.get_children("A")] == ["01", "02"]
+
+
+def test_code_list_level_from_snapshot(snapshot_store, thread_pool_executor):
+    code_list = CodeList(
+        thread_pool_executor, 6, level=2, source=snapshot_store.source()
+    )
+    code_list.wait_for_external_result()
+    assert [item.code for item in code_list.classifications] == ["01", "02"]
+
+
+def test_missing_classification_gives_empty_code_list(
+    snapshot_store, thread_pool_executor
+):
+    code_list = CodeList(thread_pool_executor, 999, source=snapshot_store.source())
+    code_list.wait_for_external_result()
+    assert code_list.classifications == []
+
+
+def test_snapshot_for_other_date(snapshot_store):
+    with pytest.raises(LookupError):
+        snapshot_store.source().get_codes(
+            131, SupportedLanguages.NORSK_BOKMÅL, date=dt.date(2000, 1, 1)
+        )
+
+
+def test_snapshot_freshness(snapshot_store):
+    info = snapshot_store.info()
+    assert info.classification_ids == [6, 131]
+    assert not info.is_stale(dt.timedelta(hours=1))
+    assert info.is_stale(dt.timedelta(0))
+    assert KlassSnapshotInfo.from_json(info.to_json()) == info
+
+
+def test_refresh(snapshot_store):
+    source = FakeSource()
+    assert snapshot_store.refresh(dt.timedelta(hours=1), source) == (
+        snapshot_store.info()
+    )
+    assert source.calls == []
+
+    info = snapshot_store.refresh(source=source)
+    assert info.classification_ids == [6, 131]
+    assert len(source.calls) == 2 * len(SupportedLanguages)
+    assert snapshot_store.info() == info
+
+
+def test_default_source(snapshot_store, thread_pool_executor):
+    previous = code_list_module.get_default_code_list_source()
+    set_default_code_list_source(KlassSnapshotSource(snapshot_store.path))
+    try:
+        code_list = CodeList(thread_pool_executor, 6)
+        code_list.wait_for_external_result()
+    finally:
+        set_default_code_list_source(previous)
+    assert len(code_list.classifications) == 3
+
+
+def test_main_info(snapshot_store, capsys):
+    main(["info", str(snapshot_store.path)])
+    assert KlassSnapshotInfo.from_json(capsys.readouterr().out) == (
+        snapshot_store.info()
+    )
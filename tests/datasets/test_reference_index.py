@@ -0,0 +1,119 @@
+import json
+
+import pytest
+from upath import UPath
+
+from dapla_metadata.datasets.catalog import MetadataCatalog
+from dapla_metadata.datasets.reference_index import Reference
+from dapla_metadata.datasets.reference_index import ReferenceIndex
+from dapla_metadata.datasets.utility.urn import klass_urn_converter
+from dapla_metadata.datasets.utility.urn import vardef_urn_converter
+from tests.datasets.constants import TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH
+from tests.utils.latency_filesystem import LatencyFileSystem
+
+BUCKET = "gs://ssb-my-team-data-produkt-prod"
+PERSON_DOCUMENT = f"{BUCKET}/ifpn/klargjorte_data/person_data_p2021_v1__DOC.json"
+OTHER_DOCUMENT = f"{BUCKET}/sykefra/inndata/sykefravaer_p2022_v1__DOC.json"
+
+VARDEF_ID = "hd8_Ks-9"
+VARDEF_URN = vardef_urn_converter.get_urn(VARDEF_ID)
+VARDEF_URL = f"https://metadata.ssb.no/variable-definitions/{VARDEF_ID}"
+KLASS_URN = klass_urn_converter.get_urn("91")
+KLASS_URL = "https://www.ssb.no/klass/klassifikasjoner/91"
+
+
+def write_document(path: str, owner: str, references: dict[int, dict]) -> None:
+    document = json.loads(TEST_EXISTING_METADATA_NAMING_STANDARD_FILEPATH.read_text())
+    document["datadoc"]["dataset"]["owner"] = owner
+    for position, fields in references.items():
+        document["datadoc"]["variables"][position].update(fields)
+    UPath(path).write_text(json.dumps(document))
+
+
+@pytest.fixture
+def bucket(remote_fs: LatencyFileSystem) -> LatencyFileSystem:
+    write_document(
+        PERSON_DOCUMENT,
+        "team-person",
+        {
+            0: {"definition_uri": VARDEF_URN},
+            2: {"definition_uri": VARDEF_URL, "classification_uri": KLASS_URL},
+        },
+    )
+    write_document(OTHER_DOCUMENT, "team-syk", {1: {"classification_uri": KLASS_URN}})
+    return remote_fs
+
+
+@pytest.fixture
+def index(bucket: LatencyFileSystem):
+    with MetadataCatalog() as catalog:
+        index = ReferenceIndex(catalog)
+        index.update(BUCKET)
+        bucket.reset_calls()
+        yield index
+
+
+@pytest.mark.parametrize("urn", [VARDEF_URN, VARDEF_URL])
+def test_references(index: ReferenceIndex, urn: str):
+    assert index.references(urn) == [
+        Reference(PERSON_DOCUMENT, 0, "fnr", "definition_uri"),
+        Reference(PERSON_DOCUMENT, 2, "bostedskommune", "definition_uri"),
+    ]
+    assert urn in index
+
+
+def test_references_unknown_urn(index: ReferenceIndex):
+    assert index.references(klass_urn_converter.get_urn("1")) == []
+    assert "https://www.vg.no" not in index
+
+
+def test_impact_report(index: ReferenceIndex):
+    report = index.impact_report(KLASS_URL)
+    assert report.urn == KLASS_URN
+    assert [r.document_path for r in report.references] == [
+        PERSON_DOCUMENT,
+        OTHER_DOCUMENT,
+    ]
+    assert report.by_owner() == {
+        "team-person": [PERSON_DOCUMENT],
+        "team-syk": [OTHER_DOCUMENT],
+    }
+    assert report.variables(OTHER_DOCUMENT) == ["sivilstand"]
+
+
+def test_update_reindexes_changed_documents(index: ReferenceIndex):
+    write_document(PERSON_DOCUMENT, "team-person", {})
+    UPath(OTHER_DOCUMENT).unlink()
+    result = index.update(BUCKET)
+
+    assert result.indexed == [PERSON_DOCUMENT]
+    assert index.references(KLASS_URN) == []
+    assert len(index) == 0
+
+
+def test_variables_with_the_same_short_name(index: ReferenceIndex):
+    unnamed = {"short_name": None, "classification_uri": KLASS_URN}
+    write_document(OTHER_DOCUMENT, "team-syk", {0: unnamed, 1: unnamed})
+    index.update(BUCKET)
+    assert [
+        (r.position, r.short_name)
+        for r in index.references(KLASS_URN)
+        if r.document_path == OTHER_DOCUMENT
+    ] == [(0, None), (1, None)]
+
+    write_document(OTHER_DOCUMENT, "team-syk", {})
+    index.update(BUCKET)
+    assert index.references(KLASS_URN) == [
+        Reference(PERSON_DOCUMENT, 2, "bostedskommune", "classification_uri")
+    ]
+
+
+def test_index_is_loaded_from_catalog(bucket: LatencyFileSystem, tmp_path):
+    database = tmp_path / "catalog.sqlite"
+    with MetadataCatalog(database) as catalog:
+        catalog.build(BUCKET)
+    bucket.reset_calls()
+    with MetadataCatalog(database) as catalog:
+        index = ReferenceIndex(catalog)
+        assert bucket.count() == 0
+        assert len(index.references(KLASS_URN)) == 2
@@ -0,0 +1,128 @@
+"""Budgets for the number of round trips to buckets made by public operations."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from upath import UPath
+
+from dapla_metadata.datasets.core import Datadoc
+from dapla_metadata.datasets.dataset_parser import DatasetParser
+from dapla_metadata.datasets.external_sources.external_sources import (
+    SHARED_EXECUTOR_MAX_WORKERS,
+)
+from dapla_metadata.datasets.external_sources.external_sources import shared_executor
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from tests.utils.latency_filesystem import LatencyFileSystem
+from tests.utils.latency_filesystem import RemoteCall
+
+
+def test_records_nested_calls_once(remote_fs: LatencyFileSystem):
+    remote_fs.pipe_file("bucket/file", b"data")
+    assert remote_fs.exists("bucket/file")
+    assert remote_fs.calls == [
+        RemoteCall("pipe_file", "bucket/file"),
+        RemoteCall("exists", "bucket/file"),
+    ]
+
+
+def test_injects_latency():
+    fs = LatencyFileSystem(latency=0.01, method_latency={"open": 0.05})
+    fs.pipe_file("bucket/file", b"data")
+    start = time.perf_counter()
+    with fs.open("bucket/file") as f:
+        f.read()
+    assert time.perf_counter() - start >= 0.05
+    assert fs.count("open") == 1
+
+
+def test_budget_exceeded(remote_fs: LatencyFileSystem):
+    def exists_twice() -> None:
+        with remote_fs.budget(1):
+            remote_fs.exists("bucket/a")
+            remote_fs.exists("bucket/b")
+
+    with pytest.raises(AssertionError, match="2 remote calls exceed the budget of 1"):
+        exists_twice()
+
+
+def test_dataset_parser_budget(remote_fs: LatencyFileSystem, remote_dataset: UPath):
+    parser = DatasetParser.for_file(remote_dataset)
+    with remote_fs.budget(1):
+        parser.get_fields()
+        parser.get_concrete_data_types()
+
+
+@pytest.mark.usefixtures("_mock_timestamp", "_mock_user_info")
+def test_open_dataset_budget(
+    remote_fs: LatencyFileSystem,
+    remote_dataset: UPath,
+    subject_mapping_fake_statistical_structure: StatisticSubjectMapping,
+):
+    with remote_fs.budget(2):
+        Datadoc(
+            remote_dataset,
+            statistic_subject_mapping=subject_mapping_fake_statistical_structure,
+        )
+
+
+def test_open_dataset_with_existing_document_budget(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    with remote_fs.budget(2):
+        Datadoc(
+            remote_datadoc.dataset_path,
+            statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+        )
+
+
+def test_open_document_budget(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    with remote_fs.budget(2):
+        Datadoc(
+            metadata_document_path=remote_datadoc.metadata_document,
+            statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+        )
+
+
+def test_write_document_budget(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    with remote_fs.budget(1) as calls:
+        remote_datadoc.write_metadata_document()
+    assert [c.method for c in calls] == ["open"]
+
+
+def test_open_reads_concurrently(
+    remote_fs: LatencyFileSystem,
+    remote_datadoc: Datadoc,
+):
+    remote_fs.latency = 0.3
+    start = time.perf_counter()
+    Datadoc(
+        remote_datadoc.dataset_path,
+        statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+    )
+    assert remote_fs.count() == 2
+    assert time.perf_counter() - start < 0.55
+
+
+def test_open_is_not_queued_behind_external_sources(remote_datadoc: Datadoc):
+    release = threading.Event()
+    for _ in range(SHARED_EXECUTOR_MAX_WORKERS):
+        shared_executor().submit(release.wait)
+    with ThreadPoolExecutor(1) as executor:
+        opening = executor.submit(
+            Datadoc,
+            remote_datadoc.dataset_path,
+            statistic_subject_mapping=remote_datadoc._statistic_subject_mapping,  # noqa: SLF001
+        )
+        try:
+            assert opening.result(timeout=5).variables
+        finally:
+            release.set()
@@ -0,0 +1,131 @@
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from dapla_metadata.datasets.core import Datadoc
+from dapla_metadata.datasets.tracing import OpenTelemetrySink
+from dapla_metadata.datasets.tracing import Span
+from dapla_metadata.datasets.tracing import Tracer
+from dapla_metadata.datasets.tracing import add_span_sink
+
+
+@pytest.fixture
+def spans():
+    spans: list[Span] = []
+    remove = add_span_sink(spans.append)
+    yield spans
+    remove()
+
+
+def test_tracer_records_nested_spans(spans: list[Span]):
+    tracer = Tracer()
+    with tracer.span("outer", path="a"):
+        for _ in range(2):
+            with tracer.span("inner"):
+                pass
+    assert set(tracer.timings) == {"outer", "inner"}
+    assert tracer.timings["outer"] >= tracer.timings["inner"]
+    assert [(s.name, s.parent) for s in spans] == [
+        ("inner", "outer"),
+        ("inner", "outer"),
+        ("outer", None),
+    ]
+    assert spans[-1].attributes == {"path": "a"}
+    assert tracer.summary().splitlines()[0].startswith("outer")
+
+
+def test_tracers_keep_their_own_parents(spans: list[Span]):
+    first = Tracer()
+    second = Tracer()
+    with first.span("outer"), second.span("other"), first.span("inner"):
+        pass
+    assert [(s.name, s.parent) for s in spans] == [
+        ("inner", "outer"),
+        ("other", None),
+        ("outer", None),
+    ]
+
+
+def test_tracer_records_errors(spans: list[Span]):
+    tracer = Tracer()
+    with pytest.raises(ValueError, match="failed"), tracer.span("failing"):
+        raise ValueError("failed")  # noqa: EM101
+    assert spans[0].error == "ValueError"
+    assert "failing" in tracer.timings
+
+
+def test_failing_sink_does_not_fail_stage(spans: list[Span]):
+    def broken_sink(span: Span):
+        raise RuntimeError(span.name)
+
+    remove = add_span_sink(broken_sink)
+    try:
+        with Tracer().span("stage"):
+            pass
+    finally:
+        remove()
+    assert [s.name for s in spans] == ["stage"]
+
+
+def test_no_sinks_only_records_timings():
+    tracer = Tracer()
+    with tracer.span("stage"):
+        pass
+    assert list(tracer.timings) == ["stage"]
+
+
+@pytest.mark.skipif(
+    importlib.util.find_spec("opentelemetry") is not None,
+    reason="OpenTelemetry is installed",
+)
+def test_open_telemetry_sink_requires_opentelemetry():
+    with pytest.raises(ImportError, match="opentelemetry-api"):
+        OpenTelemetrySink()
+
+
+def test_open_telemetry_sink(mocker):
+    pytest.importorskip("opentelemetry.trace")
+    sink = OpenTelemetrySink()
+    start_span = mocker.patch.object(sink._tracer, "start_span")  # noqa: SLF001
+    sink(Span("stage", start=1.0, duration=0.5, attributes={"path": "a"}))
+    start_time = start_span.call_args.kwargs["start_time"]
+    assert start_span.call_args.kwargs["attributes"] == {"path": "a"}
+    start_span.return_value.end.assert_called_once_with(
+        end_time=start_time + 500_000_000
+    )
+
+
+def test_datadoc_stages(metadata: Datadoc, spans: list[Span]):
+    assert {
+        "open",
+        "extract_dataset",
+        "subject_mapping",
+        "schema_read",
+        "defaults",
+        "urn_conversion",
+    } <= set(metadata.tracer.timings)
+    metadata.write_metadata_document()
+    assert [s.name for s in spans] == [
+        "write_validate",
+        "write_serialize",
+        "write_file",
+        "write",
+    ]
+    assert {"open", "write"} <= {
+        line.split()[0] for line in metadata.tracer.summary().splitlines()
+    }
+
+
+def test_tracer_spans_in_threads(spans: list[Span]):
+    tracer = Tracer()
+
+    def worker() -> None:
+        with tracer.span("worker"):
+            pass
+
+    with tracer.span("outer"), ThreadPoolExecutor() as executor:
+        for _ in range(4):
+            executor.submit(worker)
+    assert set(tracer.timings) == {"outer", "worker"}
+    assert [s.parent for s in spans if s.name == "worker"] == [None] * 4
@@ -0,0 +1,123 @@
+import re
+
+import pytest
+from datadoc_model.all_optional import model
+
+from dapla_metadata.datasets import Datadoc
+from dapla_metadata.datasets.utility.constants import DAEAD_ENCRYPTION_KEY_REFERENCE
+from dapla_metadata.datasets.utility.enums import EncryptionAlgorithm
+from dapla_metadata.datasets.utility.utils import set_default_values_pseudonymizations
+
+INTEGER_VARIABLES = ["alm_inntekt", "sykepenger", "ber_bruttoformue"]
+INTEGER_PATTERN = re.compile(r"alm_inntekt|sykepenger|ber_\w+")
+
+
+@pytest.mark.parametrize(
+    "selector",
+    [
+        "*inn*",
+        INTEGER_PATTERN,
+        lambda v: v.data_type == "INTEGER",
+    ],
+)
+def test_update_variables_selectors(metadata: Datadoc, selector):
+    changes = metadata.update_variables(selector, unit_type="PERSON")
+    selected = list(changes.changed)
+    assert all(metadata.variables_lookup[s].unit_type == "PERSON" for s in selected)
+    assert "pers_id" not in selected
+
+
+def test_update_variables(metadata: Datadoc):
+    changes = metadata.update_variables(
+        lambda v: v.data_type == "INTEGER",
+        is_personal_data=True,
+        temporality_type="EVENT",
+        name=[{"languageCode": "nb", "languageText": "Beløp"}],
+    )
+    assert changes.changed == {
+        s: ["is_personal_data", "temporality_type", "name"] for s in INTEGER_VARIABLES
+    }
+    variables = [metadata.variables_lookup[s] for s in INTEGER_VARIABLES]
+    assert all(v.temporality_type == "EVENT" for v in variables)
+    assert variables[0] is metadata.variables[3]
+    # Each variable has its own copy of nested values
+    assert variables[0].name is not variables[1].name
+
+
+def test_update_variables_reports_unchanged(metadata: Datadoc):
+    metadata.update_variables("sykepenger", unit_type="PERSON")
+    changes = metadata.update_variables(INTEGER_PATTERN, unit_type="PERSON")
+    assert list(changes.changed) == ["alm_inntekt", "ber_bruttoformue"]
+    assert changes.unchanged == ["sykepenger"]
+
+
+def test_update_variables_keeps_index_consistent(metadata: Datadoc):
+    metadata.update_variables("fullf_utdanning", variable_role="IDENTIFIER")
+    assert [v.short_name for v in metadata.find(variable_role="IDENTIFIER")] == [
+        "fullf_utdanning"
+    ]
+
+
+@pytest.mark.parametrize(
+    ("fields", "match"),
+    [
+        ({"unit_typ": "PERSON"}, "'unit_typ' is not a field of variables"),
+        ({"short_name": "x"}, "Can't change the short name"),
+        ({"temporality_type": "ALLTID"}, "Invalid value for temporality_type"),
+    ],
+)
+def test_update_variables_errors(metadata: Datadoc, fields: dict, match: str):
+    before = list(metadata.variables)
+    with pytest.raises(ValueError, match=match):
+        metadata.update_variables("*", **fields)
+    assert metadata.variables == before
+
+
+def test_bulk_add_pseudonymization(metadata: Datadoc):
+    metadata.add_pseudonymization("alm_inntekt")
+    pseudonymization = model.Pseudonymization(
+        encryption_algorithm=EncryptionAlgorithm.DAEAD_ENCRYPTION_ALGORITHM.value
+    )
+    changes = metadata.bulk_add_pseudonymization(INTEGER_PATTERN, pseudonymization)
+
+    assert list(changes.changed) == ["sykepenger", "ber_bruttoformue"]
+    assert changes.unchanged == ["alm_inntekt"]
+    added = metadata.variables_lookup["ber_bruttoformue"].pseudonymization
+    assert added
+    assert added is not pseudonymization
+    assert added.encryption_key_reference == DAEAD_ENCRYPTION_KEY_REFERENCE
+    assert pseudonymization.encryption_key_reference is None
+    assert [v.short_name for v in metadata.find(pseudonymized=True)] == [
+        "alm_inntekt",
+        "sykepenger",
+        "ber_bruttoformue",
+    ]
+
+
+def test_bulk_add_empty_pseudonymization_when_validating_required_fields(
+    metadata: Datadoc,
+):
+    metadata.validate_required_fields_on_existing_metadata = True
+    with pytest.raises(ValueError, match="Can't add empty pseudonymization"):
+        metadata.bulk_add_pseudonymization("*")
+
+
+def test_set_default_values_pseudonymizations_computes_defaults_once(mocker):
+    get_current_date = mocker.patch(
+        "dapla_metadata.datasets.utility.utils.get_current_date",
+        return_value="2025-01-01",
+    )
+    variables = [model.Variable(short_name=f"fnr_{i}") for i in range(3)]
+    pseudonymized = set_default_values_pseudonymizations(
+        variables,
+        model.Pseudonymization(
+            encryption_algorithm=EncryptionAlgorithm.PAPIS_ENCRYPTION_ALGORITHM.value,
+            stable_identifier_type="FREG_SNR",
+        ),
+    )
+    assert pseudonymized == variables
+    assert get_current_date.call_count == 1
+    parameters = [v.pseudonymization.encryption_algorithm_parameters for v in variables]  # type: ignore [union-attr]
+    assert parameters[0] == parameters[2]
+    assert parameters[0] is not parameters[2]
+    assert {"snapshotDate": "2025-01-01"} in parameters[0]
@@ -1,12 +1,14 @@
 import logging
 
 import datadoc_model.all_optional.model as all_optional_model
+import pyarrow as pa
 import pytest
 from pydantic import AnyUrl
 from typeguard import suppress_type_checks  # type: ignore [import-not-found]
 
 from dapla_metadata.datasets.core import Datadoc
 from dapla_metadata.datasets.utility.urn import URN_ERROR_MESSAGE_BASE
+from dapla_metadata.datasets.utility.urn import CombinedUrnConverter
 from dapla_metadata.datasets.utility.urn import ReferenceUrlTypes
 from dapla_metadata.datasets.utility.urn import SsbNaisDomains
 from dapla_metadata.datasets.utility.urn import UrlVisibility
@@ -283,3 +285,37 @@ def test_klass_get_id(urn_or_url: str | AnyUrl, identifier: str | None):
 @suppress_type_checks
 def test_klass_is_id(identifier: str, expected: bool):
     assert klass_urn_converter.is_id(identifier) is expected
+
+
+@pytest.mark.parametrize(
+    ("case", "expected_result", "expect_warning"),
+    [
+        *VARIABLE_DEFINITION_URN_TEST_CASES,
+        *CLASSIFICATION_URN_TEST_CASES,
+        ("https://www.vg.no", None, True),
+    ],
+)
+def test_combined_converter(
+    case: str,
+    expected_result: AnyUrl | None,
+    expect_warning: bool,  # noqa: ARG001
+):
+    combined = CombinedUrnConverter([vardef_urn_converter, klass_urn_converter])
+    assert combined.convert_url_to_urn(case) == expected_result
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        [c for c, _, _ in CLASSIFICATION_URN_TEST_CASES[:3]]
+        + ["https://www.vg.no", None, ""],
+        pa.array(
+            [str(c) for c, _, _ in CLASSIFICATION_URN_TEST_CASES[:3]]
+            + ["https://www.vg.no", None, ""]
+        ),
+    ],
+)
+def test_convert_many(values: list[str | None] | pa.Array):
+    result = CombinedUrnConverter([klass_urn_converter]).convert_many(values)
+    assert result.urns == [EXAMPLE_KLASS_URN] * 3 + [None, None, None]
+    assert result.error_indices == [3]
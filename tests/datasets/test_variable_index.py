@@ -0,0 +1,174 @@
+import pytest
+from datadoc_model.all_optional import model
+
+from dapla_metadata.datasets import Datadoc
+from dapla_metadata.datasets.variable_index import VariableIndex
+from dapla_metadata.datasets.variable_index import is_missing
+
+DEFINITION_URN = "urn:ssb:variable-definition:vardef:ab12cd34"
+
+
+@pytest.fixture
+def index() -> VariableIndex:
+    return VariableIndex(
+        [
+            model.Variable(
+                short_name="a",
+                data_type=model.DataType.FLOAT,
+                variable_role=model.VariableRole.MEASURE,
+                definition_uri=DEFINITION_URN,
+            ),
+            model.Variable(short_name=None),
+            model.Variable(
+                short_name="b",
+                data_type=model.DataType.FLOAT,
+                variable_role=model.VariableRole.IDENTIFIER,
+                unit_type="kg",
+            ),
+            model.Variable(
+                short_name="c",
+                data_type=model.DataType.STRING,
+                pseudonymization=model.Pseudonymization(),
+            ),
+        ]
+    )
+
+
+def short_names(variables) -> list[str]:
+    return [v.short_name for v in variables]
+
+
+@pytest.mark.parametrize(
+    ("criteria", "expected"),
+    [
+        ({}, ["a", "b", "c"]),
+        ({"data_type": model.DataType.FLOAT}, ["a", "b"]),
+        ({"data_type": "FLOAT", "variable_role": "IDENTIFIER"}, ["b"]),
+        ({"definition_uri": DEFINITION_URN}, ["a"]),
+        ({"pseudonymized": True}, ["c"]),
+        ({"pseudonymized": False}, ["a", "b"]),
+        ({"classification_uri": "urn:ssb:classification:klass:1"}, []),
+        ({"data_type": "FLOAT", "missing": "unit_type"}, ["a"]),
+        ({"missing": ["unit_type", "definition_uri"]}, ["c"]),
+    ],
+)
+def test_find(index: VariableIndex, criteria: dict, expected: list[str]):
+    assert short_names(index.find(**criteria)) == expected
+
+
+def test_position(index: VariableIndex):
+    assert index.position("b") == 2
+
+
+def test_replace(index: VariableIndex):
+    index.replace("a", model.Variable(short_name="a", data_type=model.DataType.BOOLEAN))
+    assert short_names(index.find(data_type="FLOAT")) == ["b"]
+    assert short_names(index.find(data_type="BOOLEAN")) == ["a"]
+    assert list(index) == ["a", "b", "c"]
+
+
+def test_reindex(index: VariableIndex):
+    index.by_short_name["c"].pseudonymization = None
+    index.reindex("c")
+    assert index.find(pseudonymized=True) == []
+
+
+def test_find_picks_up_direct_changes(index: VariableIndex):
+    index.by_short_name["a"].data_type = model.DataType.BOOLEAN
+    index.by_short_name["c"].pseudonymization = None
+    assert short_names(index.find(data_type="FLOAT")) == ["b"]
+    assert short_names(index.find(data_type="BOOLEAN")) == ["a"]
+    assert index.find(pseudonymized=True) == []
+    assert short_names(index.find(pseudonymized=False)) == ["a", "b", "c"]
+
+
+def test_find_picks_up_changed_short_names(index: VariableIndex):
+    index.by_short_name["a"].short_name = "x"
+    index.by_short_name["c"].short_name = None
+    assert short_names(index.find(data_type="FLOAT")) == ["x", "b"]
+    assert list(index) == ["x", "b"]
+    assert index.position("x") == 0
+    assert "c" not in index
+
+
+def test_not_indexed_field(index: VariableIndex):
+    with pytest.raises(ValueError, match="'unit_type' is not indexed"):
+        index.find(unit_type="kg")
+
+
+def test_unknown_missing_field(index: VariableIndex):
+    with pytest.raises(ValueError, match="'unknown' is not a field of variables"):
+        index.find(missing="unknown")
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, True),
+        ("", False),
+        (model.LanguageStringType([]), True),
+        (
+            model.LanguageStringType(
+                [model.LanguageStringTypeItem(languageCode="nb", languageText="")]
+            ),
+            True,
+        ),
+        (
+            model.LanguageStringType(
+                [model.LanguageStringTypeItem(languageCode="nb", languageText="Navn")]
+            ),
+            False,
+        ),
+    ],
+)
+def test_is_missing(value, expected: bool):
+    assert is_missing(value) is expected
+
+
+def test_datadoc_find(metadata: Datadoc):
+    assert short_names(metadata.find(data_type="INTEGER")) == [
+        "alm_inntekt",
+        "sykepenger",
+        "ber_bruttoformue",
+    ]
+    assert metadata.find(pseudonymized=True) == []
+
+
+def test_datadoc_index_follows_pseudonymization(metadata: Datadoc):
+    metadata.add_pseudonymization("pers_id")
+    assert short_names(metadata.find(pseudonymized=True)) == ["pers_id"]
+    metadata.remove_pseudonymization("pers_id")
+    assert metadata.find(pseudonymized=True) == []
+
+
+def test_datadoc_index_follows_replaced_variables(metadata: Datadoc):
+    metadata._update_variable(  # noqa: SLF001
+        "sivilstand",
+        model.Variable(
+            short_name="sivilstand",
+            data_type=model.DataType.STRING,
+            definition_uri=DEFINITION_URN,
+        ),
+    )
+    found = metadata.find(definition_uri=DEFINITION_URN)
+    assert short_names(found) == ["sivilstand"]
+    assert found[0] is metadata.variables[2]
+    assert found[0] is metadata.variables_lookup["sivilstand"]
+
+
+def test_datadoc_reindex_variable(metadata: Datadoc):
+    metadata.variables_lookup["tidspunkt"].variable_role = model.VariableRole.START_TIME
+    metadata.reindex_variable("tidspunkt")
+    assert short_names(metadata.find(variable_role="START_TIME")) == ["tidspunkt"]
+
+
+def test_datadoc_find_picks_up_direct_changes(metadata: Datadoc):
+    metadata.variables[0].data_type = model.DataType.FLOAT
+    assert short_names(metadata.find(data_type="FLOAT")) == [
+        metadata.variables[0].short_name
+    ]
+
+
+def test_datadoc_variables_lookup_is_read_only(metadata: Datadoc):
+    with pytest.raises(TypeError):
+        metadata.variables_lookup["ny"] = model.Variable(short_name="ny")  # type: ignore [index]
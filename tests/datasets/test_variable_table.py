@@ -0,0 +1,124 @@
+import datetime as dt
+
+import pyarrow as pa
+import pytest
+from datadoc_model.all_optional import model
+
+from dapla_metadata.datasets import Datadoc
+from dapla_metadata.datasets.utility.enums import EncryptionAlgorithm
+from dapla_metadata.datasets.variable_table import VARIABLES_SCHEMA
+from dapla_metadata.datasets.variable_table import variables_to_arrow
+
+
+def test_variables_to_arrow_round_trip(metadata: Datadoc):
+    metadata.add_pseudonymization(
+        "pers_id",
+        model.Pseudonymization(
+            encryption_algorithm=EncryptionAlgorithm.PAPIS_ENCRYPTION_ALGORITHM.value,
+            pseudonymization_time=dt.datetime(2025, 1, 1, tzinfo=dt.UTC),
+        ),
+    )
+    metadata.variables_lookup["sivilstand"].name = model.LanguageStringType(
+        [
+            model.LanguageStringTypeItem(languageCode="nb", languageText="Sivilstand"),
+            model.LanguageStringTypeItem(languageCode="en", languageText="Status"),
+        ]
+    )
+    table = metadata.variables_to_arrow()
+
+    assert table.schema == VARIABLES_SCHEMA
+    assert table.num_rows == len(metadata.variables)
+    assert table.column("short_name").to_pylist()[:3] == [
+        "pers_id",
+        "tidspunkt",
+        "sivilstand",
+    ]
+    assert table.column("name_en").to_pylist()[2] == "Status"
+    assert table.column("name_nn").to_pylist()[2] is None
+    pseudonymization = table.column("pseudonymization").to_pylist()[0]
+    assert pseudonymization
+    assert pseudonymization["encryption_algorithm"] == "TINK-FPE"
+    assert pseudonymization["encryption_algorithm_parameters"]
+
+    assert not metadata.variables_from_arrow(table)
+
+
+def test_variables_from_arrow(metadata: Datadoc):
+    table = pa.table(
+        {
+            "short_name": ["sykepenger", "pers_id"],
+            "name_nb": ["Sykepenger", None],
+            "unit_type": ["PERSON", "PERSON"],
+            "is_personal_data": [False, True],
+        }
+    )
+    changes = metadata.variables_from_arrow(table)
+
+    assert changes.changed == {
+        "sykepenger": ["name", "unit_type"],
+        "pers_id": ["is_personal_data", "unit_type"],
+    }
+    sykepenger = metadata.variables_lookup["sykepenger"]
+    assert sykepenger is metadata.variables[4]
+    assert sykepenger.name == model.LanguageStringType(
+        [model.LanguageStringTypeItem(languageCode="nb", languageText="Sykepenger")]
+    )
+    assert sykepenger.unit_type == "PERSON"
+    assert [v.short_name for v in metadata.find(data_type="INTEGER")][1] == (
+        "sykepenger"
+    )
+
+
+def test_variables_from_arrow_merge_on_id(metadata: Datadoc):
+    ids = variables_to_arrow(metadata.variables).column("id").to_pylist()[:1]
+    table = pa.table({"id": ids, "format": ["fnr"]})
+    changes = metadata.variables_from_arrow(table, merge_on="id")
+    assert changes.changed == {"pers_id": ["format"]}
+
+
+def test_variables_from_arrow_from_pandas(metadata: Datadoc):
+    df = metadata.variables_to_arrow().to_pandas()
+    df.loc[df["data_type"] == "INTEGER", "measurement_unit"] = "NOK"
+    changes = metadata.variables_from_arrow(
+        pa.Table.from_pandas(
+            df[["short_name", "measurement_unit"]], preserve_index=False
+        )
+    )
+    assert list(changes.changed) == ["alm_inntekt", "sykepenger", "ber_bruttoformue"]
+    assert len(changes.unchanged) == len(metadata.variables) - len(changes.changed)
+
+
+@pytest.mark.parametrize(
+    ("table", "merge_on", "match"),
+    [
+        (pa.table({"short_name": ["ukjent"]}), "short_name", "No variables with"),
+        (pa.table({"short_name": ["pers_id"], "navn": ["x"]}), "short_name", "navn"),
+        (pa.table({"unit_type": ["PERSON"]}), "short_name", "no short_name column"),
+        (pa.table({"short_name": ["pers_id", "pers_id"]}), "short_name", "same"),
+        (pa.table({"short_name": ["pers_id"]}), "name", "Can only merge on"),
+        (
+            pa.table({"short_name": ["pers_id"], "data_type": ["TEKST"]}),
+            "short_name",
+            "validation error",
+        ),
+        (
+            pa.table({"short_name": ["pers_id"], "contains_data_from": ["i fjor"]}),
+            "short_name",
+            "don't match the types",
+        ),
+    ],
+)
+def test_variables_from_arrow_errors(
+    metadata: Datadoc, table: pa.Table, merge_on: str, match: str
+):
+    before = metadata.variables_to_arrow()
+    with pytest.raises(ValueError, match=match):
+        metadata.variables_from_arrow(table, merge_on=merge_on)
+    assert metadata.variables_to_arrow() == before
+
+
+def test_variables_from_arrow_short_name_is_kept(metadata: Datadoc):
+    ids = variables_to_arrow(metadata.variables).column("id").to_pylist()[:1]
+    table = pa.table({"id": ids, "short_name": ["fnr"]})
+    with pytest.raises(ValueError, match="Can't change the short name of pers_id"):
+        metadata.variables_from_arrow(table, merge_on="id")
@@ -14,6 +14,7 @@ from dapla_metadata.standards.utils.constants import MISSING_PERIOD
 from dapla_metadata.standards.utils.constants import MISSING_SHORT_NAME
 from dapla_metadata.standards.utils.constants import NAME_STANDARD_SUCCESS
 from dapla_metadata.standards.utils.constants import NAME_STANDARD_VIOLATION
+from dapla_metadata.standards.utils.constants import PARTITIONED_DATASET
 from dapla_metadata.standards.utils.constants import PATH_IGNORED
 
 pytest_plugins = ("pytest_asyncio",)
@@ -392,3 +393,75 @@ async def test_generate_naming_standard_report_failure(tmp_path):
         assert report.num_failures == 5
         assert report.num_files_validated == 5
         assert report.num_success == 0
+
+
+@pytest.mark.parametrize(
+    ("dataset_path", "partitions", "success"),
+    [
+        (
+            "buckets/produkt/ledstill/inndata/skjema_p2018_p2020_v1",
+            ["aar=2018", "aar=2019", "aar=2020"],
+            True,
+        ),
+        (
+            "buckets/produkt/ledstill/inndata/skjema_v1",
+            ["aar=2018/mnd=01", "aar=2018/mnd=02"],
+            False,
+        ),
+    ],
+)
+@pytest.mark.asyncio
+async def test_partitioned_dataset_validated_once(
+    dataset_path: str,
+    partitions: list[str],
+    success: bool,
+    tmp_path: Path,
+):
+    for partition in partitions:
+        partition_dir = tmp_path / dataset_path / partition
+        partition_dir.mkdir(parents=True, exist_ok=True)
+        for part in ["part-0.parquet", "part-1.parquet"]:
+            (partition_dir / part).touch()
+    (tmp_path / "buckets/produkt/ledstill/inndata/annet_p2021_v1.parquet").touch()
+
+    results = await check_naming_standard(tmp_path / "buckets/produkt")
+
+    assert len(results) == 2
+    result = next(r for r in results if r.file_path.endswith(dataset_path))
+    assert result.success is success
+    assert result.partition_count == len({p.split("/")[0] for p in partitions})
+    assert PARTITIONED_DATASET in result.messages
+    assert result.to_dict()["partition_count"] == result.partition_count
+
+
+@pytest.mark.asyncio
+async def test_partitioned_dataset_ignores_hidden_files(tmp_path: Path):
+    dataset = tmp_path / "buckets/produkt/ledstill/inndata/skjema_p2018_v1"
+    (dataset / "aar=2018").mkdir(parents=True)
+    (dataset / "aar=2018/part-0.parquet").touch()
+    (dataset / "_SUCCESS").touch()
+
+    [result] = await check_naming_standard(tmp_path / "buckets/produkt")
+
+    assert result.file_path.endswith("skjema_p2018_v1")
+    assert result.partition_count == 1
+
+
+@pytest.mark.asyncio
+async def test_directory_with_partitions_and_other_children(tmp_path: Path):
+    directory = tmp_path / "buckets/produkt/ledstill/inndata"
+    (directory / "aar=2018").mkdir(parents=True)
+    (directory / "aar=2018/part-0.parquet").touch()
+    (directory / "annet_p2021_v1.parquet").touch()
+    (directory / "eldre").mkdir()
+    (directory / "eldre/gammel_p2019_v1.parquet").touch()
+
+    results = await check_naming_standard(tmp_path / "buckets/produkt")
+
+    validated = sorted(Path(r.file_path).name for r in results)
+    assert validated == [
+        "annet_p2021_v1.parquet",
+        "gammel_p2019_v1.parquet",
+        "part-0.parquet",
+    ]
+    assert all(PARTITIONED_DATASET not in r.messages for r in results)
@@ -0,0 +1,138 @@
+import json
+from pathlib import Path
+
+import pytest
+from pyarrow import parquet as pq
+
+from dapla_metadata.standards.name_validator import NamingStandardReport
+from dapla_metadata.standards.name_validator import StreamingNamingStandardReport
+from dapla_metadata.standards.name_validator import ValidationResult
+from dapla_metadata.standards.standard_validators import check_naming_standard
+from dapla_metadata.standards.standard_validators import (
+    generate_streaming_validation_report,
+)
+from dapla_metadata.standards.utils.constants import MISSING_PERIOD
+from dapla_metadata.standards.utils.constants import MISSING_SHORT_NAME
+from dapla_metadata.standards.utils.constants import NAME_STANDARD_VIOLATION
+
+pytest_plugins = ("pytest_asyncio",)
+
+BUCKET = "buckets/ssb-dapla-example-data-produkt-prod"
+
+FILE_PATHS = [
+    "ledstill/inndata/skjema_p1988_v1.parquet",
+    "ledstill/klargjorte_data/park_p2021-12-31_p2021-12-31_v1.parquet",
+    "ledstill/utdata/editert_v1.parquet",
+    "sykefra/inndata/skjema_p2020_v1.parquet",
+    "inndata/skjema_v2.parquet",
+]
+
+
+@pytest.fixture
+def bucket(tmp_path: Path) -> Path:
+    for file_path in FILE_PATHS:
+        full_path = tmp_path / BUCKET / file_path
+        full_path.parent.mkdir(parents=True, exist_ok=True)
+        full_path.touch()
+    return tmp_path / BUCKET
+
+
+def make_result(file_path: str, violations: list[str]) -> ValidationResult:
+    result = ValidationResult(success=not violations, file_path=file_path)
+    for v in violations:
+        result.add_violation(v)
+    if violations:
+        result.add_message(NAME_STANDARD_VIOLATION)
+    return result
+
+
+@pytest.mark.asyncio
+async def test_streaming_report_matches_report(bucket: Path):
+    results = await check_naming_standard(bucket)
+    expected = NamingStandardReport(results)
+
+    report = await generate_streaming_validation_report(bucket)
+
+    assert report.num_files_validated == expected.num_files_validated
+    assert report.num_success == expected.num_success
+    assert report.num_failures == expected.num_failures
+    assert report.generate_report() == expected.generate_report()
+    assert sorted(r.to_dict()["file_path"] for r in report.iter_results()) == sorted(
+        r.file_path for r in results
+    )
+
+
+@pytest.mark.asyncio
+async def test_streaming_report_directories(bucket: Path):
+    report = await generate_streaming_validation_report(bucket)
+    assert set(report.directories) == {"ledstill", "sykefra", "inndata"}
+    assert report.directories["ledstill"].num_files_validated == 3
+    assert report.directories["ledstill"].num_success == 2
+    assert report.directories["sykefra"].num_success == 1
+    assert report.directories["inndata"].violation_counts[MISSING_SHORT_NAME] == 1
+
+    deeper = await generate_streaming_validation_report(bucket, directory_depth=2)
+    assert "ledstill/inndata" in deeper.directories
+
+
+def test_streaming_report_counts_violations():
+    report = StreamingNamingStandardReport("gs://bucket")
+    report.extend(
+        [
+            make_result("gs://bucket/a/inndata/x_v1.parquet", [MISSING_PERIOD]),
+            make_result(
+                "gs://bucket/a/y_v1.parquet", [MISSING_PERIOD, MISSING_SHORT_NAME]
+            ),
+            make_result("gs://bucket/b/inndata/z_p2020_v1.parquet", []),
+        ]
+    )
+    assert report.violation_counts == {MISSING_PERIOD: 2, MISSING_SHORT_NAME: 1}
+    assert report.directories["a"].num_failures == 2
+    assert report.directories["b"].success_rate() == 100
+    assert report.summary()["directories"]["a"]["violation_counts"] == {
+        MISSING_PERIOD: 2,
+        MISSING_SHORT_NAME: 1,
+    }
+    assert "b: 1/1 (100.00%)" in report.generate_directory_report()
+
+
+def test_streaming_report_round_trip():
+    report = StreamingNamingStandardReport("gs://bucket")
+    original = [
+        make_result("gs://bucket/a/y_v1.parquet", [MISSING_SHORT_NAME, MISSING_PERIOD]),
+        make_result("gs://bucket/b/inndata/z_p2020_v1.parquet", []),
+        ValidationResult(
+            success=True,
+            file_path="gs://bucket/b/inndata/w_p2020_v1",
+            partition_count=3,
+        ),
+    ]
+    report.extend(original)
+    assert [r.to_dict() for r in report.iter_results()] == [
+        r.to_dict() for r in original
+    ]
+
+
+def test_streaming_report_export(tmp_path: Path):
+    report = StreamingNamingStandardReport("gs://bucket")
+    report.add(make_result("gs://bucket/a/y_v1.parquet", [MISSING_PERIOD]))
+    partitioned = make_result("gs://bucket/b/inndata/z_p2020_v1", [])
+    partitioned.partition_count = 3
+    report.add(partitioned)
+
+    report.to_jsonl(tmp_path / "report.jsonl")
+    lines = (tmp_path / "report.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == list(report.iter_rows())
+
+    report.to_parquet(tmp_path / "report.parquet")
+    table = pq.read_table(tmp_path / "report.parquet")
+    assert table.num_rows == 2
+    assert table.column("directory").to_pylist() == ["a", "b"]
+    assert table.column("violations").to_pylist() == [[MISSING_PERIOD], []]
+    assert table.column("partition_count").to_pylist() == [None, 3]
+
+
+def test_streaming_report_empty():
+    report = StreamingNamingStandardReport()
+    assert report.success_rate() is None
+    assert report.to_arrow().num_rows == 0
@@ -0,0 +1,122 @@
+import os
+
+import pytest
+from upath import UPath
+
+from dapla_metadata._shared import config
+from dapla_metadata._shared.config import DAPLA_ENVIRONMENT
+from dapla_metadata._shared.config import DAPLA_GROUP_CONTEXT
+from dapla_metadata._shared.config import DAPLA_REGION
+from dapla_metadata._shared.config import ConfigSnapshot
+from dapla_metadata._shared.enums import DaplaEnvironment
+from dapla_metadata._shared.enums import DaplaRegion
+from dapla_metadata.datasets.utility.urn import ReferenceUrlTypes
+from dapla_metadata.datasets.utility.urn import vardef_urn_converter
+
+
+@pytest.fixture
+def change_hooks(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "_change_hooks", [])
+
+
+@pytest.fixture
+def dotenv_file(monkeypatch: pytest.MonkeyPatch, mocker, tmp_path) -> UPath:
+    mocker.patch.dict(os.environ)
+    path = UPath(tmp_path) / ".env"
+    monkeypatch.setattr(config, "DOT_ENV_FILE_PATH", path)
+    monkeypatch.setattr(config, "dotenv_checked", False)
+    monkeypatch.setattr(config, "_dotenv_items", set())
+    return path
+
+
+def test_config_snapshot_typed_accessors():
+    snapshot = ConfigSnapshot(
+        {
+            DAPLA_REGION: DaplaRegion.DAPLA_LAB.value,
+            DAPLA_ENVIRONMENT: DaplaEnvironment.TEST.value,
+            DAPLA_GROUP_CONTEXT: "dapla-metadata-developers",
+        }
+    )
+    assert snapshot.dapla_region == DaplaRegion.DAPLA_LAB
+    assert snapshot.dapla_environment == DaplaEnvironment.TEST
+    assert snapshot.dapla_service is None
+    assert snapshot.dapla_group_context == "dapla-metadata-developers"
+    assert (
+        snapshot.statistical_subject_source_url
+        == config.DATADOC_STATISTICAL_SUBJECT_SOURCE_URL_DEFAULT
+    )
+    with pytest.raises(OSError, match="OIDC_TOKEN"):
+        snapshot.get(config.OIDC_TOKEN, raising=True)
+
+
+def test_config_snapshot_is_kept_until_reload(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(DAPLA_ENVIRONMENT, DaplaEnvironment.TEST.value)
+    snapshot = config.get_config()
+    assert config.get_config() is snapshot
+
+    monkeypatch.setenv(DAPLA_ENVIRONMENT, DaplaEnvironment.PROD.value)
+    assert config.get_config().dapla_environment == DaplaEnvironment.TEST
+    assert config.reload_config().dapla_environment == DaplaEnvironment.PROD
+    assert config.get_config().dapla_environment == DaplaEnvironment.PROD
+
+
+@pytest.mark.usefixtures("change_hooks")
+def test_config_change_hook(monkeypatch: pytest.MonkeyPatch):
+    changes = []
+    unregister = config.on_config_change(
+        lambda previous, current: changes.append(current.changed_items(previous))
+    )
+    config.get_config()
+    config.reload_config()
+    assert changes == []
+
+    monkeypatch.setenv(DAPLA_GROUP_CONTEXT, "changed-group-developers")
+    config.reload_config()
+    assert changes == [{DAPLA_GROUP_CONTEXT}]
+
+    unregister()
+    monkeypatch.delenv(DAPLA_GROUP_CONTEXT)
+    config.reload_config()
+    assert len(changes) == 1
+
+
+def test_reload_reads_dotenv_file_again(
+    dotenv_file: UPath, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setenv(DAPLA_REGION, DaplaRegion.DAPLA_LAB.value)
+    assert config.get_config().dapla_environment is None
+
+    dotenv_file.write_text(
+        f"{DAPLA_ENVIRONMENT}={DaplaEnvironment.TEST.value}\n"
+        f"{DAPLA_REGION}={DaplaRegion.CLOUD_RUN.value}\n"
+    )
+    assert config.get_config().dapla_environment is None
+    snapshot = config.reload_config()
+    assert snapshot.dapla_environment == DaplaEnvironment.TEST
+    assert snapshot.dapla_region == DaplaRegion.DAPLA_LAB
+
+    dotenv_file.write_text(f"{DAPLA_ENVIRONMENT}={DaplaEnvironment.PROD.value}\n")
+    assert config.reload_config().dapla_environment == DaplaEnvironment.PROD
+
+
+def test_get_url_uses_config_snapshot(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv(DAPLA_ENVIRONMENT, DaplaEnvironment.TEST.value)
+    url = vardef_urn_converter.get_url("a", ReferenceUrlTypes.FRONTEND)
+    assert url
+    assert ".test." in url
+
+    monkeypatch.setenv(DAPLA_ENVIRONMENT, DaplaEnvironment.PROD.value)
+    assert vardef_urn_converter.get_url("a", ReferenceUrlTypes.FRONTEND) == url
+    config.reload_config()
+    assert vardef_urn_converter.get_url("a", ReferenceUrlTypes.FRONTEND) != url
+
+
+def test_dotenv_file_is_checked_once(monkeypatch: pytest.MonkeyPatch, mocker):
+    monkeypatch.setattr(config, "dotenv_checked", False)
+    exists = mocker.patch.object(
+        type(config.DOT_ENV_FILE_PATH), "exists", return_value=False
+    )
+    for _ in range(3):
+        config.get_config_item(DAPLA_REGION)
+        config.get_config()
+    assert exists.call_count == 1
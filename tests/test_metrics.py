@@ -0,0 +1,124 @@
+import shutil
+from pathlib import Path
+
+import pytest
+import urllib3
+
+from dapla_metadata import metrics
+from dapla_metadata.datasets.core import Datadoc
+from dapla_metadata.datasets.statistic_subject_mapping import StatisticSubjectMapping
+from dapla_metadata.metrics import HistogramValue
+from dapla_metadata.metrics import MetricsRegistry
+from dapla_metadata.variable_definitions._generated.vardef_client.configuration import (
+    Configuration,
+)
+from dapla_metadata.variable_definitions._utils._client import VARDEF_REQUESTS
+from dapla_metadata.variable_definitions._utils._client import (
+    InstrumentedRESTClientObject,
+)
+from tests.datasets.constants import TEST_PARQUET_FILE_NAME
+from tests.datasets.constants import TEST_PARQUET_FILEPATH
+
+
+@pytest.fixture
+def registry() -> MetricsRegistry:
+    return MetricsRegistry()
+
+
+def test_counter(registry: MetricsRegistry):
+    counter = registry.counter("calls_total", "Calls.")
+    counter.inc(source="a")
+    counter.inc(2, source="a")
+    counter.inc(source="b")
+    assert registry.counter("calls_total") is counter
+    assert registry.snapshot()["calls_total"] == {
+        (("source", "a"),): 3,
+        (("source", "b"),): 1,
+    }
+
+
+def test_histogram(registry: MetricsRegistry):
+    histogram = registry.histogram("latency_seconds", buckets=(0.1, 1))
+    for observation in (0.05, 0.1, 0.5, 5):
+        histogram.observe(observation, method="GET")
+    value = registry.snapshot()["latency_seconds"][(("method", "GET"),)]
+    assert isinstance(value, HistogramValue)
+    assert value.bucket_counts == [2, 1, 1]
+    assert value.count == 4
+    assert value.sum == pytest.approx(5.65)
+
+
+def test_histogram_time(registry: MetricsRegistry):
+    histogram = registry.histogram("latency_seconds")
+    with pytest.raises(ValueError, match="failed"), histogram.time():
+        raise ValueError("failed")  # noqa: EM101
+    assert histogram.values()[()].count == 1
+
+
+def test_reset_keeps_metrics(registry: MetricsRegistry):
+    counter = registry.counter("calls_total")
+    counter.inc()
+    registry.reset()
+    assert registry.snapshot() == {"calls_total": {}}
+    counter.inc()
+    assert registry.snapshot() == {"calls_total": {(): 1}}
+
+
+def test_metric_kind_conflict(registry: MetricsRegistry):
+    registry.counter("calls_total")
+    with pytest.raises(TypeError, match="is a counter"):
+        registry.histogram("calls_total")
+
+
+def test_prometheus_text(registry: MetricsRegistry):
+    registry.counter("calls_total", "Calls.").inc(path='a"b')
+    registry.histogram("latency_seconds", "Latency.", buckets=(1,)).observe(0.5)
+    assert registry.to_prometheus_text().splitlines() == [
+        "# HELP calls_total Calls.",
+        "# TYPE calls_total counter",
+        'calls_total{path="a\\"b"} 1.0',
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+    ]
+
+
+def test_vardef_requests_are_counted(mocker):
+    metrics.reset()
+    client = InstrumentedRESTClientObject(Configuration(host="http://vardef"))
+    mocker.patch.object(
+        client.pool_manager,
+        "request",
+        return_value=urllib3.HTTPResponse(body=b"{}", status=200),
+    )
+    client.request("get", "http://vardef/variable-definitions")
+    mocker.patch.object(
+        client.pool_manager, "request", side_effect=urllib3.exceptions.HTTPError
+    )
+    with pytest.raises(urllib3.exceptions.HTTPError):
+        client.request("GET", "http://vardef/variable-definitions")
+    assert VARDEF_REQUESTS.values() == {
+        (("method", "GET"), ("status", "200")): 1,
+        (("method", "GET"), ("status", "error")): 1,
+    }
+
+
+def test_datadoc_metrics(tmp_path: Path):
+    dataset_path = tmp_path / TEST_PARQUET_FILE_NAME
+    shutil.copy(str(TEST_PARQUET_FILEPATH), dataset_path)
+    subject_mapping = StatisticSubjectMapping(None, None)
+    metadata = Datadoc(str(dataset_path), statistic_subject_mapping=subject_mapping)
+
+    metrics.reset()
+    metadata.write_metadata_document()
+    Datadoc(
+        metadata_document_path=metadata.metadata_document,
+        statistic_subject_mapping=subject_mapping,
+    )
+    assert metrics.snapshot()["dapla_metadata_document_io_total"] == {
+        (("operation", "read"),): 1,
+        (("operation", "write"),): 1,
+    }
@@ -0,0 +1,42 @@
+"""Generate classifications shaped like those in Klass."""
+
+import pandas as pd
+
+from dapla_metadata.datasets.utility.enums import SupportedLanguages
+
+
+def nace_like_dataframes(
+    sections: int = 21,
+    branching: int = 4,
+) -> dict[SupportedLanguages, pd.DataFrame]:
+    """Generate a hierarchical classification the size and shape of NACE."""
+    rows: list[tuple[str, str | None, str]] = []
+    division_number = 0
+    for section in range(sections):
+        section_code = chr(ord("A") + section)
+        rows.append((section_code, None, "1"))
+        for _ in range(branching):
+            division_number += 1
+            division = f"{division_number:02d}"
+            rows.append((division, section_code, "2"))
+            for g in range(1, branching):
+                group = f"{division}.{g}"
+                rows.append((group, division, "3"))
+                for c in range(1, branching):
+                    nace_class = f"{group}{c}"
+                    rows.append((nace_class, group, "4"))
+                    rows.extend(
+                        (f"{nace_class}{s}", nace_class, "5") for s in range(1, 3)
+                    )
+    codes, parents, levels = zip(*rows, strict=True)
+    return {
+        language: pd.DataFrame(
+            {
+                "code": codes,
+                "parentCode": parents,
+                "level": levels,
+                "name": [f"{language} {code}" for code in codes],
+            }
+        )
+        for language in SupportedLanguages
+    }
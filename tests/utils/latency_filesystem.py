@@ -0,0 +1,130 @@
+"""An in-memory filesystem which behaves like a remote one.
+
+Every call which would be a round trip to a bucket is recorded and delayed by
+a configurable latency, so tests can assert how many round trips an operation
+costs and notice when that number grows.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+from typing import Any
+
+from fsspec.implementations.memory import MemoryFileSystem
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from collections.abc import Iterator
+
+
+@dataclass(frozen=True)
+class RemoteCall:
+    """A call to the filesystem which would be a round trip to a bucket."""
+
+    method: str
+    path: str
+
+
+def _remote[F: Callable[..., Any]](method: F) -> F:
+    @functools.wraps(method)
+    def wrapper(self: LatencyFileSystem, path: Any, *args: Any, **kwargs: Any) -> Any:
+        with self._round_trip(method.__name__, path):
+            return method(self, path, *args, **kwargs)
+
+    return wrapper  # type: ignore [return-value]
+
+
+class LatencyFileSystem(MemoryFileSystem):
+    """A memory filesystem which records and delays every remote call.
+
+    Calls made by another recorded call, such as the `info` call made by
+    `exists`, are part of the same round trip and are not recorded again.
+    Opening a file counts as one round trip, however much of it is read.
+    Files are only shared between paths of the same instance.
+    """
+
+    cachable = False
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        method_latency: dict[str, float] | None = None,
+        **storage_options: Any,
+    ) -> None:
+        """Initialize an empty filesystem.
+
+        Args:
+            latency: Seconds each remote call is delayed by.
+            method_latency: Seconds calls to specific methods, such as
+                `open`, are delayed by instead.
+            storage_options: Passed on to `MemoryFileSystem`.
+        """
+        super().__init__(**storage_options)
+        self.store: dict[str, Any] = {}
+        self.pseudo_dirs = [""]
+        self.latency = latency
+        self.method_latency = method_latency or {}
+        self.calls: list[RemoteCall] = []
+        self._lock = threading.Lock()
+        self._depth = threading.local()
+
+    @contextmanager
+    def _round_trip(self, method: str, path: Any) -> Iterator[None]:
+        depth = getattr(self._depth, "value", 0)
+        if depth == 0:
+            with self._lock:
+                self.calls.append(RemoteCall(method, str(path)))
+            time.sleep(self.method_latency.get(method, self.latency))
+        self._depth.value = depth + 1
+        try:
+            yield
+        finally:
+            self._depth.value = depth
+
+    info = _remote(MemoryFileSystem.info)
+    exists = _remote(MemoryFileSystem.exists)
+    isfile = _remote(MemoryFileSystem.isfile)
+    isdir = _remote(MemoryFileSystem.isdir)
+    ls = _remote(MemoryFileSystem.ls)
+    find = _remote(MemoryFileSystem.find)
+    open = _remote(MemoryFileSystem.open)
+    cat = _remote(MemoryFileSystem.cat)
+    cat_file = _remote(MemoryFileSystem.cat_file)
+    pipe_file = _remote(MemoryFileSystem.pipe_file)
+    rm_file = _remote(MemoryFileSystem.rm_file)
+
+    def count(self, method: str | None = None) -> int:
+        """The number of recorded calls, optionally only to the given method."""
+        with self._lock:
+            return sum(1 for c in self.calls if method is None or c.method == method)
+
+    def reset_calls(self) -> None:
+        """Forget the recorded calls, keeping the files."""
+        with self._lock:
+            self.calls.clear()
+
+    @contextmanager
+    def budget(self, max_calls: int) -> Iterator[list[RemoteCall]]:
+        """Assert that the `with` block makes at most `max_calls` remote calls.
+
+        Yields:
+            A list which holds the calls made in the block once it is done.
+
+        Raises:
+            AssertionError: If the block makes more calls than the budget.
+        """
+        with self._lock:
+            start = len(self.calls)
+        block_calls: list[RemoteCall] = []
+        yield block_calls
+        with self._lock:
+            block_calls.extend(self.calls[start:])
+        if len(block_calls) > max_calls:
+            described = "\n".join(f"  {c.method} {c.path}" for c in block_calls)
+            msg = f"{len(block_calls)} remote calls exceed the budget of {max_calls}:\n{described}"
+            raise AssertionError(msg)